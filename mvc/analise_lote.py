@@ -0,0 +1,198 @@
+"""
+Análise em lote de vídeos gravados, sem interface gráfica.
+
+Os vídeos são divididos em blocos de frames distribuídos entre processos
+(um motor de pose por processo, ver controllers.motores_pose). As posturas são classificadas com as mesmas
+regras do monitoramento ao vivo (inclusive a estabilização de MaquinaEstadosPostura, aplicada em
+ordem cronológica depois que todos os blocos terminam) e gravadas em lote no banco.
+
+Uso (a partir do diretório mvc):
+    python analise_lote.py gravacoes/ sessao.mp4 --processos 4
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+import cv2
+import numpy as np
+from controllers import cinematica
+from controllers.classificacao import MaquinaEstadosPostura
+from controllers.motores_pose import MOTORES, criar_motor
+
+EXTENSOES_VIDEO = ('.mp4', '.avi', '.mov', '.mkv', '.webm', '.m4v')
+
+# Motor de pose do processo de trabalho (criado uma vez por processo)
+_pose = None
+
+
+def listar_videos(caminhos):
+    """
+    Expande diretórios em arquivos de vídeo, mantendo a ordem dos argumentos.
+    """
+    videos = []
+    for caminho in caminhos:
+        if os.path.isdir(caminho):
+            for nome in sorted(os.listdir(caminho)):
+                if nome.lower().endswith(EXTENSOES_VIDEO):
+                    videos.append(os.path.join(caminho, nome))
+        else:
+            videos.append(caminho)
+    return videos
+
+
+def dividir_em_blocos(caminho, tamanho_bloco):
+    """
+    Retorna (total de frames, fps, lista de blocos (inicio, fim)) de um vídeo.
+    """
+    cap = cv2.VideoCapture(caminho)
+    if not cap.isOpened():
+        raise IOError(f"Não foi possível abrir o vídeo: {caminho}")
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    cap.release()
+    blocos = [(inicio, min(inicio + tamanho_bloco, total)) for inicio in range(0, total, tamanho_bloco)]
+    return total, fps, blocos
+
+
+def _inicializar_processo(config_pose, complexidade):
+    """
+    Cria o motor de pose do processo de trabalho.
+    """
+    global _pose
+    _pose = criar_motor(config_pose, complexidade)
+
+
+def analisar_bloco(caminho, inicio, fim, passo):
+    """
+    Analisa os frames [inicio, fim) de um vídeo, um a cada `passo`.
+    Executado nos processos de trabalho.
+    :return: (caminho, inicio, frames analisados, tempo de CPU, lista de
+              (índice do frame, pescoço, coluna)).
+    """
+    cpu_inicial = time.process_time()
+    _pose.reiniciar()
+    cap = cv2.VideoCapture(caminho)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, inicio)
+
+    pontos = np.empty((cinematica.NUM_LANDMARKS, 4), dtype=np.float32)
+    resultados = []
+    analisados = 0
+    for indice in range(inicio, fim):
+        if (indice - inicio) % passo:
+            if not cap.grab():
+                break
+            continue
+        ret, frame = cap.read()
+        if not ret:
+            break
+        analisados += 1
+
+        pose_landmarks = _pose.processar(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if not pose_landmarks:
+            continue
+        cinematica.landmarks_para_array(pose_landmarks.landmark, pontos)
+        angulos = cinematica.angulos_para_dict(cinematica.calcular_angulos(pontos))
+        resultados.append((indice, angulos['pescoco'], angulos['coluna']))
+
+    cap.release()
+    return caminho, inicio, analisados, time.process_time() - cpu_inicial, resultados
+
+
+def inicio_gravacao(caminho, total_frames, fps):
+    """
+    Estima o início da gravação: a modificação do arquivo menos a duração do vídeo.
+    """
+    fim = datetime.fromtimestamp(os.path.getmtime(caminho))
+    return fim - timedelta(seconds=total_frames / fps)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('videos', nargs='+', help="Arquivos de vídeo ou diretórios")
+    parser.add_argument('--processos', type=int, default=os.cpu_count(),
+                        help="Quantidade de processos de análise (padrão: número de CPUs)")
+    parser.add_argument('--tamanho-bloco', type=int, default=300,
+                        help="Frames por bloco distribuído aos processos")
+    parser.add_argument('--passo', type=int, default=1,
+                        help="Analisa um frame a cada N (1 = todos)")
+    parser.add_argument('--complexidade', type=int, choices=(0, 1, 2), default=1,
+                        help="Complexidade do modelo (0 lite, 1 full, 2 heavy)")
+    parser.add_argument('--motor', choices=tuple(MOTORES), default='mediapipe', help="Motor de pose")
+    parser.add_argument('--modelo', help="Arquivo ou diretório do modelo (motores mediapipe_tasks e opencv_dnn)")
+    parser.add_argument('--inicio', type=datetime.fromisoformat,
+                        help="Data/hora do início da gravação (ISO 8601); com vários vídeos, são "
+                             "considerados consecutivos na ordem dada; padrão: estimada por arquivo")
+    parser.add_argument('--banco', default='postura.db', help="Banco SQLite de destino")
+    args = parser.parse_args()
+
+    videos = listar_videos(args.videos)
+    if not videos:
+        parser.error("Nenhum vídeo encontrado")
+
+    info = {}
+    tarefas = []
+    for caminho in videos:
+        total, fps, blocos = dividir_em_blocos(caminho, args.tamanho_bloco)
+        info[caminho] = (total, fps)
+        tarefas.extend((caminho, inicio, fim) for inicio, fim in blocos)
+    print(f"{len(videos)} vídeo(s), {len(tarefas)} bloco(s), {args.processos} processo(s)")
+
+    resultados = {caminho: [] for caminho in videos}
+    analisados = 0
+    tempo_cpu = 0.0
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.processos, initializer=_inicializar_processo,
+                             initargs=({'motor': args.motor, 'modelo': args.modelo}, args.complexidade)) as executor:
+        futuros = [executor.submit(analisar_bloco, caminho, ini, fim, args.passo)
+                   for caminho, ini, fim in tarefas]
+        for concluidos, futuro in enumerate(as_completed(futuros), 1):
+            caminho, _, frames, cpu, amostras = futuro.result()
+            resultados[caminho].extend(amostras)
+            analisados += frames
+            tempo_cpu += cpu
+            print(f"\r{concluidos}/{len(futuros)} blocos", end="", flush=True)
+    duracao = time.perf_counter() - inicio
+    print()
+
+    # Início de cada vídeo: com --inicio, os vídeos são consecutivos na ordem dada
+    bases = {}
+    seguinte = args.inicio
+    for caminho in videos:
+        total, fps = info[caminho]
+        if seguinte is None:
+            bases[caminho] = inicio_gravacao(caminho, total, fps)
+        else:
+            bases[caminho] = seguinte
+            seguinte += timedelta(seconds=total / fps)
+
+    # Grava em ordem cronológica, vídeo a vídeo
+    from models.model import Model
+    model = Model(args.banco)
+    registrados = 0
+    for caminho in sorted(videos, key=bases.get):
+        total, fps = info[caminho]
+        base = bases[caminho]
+        amostras = sorted(resultados[caminho])
+        # Classificação estável no tempo do vídeo
+        estado = MaquinaEstadosPostura()
+        registros = []
+        for indice, pescoco, coluna in amostras:
+            angulos = {'pescoco': pescoco, 'coluna': coluna}
+            postura = estado.atualizar(angulos, indice / fps)[0]
+            if postura is None:
+                continue  # Ombros ou quadris ausentes: ângulos NaN, sem classificação
+            registros.append((base + timedelta(seconds=indice / fps), postura, 1, angulos))
+        model.registrar_posturas(registros)
+        registrados += len(registros)
+    model.fechar()
+
+    fps_total = analisados / duracao if duracao else 0.0
+    print(f"Frames analisados: {analisados} ({registrados} com postura classificada) em {duracao:.1f}s")
+    print(f"Vazão: {fps_total:.1f} frames/s no total, "
+          f"{fps_total / args.processos:.1f} frames/s por processo, "
+          f"{analisados / tempo_cpu if tempo_cpu else 0.0:.1f} frames/s por segundo de CPU")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,3 @@
+"""
+Pacote benchmarks - Contém as medições de desempenho do sistema
+""" 
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+Benchmark do caminho de exibição dos frames.
+
+Compara o caminho antigo (cvtColor para um array novo, Image.fromarray e uma
+ImageTk.PhotoImage nova por frame) com o atual (cvtColor em buffers reaproveitados
+fora da thread da interface e uma única PhotoImage atualizada com paste).
+Mede o tempo na thread da interface e o pico de memória alocada por frame
+(tracemalloc, que contabiliza os arrays NumPy mas não a memória interna do PIL
+e do Tk). Sem display, mede apenas a parte PIL.
+
+Uso (a partir do diretório mvc):
+    python -m benchmarks.bench_exibicao --quadros 500
+"""
+import argparse
+import time
+import tracemalloc
+import cv2
+from PIL import Image, ImageTk
+from benchmarks.comum import imprimir_resumos, resumir
+from controllers.fontes import FonteSintetica
+from controllers.pipeline import AnelBuffers
+
+
+def _criar_janela():
+    """Retorna (root, label) ou (None, None) sem display"""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return None, None
+    label = tk.Label(root)
+    label.pack()
+    return root, label
+
+
+def caminho_por_quadro(largura, altura, label):
+    """
+    Caminho antigo: arrays e imagens novas a cada frame.
+    :return: (conversão na thread de processamento, exibição na thread da interface).
+    """
+    def converter(frame):
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    def exibir(rgb):
+        imagem = Image.fromarray(rgb)
+        if label is not None:
+            foto = ImageTk.PhotoImage(image=imagem)
+            label.configure(image=foto)
+            label.image = foto
+            label.update_idletasks()
+    return converter, exibir
+
+
+def caminho_persistente(largura, altura, label):
+    """
+    Caminho atual: buffers em anel e uma única PhotoImage atualizada no lugar.
+    :return: (conversão na thread de processamento, exibição na thread da interface).
+    """
+    anel = AnelBuffers(6)
+    imagem = Image.new('RGB', (largura, altura))
+    foto = None
+    if label is not None:
+        foto = ImageTk.PhotoImage('RGB', (largura, altura))
+        label.configure(image=foto)
+        label.image = foto
+
+    def converter(frame):
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=anel.proximo(frame.shape))
+
+    def exibir(rgb):
+        imagem.frombytes(rgb)
+        if foto is not None:
+            foto.paste(imagem)
+            label.update_idletasks()
+    return converter, exibir
+
+
+def medir_caminho(converter, exibir, frames):
+    """
+    Mede, por frame, o tempo de exibição (thread da interface) e o pico de memória
+    alocada pela conversão e exibição (tracemalloc).
+    :return: (tempos em ms, bytes alocados por frame).
+    """
+    for frame in frames[:10]:
+        exibir(converter(frame))
+
+    tempos = []
+    alocados = []
+    tracemalloc.start()
+    for frame in frames:
+        antes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        rgb = converter(frame)
+        inicio = time.perf_counter()
+        exibir(rgb)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        del rgb
+        _, pico = tracemalloc.get_traced_memory()
+        alocados.append(pico - antes)
+    tracemalloc.stop()
+    return tempos, alocados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--quadros', type=int, default=300)
+    parser.add_argument('--largura', type=int, default=640)
+    parser.add_argument('--altura', type=int, default=480)
+    args = parser.parse_args()
+
+    fonte = FonteSintetica(args.largura, args.altura, total=args.quadros)
+    frames = [fonte.read()[1] for _ in range(args.quadros)]
+    root, label = _criar_janela()
+    print("Com PhotoImage (display disponível)" if root else "Sem display: apenas a parte PIL")
+
+    caminhos = {'exibicao.por_quadro': caminho_por_quadro, 'exibicao.persistente': caminho_persistente}
+    resumos = {}
+    alocados = {}
+    for nome, caminho in caminhos.items():
+        tempos, bytes_alocados = medir_caminho(*caminho(args.largura, args.altura, label), frames)
+        resumos[nome] = resumir(tempos)
+        alocados[nome] = sum(bytes_alocados) / len(bytes_alocados)
+        resumos[nome]['alocado_por_quadro_kb'] = alocados[nome] / 1024
+    imprimir_resumos(resumos)
+    for nome, media in alocados.items():
+        print(f"{nome:<40} memória alocada por frame: {media / 1024:.1f} KiB")
+
+    if root is not None:
+        root.destroy()
+
+
+if __name__ == '__main__':
+    main()
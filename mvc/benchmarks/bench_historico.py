@@ -0,0 +1,95 @@
+"""
+Benchmark das consultas de histórico sobre bancos grandes.
+
+Uso (a partir do diretório mvc):
+    python -m benchmarks.bench_historico --registros 20000000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from models.model import Model, SQL_SOMAR_ESTATISTICAS, para_epoch
+from benchmarks.comum import medir
+
+
+def popular_banco(model, total, intervalo_ms=1000, amostras=10):
+    """
+    Insere `total` intervalos sintéticos de `amostras` amostras, um a cada `intervalo_ms`,
+    terminando agora, e as estatísticas diárias correspondentes.
+    A geração é feita dentro do SQLite para não depender da velocidade do Python.
+    """
+    fim = para_epoch(datetime.now())
+    inicio = fim - total * intervalo_ms
+    with model.db_connection:
+        model.db_connection.execute('''
+            WITH RECURSIVE seq(i) AS (
+                SELECT 0 UNION ALL SELECT i + 1 FROM seq WHERE i < :ultimo
+            )
+            INSERT INTO registros (
+                inicio, fim, tipo_postura, amostras, duracao,
+                pescoco_min, pescoco_media, pescoco_max,
+                coluna_min, coluna_media, coluna_max
+            )
+            SELECT
+                :inicio + i * :passo,
+                :inicio + i * :passo + :passo - :passo / :amostras,
+                CASE WHEN i % 2 = 0 THEN 'Postura incorreta - Pescoço muito inclinado'
+                     ELSE 'Postura correta' END,
+                :amostras,
+                :amostras,
+                55 + (i % 30), 60 + (i % 30), 65 + (i % 30),
+                75 + (i % 20), 80 + (i % 20), 85 + (i % 20)
+            FROM seq
+        ''', {'ultimo': total - 1, 'inicio': inicio, 'passo': intervalo_ms, 'amostras': amostras})
+        # Estatísticas diárias dos intervalos inseridos, como o Model faz ao gravar
+        deltas = model.db_connection.execute('''
+            SELECT date(inicio / 1000, 'unixepoch', 'localtime'),
+                   SUM(CASE WHEN tipo_postura = 'Postura correta' THEN duracao ELSE 0 END),
+                   SUM(CASE WHEN tipo_postura != 'Postura correta' THEN duracao ELSE 0 END)
+            FROM registros WHERE inicio >= ?
+            GROUP BY 1
+        ''', (inicio,)).fetchall()
+        model.db_connection.executemany(SQL_SOMAR_ESTATISTICAS, deltas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--registros', type=int, default=1_000_000)
+    parser.add_argument('--repeticoes', type=int, default=200)
+    parser.add_argument('--banco', help="Banco existente a usar (padrão: arquivo temporário)")
+    args = parser.parse_args()
+
+    caminho = args.banco or os.path.join(tempfile.mkdtemp(), 'bench.db')
+    model = Model(caminho)
+    existentes = model.db_connection.execute('SELECT COUNT(*) FROM registros').fetchone()[0]
+    if existentes < args.registros:
+        inicio = time.perf_counter()
+        popular_banco(model, args.registros - existentes)
+        print(f"Banco populado com {args.registros - existentes} registros "
+              f"em {time.perf_counter() - inicio:.1f}s")
+
+    agora = datetime.now()
+    limites = model.db_connection.execute('SELECT MIN(inicio), MAX(fim) FROM registros').fetchone()
+    antigo, recente = (datetime.fromtimestamp(limite / 1000) for limite in limites)
+    consultas = {
+        'historico_ultimos_10s': lambda: model.get_historico(recente - timedelta(seconds=10), recente),
+        'historico_ultimos_100': lambda: model.get_historico(agora - timedelta(days=7), agora, limite=100),
+        'historico_10s_mais_antigos': lambda: model.get_historico(antigo, antigo + timedelta(seconds=10)),
+        'resumo_diario': model.get_resumo_diario,
+        'posturas_incorretas_30min': model.get_posturas_incorretas_por_tempo,
+    }
+
+    print(f"{'consulta':<30} {'p50 (ms)':>10} {'p95 (ms)':>10} {'linhas':>8}")
+    for nome, consulta in consultas.items():
+        linhas = len(consulta())
+        tempos = sorted(medir(consulta, args.repeticoes))
+        p95 = tempos[int(len(tempos) * 0.95) - 1]
+        print(f"{nome:<30} {statistics.median(tempos):>10.3f} {p95:>10.3f} {linhas:>8}")
+
+    model.fechar()
+
+
+if __name__ == '__main__':
+    main()
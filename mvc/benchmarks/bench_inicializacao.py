@@ -0,0 +1,96 @@
+"""
+Benchmark do tempo até a primeira janela (time-to-first-window).
+
+Cada repetição roda em um processo novo (imports a frio) e mede, a partir do
+lançamento do processo, quando os imports, o Model, o Controller e a primeira
+janela desenhada ficam prontos. Sem display (ou com --sem-interface), mede até o
+Controller sem interface gráfica estar pronto.
+
+Uso (a partir do diretório mvc):
+    python -m benchmarks.bench_inicializacao --repeticoes 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Executado no processo filho; imprime os instantes de cada etapa em segundos
+ROTEIRO_FILHO = '''
+import json, os, sys, time
+marcas = {}
+inicio = time.perf_counter()
+from models.model import Model
+from controllers.controller import Controller
+marcas['imports'] = time.perf_counter() - inicio
+model = Model(sys.argv[1])
+marcas['model'] = time.perf_counter() - inicio
+if sys.argv[2] == 'gui':
+    import tkinter as tk
+    root = tk.Tk()
+    controller = Controller(model, root)
+    marcas['controller'] = time.perf_counter() - inicio
+    root.update()
+    marcas['janela'] = time.perf_counter() - inicio
+    root.destroy()
+else:
+    controller = Controller(model)
+    marcas['controller'] = time.perf_counter() - inicio
+print(json.dumps(marcas), flush=True)
+model.fechar()
+os._exit(0)
+'''
+
+
+def medir_inicializacao(modo, caminho_db):
+    """
+    Executa uma inicialização em um processo novo.
+    :return: Dicionário etapa -> milissegundos; 'total' inclui a partida do interpretador.
+    """
+    inicio = time.perf_counter()
+    processo = subprocess.Popen(
+        [sys.executable, '-c', ROTEIRO_FILHO, caminho_db, modo],
+        stdout=subprocess.PIPE, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    linha = processo.stdout.readline()
+    total = (time.perf_counter() - inicio) * 1000
+    processo.wait()
+    if not linha:
+        raise RuntimeError(f"Processo de inicialização falhou (código {processo.returncode})")
+    etapas = {nome: segundos * 1000 for nome, segundos in json.loads(linha).items()}
+    etapas['total'] = total
+    return etapas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticoes', type=int, default=10)
+    parser.add_argument('--sem-interface', action='store_true',
+                        help="Mede apenas o Controller sem interface gráfica")
+    parser.add_argument('--json', help="Salva os resultados (mediana por etapa) neste arquivo")
+    args = parser.parse_args()
+
+    gui = not args.sem_interface and (os.name == 'nt' or os.environ.get('DISPLAY'))
+    modo = 'gui' if gui else 'sem_interface'
+    caminho_db = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    medicoes = [medir_inicializacao(modo, caminho_db) for _ in range(args.repeticoes)]
+
+    print(f"Modo: {modo}, {args.repeticoes} repetições")
+    print(f"{'etapa':<14} {'p50 (ms)':>10} {'máx (ms)':>10}")
+    resumo = {}
+    for etapa in medicoes[0]:
+        tempos = [medicao[etapa] for medicao in medicoes]
+        resumo[etapa] = statistics.median(tempos)
+        print(f"{etapa:<14} {resumo[etapa]:>10.1f} {max(tempos):>10.1f}")
+
+    if args.json:
+        with open(args.json, 'w') as arquivo:
+            json.dump({'modo': modo, 'p50_ms': resumo}, arquivo, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+Matriz de motores de pose: velocidade x concordância da classificação.
+
+Cada configuração (motor e complexidade) processa os mesmos frames da fonte, na
+ordem (o rastreamento entre frames conta). Para cada uma são medidos a latência
+do processar (p50/p95/p99), a fração de frames com pessoa detectada e a
+concordância com a referência (por padrão MediaPipe full): fração dos frames
+classificados pela referência em que a configuração chega à mesma postura.
+Configurações cujo modelo não está disponível são puladas.
+
+Uso (a partir do diretório mvc):
+    python -m benchmarks.bench_motores --fonte gravacoes/sessao.mp4
+    python -m benchmarks.bench_motores --fonte gravacoes/sessao.mp4 --modelos-tasks modelos \\
+        --modelo-dnn modelos/openpose --json motores.json
+"""
+import argparse
+import time
+import cv2
+import numpy as np
+from benchmarks.comum import comparar, resumir, salvar_json
+from controllers import cinematica
+from controllers.classificacao import classificar_postura
+from controllers.fontes import config_de_argumento, criar_fonte
+from controllers.motores_pose import COMPLEXIDADES, criar_motor
+
+
+def carregar_quadros(fonte, quantidade, largura=640, altura=480):
+    """Lê até `quantidade` frames da fonte, já no tamanho e formato (RGB) do monitoramento"""
+    quadros = []
+    while len(quadros) < quantidade:
+        ret, frame = fonte.read()
+        if not ret:
+            break
+        quadros.append(cv2.cvtColor(cv2.resize(frame, (largura, altura)), cv2.COLOR_BGR2RGB))
+    return quadros
+
+
+def configuracoes(modelos_tasks, modelo_dnn):
+    """Configurações da matriz: nome -> (configuração do motor, complexidade)"""
+    matriz = {}
+    for complexidade, nome in COMPLEXIDADES.items():
+        matriz[f'mediapipe.{nome}'] = ({'motor': 'mediapipe'}, complexidade)
+    for complexidade, nome in COMPLEXIDADES.items():
+        matriz[f'mediapipe_tasks.{nome}'] = ({'motor': 'mediapipe_tasks', 'modelo': modelos_tasks}, complexidade)
+    if modelo_dnn:
+        matriz['opencv_dnn'] = ({'motor': 'opencv_dnn', 'modelo': modelo_dnn}, 1)
+    return matriz
+
+
+def executar(config, complexidade, quadros, aquecimento=5):
+    """
+    Processa os frames com um motor.
+    :return: (tempos em ms, postura classificada por frame ou None sem detecção).
+    """
+    motor = criar_motor(config, complexidade)
+    try:
+        for quadro in quadros[:aquecimento]:
+            motor.processar(quadro)
+        motor.reiniciar()
+
+        pontos = np.empty((cinematica.NUM_LANDMARKS, 4), dtype=np.float32)
+        tempos = []
+        posturas = []
+        for quadro in quadros:
+            inicio = time.perf_counter()
+            landmarks = motor.processar(quadro)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+            if landmarks is None:
+                posturas.append(None)
+                continue
+            cinematica.landmarks_para_array(landmarks.landmark, pontos)
+            angulos = cinematica.angulos_para_dict(cinematica.calcular_angulos(pontos))
+            posturas.append(classificar_postura(angulos)[0])
+        return tempos, posturas
+    finally:
+        motor.fechar()
+
+
+def concordancia(posturas, referencia):
+    """Fração dos frames classificados pela referência com a mesma postura (None sem base)"""
+    pares = [(postura, base) for postura, base in zip(posturas, referencia) if base is not None]
+    if not pares:
+        return None
+    return sum(postura == base for postura, base in pares) / len(pares)
+
+
+def imprimir_matriz(resumos):
+    print(f"{'configuração':<26} {'p50 (ms)':>10} {'p95 (ms)':>10} {'FPS':>8} {'detecção':>10} {'concordância':>13}")
+    for nome, resumo in resumos.items():
+        concordou = resumo['concordancia']
+        print(f"{nome:<26} {resumo['p50_ms']:>10.2f} {resumo['p95_ms']:>10.2f} {resumo['vazao_por_s']:>8.1f} "
+              f"{resumo['deteccao']:>9.0%} {'-' if concordou is None else f'{concordou:.0%}':>13}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fonte', default='sintetica',
+                        help="Arquivo de vídeo, diretório de imagens ou 'sintetica' (padrão, sem pessoa)")
+    parser.add_argument('--quadros', type=int, default=200, help="Frames processados por configuração")
+    parser.add_argument('--modelos-tasks', default='modelos',
+                        help="Diretório com pose_landmarker_{lite,full,heavy}.task")
+    parser.add_argument('--modelo-dnn', help="Arquivo ou diretório da rede COCO para o cv2.dnn")
+    parser.add_argument('--referencia', default='mediapipe.full', help="Configuração de referência")
+    parser.add_argument('--json', help="Salva os resultados neste arquivo")
+    parser.add_argument('--comparar', help="JSON de uma execução anterior para comparação")
+    args = parser.parse_args()
+
+    fonte = criar_fonte(config_de_argumento(args.fonte))
+    quadros = carregar_quadros(fonte, args.quadros)
+    fonte.release()
+    if not quadros:
+        parser.error("A fonte não entregou nenhum frame")
+
+    resultados = {}
+    for nome, (config, complexidade) in configuracoes(args.modelos_tasks, args.modelo_dnn).items():
+        try:
+            resultados[nome] = executar(config, complexidade, quadros)
+        except Exception as e:
+            print(f"{nome}: pulado ({e})")
+    if args.referencia not in resultados:
+        parser.error(f"Configuração de referência indisponível: {args.referencia}")
+
+    referencia = resultados[args.referencia][1]
+    resumos = {}
+    for nome, (tempos, posturas) in resultados.items():
+        resumo = resumir(tempos)
+        resumo['deteccao'] = sum(postura is not None for postura in posturas) / len(posturas)
+        resumo['concordancia'] = concordancia(posturas, referencia)
+        resumos[nome] = resumo
+    print(f"{len(quadros)} frames; referência: {args.referencia}")
+    imprimir_matriz(resumos)
+    if args.json:
+        salvar_json(args.json, resumos, vars(args))
+    if args.comparar:
+        comparar(args.comparar, resumos)
+
+
+if __name__ == '__main__':
+    main()
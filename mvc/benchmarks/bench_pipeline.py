@@ -0,0 +1,132 @@
+"""
+Benchmark de ponta a ponta do pipeline de postura, etapa por etapa.
+
+Etapas de frame (sobre uma fonte de frames: vídeo gravado, imagens ou sintética):
+resize, _aplicar_ajustes_imagem, conversão BGR->RGB, pose.process, draw_landmarks, _analisar_postura,
+registrar_postura e o _processar_quadro completo. Quando o MediaPipe não detecta
+ninguém (ex: fonte sintética), desenho e análise usam poses sintéticas.
+
+Etapas de banco (bancos sintéticos de tamanhos crescentes): get_estatisticas e
+exportar_dados.
+
+Uso (a partir do diretório mvc):
+    python -m benchmarks.bench_pipeline --fonte gravacoes/sessao.mp4 --json atual.json
+    python -m benchmarks.bench_pipeline --json novo.json --comparar atual.json
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+import cv2
+from benchmarks.comum import comparar, imprimir_resumos, landmarks_sinteticos, medir, resumir, salvar_json
+from benchmarks.bench_historico import popular_banco
+from controllers.controller import Controller
+from controllers.fontes import config_de_argumento, criar_fonte
+from models.model import Model
+
+
+def _cronometrar(tempos, nome, funcao, *args):
+    """Executa funcao(*args), acumulando o tempo em milissegundos em tempos[nome]"""
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    tempos.setdefault(nome, []).append((time.perf_counter() - inicio) * 1000)
+    return resultado
+
+
+def medir_quadros(controller, fonte, quantidade, aquecimento=5):
+    """
+    Mede as etapas de frame sobre `quantidade` frames da fonte.
+    :return: Dicionário etapa -> lista de tempos em ms.
+    """
+    # Passo fixo: todo frame passa pelo MediaPipe
+    controller.agendador.adaptativo = False
+    controller.agendador.passo = 1
+    controller._inicializar_pose()
+    poses = landmarks_sinteticos(quantidade)
+    estilo = controller._estilo_landmarks
+    tempos = {}
+
+    for indice in range(aquecimento + quantidade):
+        ret, frame = fonte.read()
+        if not ret:
+            break
+        if indice < aquecimento:
+            controller._processar_quadro(frame)
+            continue
+
+        pequeno = _cronometrar(tempos, 'quadro.resize', cv2.resize, frame, (640, 480))
+        ajustado = _cronometrar(tempos, 'quadro.aplicar_ajustes_imagem', controller._aplicar_ajustes_imagem, pequeno)
+        rgb = _cronometrar(tempos, 'quadro.conversao_rgb', cv2.cvtColor, ajustado, cv2.COLOR_BGR2RGB)
+        detectado = _cronometrar(tempos, 'quadro.pose_process', controller.pose.processar, rgb)
+        pose = detectado if detectado else poses[indice - aquecimento]
+        _cronometrar(tempos, 'quadro.draw_landmarks', controller.mp_drawing.draw_landmarks,
+                     rgb, pose, controller.mp_pose.POSE_CONNECTIONS, estilo)
+        postura = _cronometrar(tempos, 'quadro.analisar_postura', controller._analisar_postura, pose.landmark)
+        # _analisar_postura já registra; aqui mede o registro isolado
+        _cronometrar(tempos, 'quadro.registrar_postura', controller.model.registrar_postura,
+                     postura[0] or "Postura correta", 1, controller.angulos)
+
+        _cronometrar(tempos, 'quadro.processar_quadro', controller._processar_quadro, frame)
+    return tempos
+
+
+def medir_banco(tamanho, repeticoes, diretorio):
+    """
+    Mede consultas e exportação em um banco sintético com `tamanho` intervalos.
+    :return: Dicionário etapa -> lista de tempos em ms.
+    """
+    model = Model(os.path.join(diretorio, f'bench_{tamanho}.db'))
+    popular_banco(model, tamanho)
+    agora = datetime.now()
+    estatisticas = lambda: model.get_estatisticas(dias=7)
+    exportacao = lambda: model.exportar_dados('csv', agora - timedelta(hours=1), agora,
+                                              diretorio=os.path.join(diretorio, 'exportacoes'))
+    # Aquecimento: cache do SQLite
+    estatisticas()
+    exportacao()
+    tempos = {
+        f'banco_{tamanho}.get_estatisticas': medir(estatisticas, repeticoes),
+        f'banco_{tamanho}.exportar_dados_csv': medir(exportacao, max(1, repeticoes // 10))
+    }
+    model.fechar()
+    return tempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fonte', default='sintetica',
+                        help="Arquivo de vídeo, diretório de imagens ou 'sintetica' (padrão)")
+    parser.add_argument('--quadros', type=int, default=200, help="Frames medidos")
+    parser.add_argument('--tamanhos', type=int, nargs='*', default=[10_000, 100_000, 1_000_000],
+                        help="Tamanhos (intervalos) dos bancos sintéticos")
+    parser.add_argument('--repeticoes', type=int, default=50, help="Repetições das etapas de banco")
+    parser.add_argument('--json', help="Salva os resultados neste arquivo")
+    parser.add_argument('--comparar', help="JSON de uma execução anterior para comparação")
+    args = parser.parse_args()
+
+    diretorio = tempfile.mkdtemp()
+    try:
+        model = Model(os.path.join(diretorio, 'quadros.db'))
+        controller = Controller(model)
+        fonte = criar_fonte(config_de_argumento(args.fonte, repetir=True))
+        tempos = medir_quadros(controller, fonte, args.quadros)
+        fonte.release()
+        model.fechar()
+
+        for tamanho in args.tamanhos:
+            tempos.update(medir_banco(tamanho, args.repeticoes, diretorio))
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+    resumos = {nome: resumir(valores) for nome, valores in tempos.items()}
+    imprimir_resumos(resumos)
+    if args.json:
+        salvar_json(args.json, resumos, vars(args))
+    if args.comparar:
+        comparar(args.comparar, resumos)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Funções comuns aos benchmarks: medição, percentis, fixtures sintéticas e
+resultados em JSON para comparar commits.
+"""
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime
+import numpy as np
+
+
+def medir(funcao, repeticoes):
+    """Executa a função várias vezes e retorna os tempos em milissegundos"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return tempos
+
+
+def resumir(tempos):
+    """
+    Resume tempos em milissegundos: amostras, média, p50, p95, p99 e vazão (operações/s).
+    """
+    if not tempos:
+        return {'amostras': 0}
+    valores = np.asarray(tempos, dtype=np.float64)
+    media = float(valores.mean())
+    return {
+        'amostras': len(valores),
+        'media_ms': media,
+        'p50_ms': float(np.percentile(valores, 50)),
+        'p95_ms': float(np.percentile(valores, 95)),
+        'p99_ms': float(np.percentile(valores, 99)),
+        'vazao_por_s': 1000.0 / media if media else 0.0
+    }
+
+
+def imprimir_resumos(resumos):
+    """Imprime uma tabela com o resumo de cada etapa"""
+    print(f"{'etapa':<40} {'n':>6} {'p50 (ms)':>10} {'p95 (ms)':>10} {'p99 (ms)':>10} {'ops/s':>10}")
+    for nome, resumo in resumos.items():
+        if not resumo.get('amostras'):
+            print(f"{nome:<40} {0:>6} {'-':>10} {'-':>10} {'-':>10} {'-':>10}")
+            continue
+        print(f"{nome:<40} {resumo['amostras']:>6} {resumo['p50_ms']:>10.3f} {resumo['p95_ms']:>10.3f} "
+              f"{resumo['p99_ms']:>10.3f} {resumo['vazao_por_s']:>10.1f}")
+
+
+def metadados():
+    """Identifica a execução: commit, data, Python e máquina"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'maquina': platform.platform(),
+        'processador': platform.processor() or platform.machine()
+    }
+
+
+def salvar_json(caminho, resumos, parametros=None):
+    """Salva os resumos e os metadados da execução em JSON"""
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump({'metadados': metadados(), 'parametros': parametros or {}, 'etapas': resumos},
+                  arquivo, indent=2, ensure_ascii=False)
+
+
+def comparar(caminho_base, resumos, metrica='p50_ms'):
+    """
+    Compara os resumos atuais com um JSON salvo anteriormente (ex: de outro commit).
+    """
+    with open(caminho_base, encoding='utf-8') as arquivo:
+        base = json.load(arquivo)
+    print(f"\nComparação com {caminho_base} (commit {base['metadados'].get('commit')}), {metrica}:")
+    print(f"{'etapa':<40} {'base':>10} {'atual':>10} {'variação':>10}")
+    for nome, resumo in resumos.items():
+        anterior = base['etapas'].get(nome, {}).get(metrica)
+        atual = resumo.get(metrica)
+        if anterior is None or atual is None:
+            continue
+        variacao = (atual - anterior) / anterior * 100 if anterior else 0.0
+        print(f"{nome:<40} {anterior:>10.3f} {atual:>10.3f} {variacao:>+9.1f}%")
+
+
+def landmarks_sinteticos(quantidade, semente=0, ruido=0.01):
+    """
+    Gera poses sentadas plausíveis (33 landmarks normalizados do MediaPipe) com
+    pequenas variações, para medir desenho e análise sem depender da detecção.
+    :return: Lista de NormalizedLandmarkList.
+    """
+    from mediapipe.framework.formats import landmark_pb2
+
+    base = np.full((33, 2), 0.5, dtype=np.float32)
+    base[0] = (0.50, 0.25)                  # nariz
+    base[1:11] = (0.50, 0.22)               # olhos, orelhas e boca
+    base[11], base[12] = (0.40, 0.40), (0.60, 0.40)   # ombros
+    base[13], base[14] = (0.35, 0.55), (0.65, 0.55)   # cotovelos
+    base[15:23:2], base[16:23:2] = (0.38, 0.68), (0.62, 0.68)  # punhos e mãos
+    base[23], base[24] = (0.42, 0.75), (0.58, 0.75)   # quadris
+    base[25::2], base[26::2] = (0.40, 0.95), (0.60, 0.95)     # pernas e pés
+
+    rng = np.random.default_rng(semente)
+    poses = []
+    for _ in range(quantidade):
+        pontos = base + rng.normal(0, ruido, base.shape).astype(np.float32)
+        lista = landmark_pb2.NormalizedLandmarkList()
+        for x, y in pontos:
+            lista.landmark.add(x=float(x), y=float(y), z=0.0, visibility=0.99)
+        poses.append(lista)
+    return poses
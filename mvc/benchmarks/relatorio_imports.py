@@ -0,0 +1,76 @@
+"""
+Relatório dos imports feitos na inicialização (python -X importtime).
+
+Importa os módulos de entrada da aplicação em um processo novo, lista os imports
+mais caros e falha (código de saída 1) se algum módulo pesado que deveria ser
+carregado apenas no primeiro uso aparecer, ou se o tempo total passar do limite.
+
+Uso (a partir do diretório mvc):
+    python -m benchmarks.relatorio_imports --limite-ms 800
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+# Módulos de entrada da interface gráfica
+MODULOS_ENTRADA = ('main', 'views.view')
+
+# Carregados no primeiro uso: Pose ao iniciar, openpyxl ao exportar para Excel, matplotlib no gráfico
+MODULOS_ADIADOS = ('mediapipe', 'openpyxl', 'matplotlib')
+
+_LINHA = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def medir_imports(modulos=MODULOS_ENTRADA):
+    """
+    Importa os módulos em um processo novo com -X importtime.
+    :return: Lista de (módulo, próprio em ms, acumulado em ms, profundidade), na ordem do relatório.
+    """
+    codigo = '; '.join(f'import {modulo}' for modulo in modulos)
+    processo = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', codigo],
+        capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    if processo.returncode != 0:
+        raise RuntimeError(processo.stderr.strip().splitlines()[-1])
+    imports = []
+    for linha in processo.stderr.splitlines():
+        encontrado = _LINHA.match(linha)
+        if encontrado:
+            proprio, acumulado, recuo, nome = encontrado.groups()
+            imports.append((nome, int(proprio) / 1000, int(acumulado) / 1000, (len(recuo) - 1) // 2))
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modulos', nargs='+', default=list(MODULOS_ENTRADA))
+    parser.add_argument('--top', type=int, default=15, help="Quantidade de imports listados")
+    parser.add_argument('--limite-ms', type=float, help="Falha se o tempo total de imports passar disto")
+    args = parser.parse_args()
+
+    imports = medir_imports(args.modulos)
+    total = sum(acumulado for _, _, acumulado, profundidade in imports if profundidade == 0)
+
+    print(f"{'módulo':<45} {'próprio (ms)':>13} {'acumulado (ms)':>15}")
+    for nome, proprio, acumulado, _ in sorted(imports, key=lambda item: -item[2])[:args.top]:
+        print(f"{nome:<45} {proprio:>13.1f} {acumulado:>15.1f}")
+    print(f"Total: {total:.1f} ms em {len(imports)} módulos")
+
+    falhas = []
+    carregados = {nome.split('.')[0] for nome, _, _, _ in imports}
+    for modulo in MODULOS_ADIADOS:
+        if modulo in carregados:
+            falhas.append(f"{modulo} importado na inicialização")
+    if args.limite_ms is not None and total > args.limite_ms:
+        falhas.append(f"tempo total {total:.1f} ms acima do limite de {args.limite_ms:.1f} ms")
+    for falha in falhas:
+        print(f"FALHA: {falha}")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Agendamento adaptativo da análise de pose.
+
+Em vez de analisar um frame a cada N fixo, o agendador escolhe o passo (1 a cada
+N frames) para atingir uma taxa de análise alvo sem exceder o que a máquina
+consegue processar, e troca a complexidade do modelo do MediaPipe conforme a
+latência medida do pose.process em relação ao orçamento de latência.
+"""
+import math
+
+# Fração do orçamento abaixo da qual a complexidade do modelo pode subir
+FOLGA_PARA_SUBIR = 0.4
+
+# Janelas sem subir a complexidade depois de uma redução (evita oscilar entre dois níveis)
+JANELAS_APOS_REDUCAO = 10
+
+
+class AgendadorAnalise:
+    """
+    Decide quais frames passam pelo MediaPipe e com qual complexidade de modelo.
+    Usado apenas pela thread de processamento do pipeline.
+    """
+    def __init__(self, taxa_alvo=15.0, orcamento_latencia_ms=80.0, passo=2, passo_maximo=15,
+                 complexidade=1, complexidade_minima=0, complexidade_maxima=1,
+                 janela=30, adaptativo=True):
+        """
+        :param taxa_alvo: Análises por segundo desejadas.
+        :param orcamento_latencia_ms: Latência máxima aceitável do pose.process (p95 da janela).
+        :param passo: Passo inicial (analisa 1 a cada `passo` frames).
+        :param passo_maximo: Maior passo permitido.
+        :param complexidade: Complexidade inicial do modelo MediaPipe (0, 1 ou 2).
+        :param complexidade_minima: Menor complexidade permitida.
+        :param complexidade_maxima: Maior complexidade permitida.
+        :param janela: Inferências medidas entre dois ajustes.
+        :param adaptativo: False mantém passo e complexidade fixos.
+        """
+        self.taxa_alvo = taxa_alvo
+        self.orcamento_latencia_ms = orcamento_latencia_ms
+        self.passo = passo
+        self.passo_maximo = passo_maximo
+        self.complexidade = complexidade
+        self.complexidade_minima = complexidade_minima
+        self.complexidade_maxima = complexidade_maxima
+        self.janela = janela
+        self.adaptativo = adaptativo
+        self.latencia_ms = None  # p95 da última janela
+        self.ajustes = 0
+        self._contador = 0
+        self._latencias = []
+        self._bloqueio_subida = 0
+
+    def deve_analisar(self):
+        """
+        Indica se o frame atual deve passar pelo MediaPipe (chamado uma vez por frame).
+        """
+        self._contador += 1
+        if self._contador >= self.passo:
+            self._contador = 0
+            return True
+        return False
+
+    def registrar_inferencia(self, duracao_ms, fps_captura):
+        """
+        Registra a duração de um pose.process e, a cada `janela` inferências, ajusta
+        passo e complexidade.
+        :param fps_captura: Frames capturados por segundo no momento.
+        :return: True se a complexidade do modelo mudou (o Pose precisa ser recriado).
+        """
+        self._latencias.append(duracao_ms)
+        if len(self._latencias) < self.janela:
+            return False
+        latencias = sorted(self._latencias)
+        self._latencias = []
+        self.latencia_ms = latencias[max(0, math.ceil(len(latencias) * 0.95) - 1)]
+        if not self.adaptativo:
+            return False
+        return self._ajustar(fps_captura)
+
+    def _ajustar(self, fps_captura):
+        complexidade_anterior = self.complexidade
+        if self.latencia_ms > self.orcamento_latencia_ms:
+            if self.complexidade > self.complexidade_minima:
+                self.complexidade -= 1
+                self._bloqueio_subida = JANELAS_APOS_REDUCAO
+        elif self._bloqueio_subida > 0:
+            self._bloqueio_subida -= 1
+        elif (self.latencia_ms < self.orcamento_latencia_ms * FOLGA_PARA_SUBIR
+              and self.complexidade < self.complexidade_maxima):
+            self.complexidade += 1
+
+        if fps_captura > 0:
+            # Passo para a taxa alvo, limitado ao que a thread de processamento consegue analisar
+            passo_alvo = math.ceil(fps_captura / self.taxa_alvo)
+            passo_capacidade = math.ceil(fps_captura * self.latencia_ms / 1000.0)
+            self.passo = min(self.passo_maximo, max(1, passo_alvo, passo_capacidade))
+
+        mudou = self.complexidade != complexidade_anterior
+        if mudou:
+            self.ajustes += 1
+        return mudou
+
+    def taxa_analise(self, fps_captura):
+        """Análises por segundo esperadas com o passo atual"""
+        return fps_captura / self.passo if self.passo else 0.0
+
+    def estado(self, fps_captura=0.0):
+        """
+        Retorna passo, complexidade, latência medida e taxa de análise esperada.
+        """
+        return {
+            'passo': self.passo,
+            'complexidade': self.complexidade,
+            'latencia_pose_p95_ms': self.latencia_ms,
+            'taxa_analise': self.taxa_analise(fps_captura),
+            'taxa_alvo': self.taxa_alvo,
+            'adaptativo': self.adaptativo
+        }
@@ -0,0 +1,63 @@
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """
+    Cache limitado que descarta o item usado há mais tempo (LRU).
+    Busca, inserção e descarte são O(1).
+    """
+    def __init__(self, capacidade=32):
+        """
+        :param capacidade: Quantidade máxima de itens mantidos.
+        """
+        self.capacidade = capacidade
+        self._itens = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, chave):
+        """
+        Retorna o valor guardado para a chave (ou None) e atualiza os contadores.
+        """
+        if chave is None or chave not in self._itens:
+            self.falhas += 1
+            return None
+        self._itens.move_to_end(chave)
+        self.acertos += 1
+        return self._itens[chave]
+
+    def guardar(self, chave, valor):
+        """
+        Guarda um valor, descartando o item menos usado se o cache estiver cheio.
+        """
+        if chave is None:
+            return
+        self._itens[chave] = valor
+        self._itens.move_to_end(chave)
+        if len(self._itens) > self.capacidade:
+            self._itens.popitem(last=False)
+
+    def limpar(self):
+        """Remove todos os itens e zera os contadores"""
+        self._itens.clear()
+        self.acertos = 0
+        self.falhas = 0
+
+    def estatisticas(self):
+        """
+        Retorna tamanho, acertos, falhas e taxa de acerto do cache.
+        """
+        total = self.acertos + self.falhas
+        return {
+            'tamanho': len(self._itens),
+            'capacidade': self.capacidade,
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'taxa_acerto': self.acertos / total if total else 0.0
+        }
+
+    def __len__(self):
+        return len(self._itens)
+
+    def __contains__(self, chave):
+        return chave in self._itens
@@ -0,0 +1,116 @@
+"""
+Descoberta das câmeras disponíveis fora do caminho de inicialização.
+
+No Linux as câmeras são listadas pelos dispositivos /dev/video* (sem abrir nenhum);
+nos demais sistemas os índices são sondados com cv2.VideoCapture. A lista é
+descoberta em segundo plano e mantida em cache por um tempo de validade.
+"""
+import glob
+import os
+import re
+import threading
+import time
+import cv2
+
+
+def listar_dispositivos_linux():
+    """
+    Retorna os índices das câmeras de captura em /dev/video*, ou None fora do Linux.
+    Nós de metadados (mesmo dispositivo físico, índice V4L2 diferente de 0) são ignorados.
+    """
+    if not os.path.isdir('/dev') or not os.path.isdir('/sys/class/video4linux'):
+        return None
+    indices = []
+    for caminho in glob.glob('/dev/video*'):
+        encontrado = re.fullmatch(r'/dev/video(\d+)', caminho)
+        if not encontrado:
+            continue
+        try:
+            with open(f'/sys/class/video4linux/video{encontrado.group(1)}/index') as arquivo:
+                if arquivo.read().strip() != '0':
+                    continue
+        except OSError:
+            pass
+        indices.append(int(encontrado.group(1)))
+    return sorted(indices)
+
+
+def sondar_indices(max_indices=10):
+    """
+    Abre e libera cv2.VideoCapture(i) para i em 0..max_indices-1 (lento sem câmeras).
+    """
+    disponiveis = []
+    for i in range(max_indices):
+        cap = cv2.VideoCapture(i)
+        if cap.isOpened():
+            disponiveis.append(i)
+        cap.release()
+    return disponiveis
+
+
+class DescobertaCameras:
+    """
+    Lista de câmeras descoberta em uma thread de fundo, com cache por `validade` segundos.
+    """
+    def __init__(self, validade=300.0, max_indices=10, descobrir=None):
+        """
+        :param validade: Segundos até a lista em cache ser descoberta novamente.
+        :param max_indices: Índices sondados quando /dev/video* não está disponível.
+        :param descobrir: Função que retorna a lista de índices (padrão: Linux ou sondagem).
+        """
+        self.validade = validade
+        self.max_indices = max_indices
+        self._descobrir = descobrir or self._descobrir_padrao
+        self._cameras = None
+        self._atualizado_em = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._concluida = threading.Event()
+
+    def _descobrir_padrao(self):
+        indices = listar_dispositivos_linux()
+        return indices if indices is not None else sondar_indices(self.max_indices)
+
+    def atualizar(self, esperar=False, timeout=None):
+        """
+        Inicia uma nova descoberta em segundo plano (se nenhuma estiver em andamento).
+        :param esperar: Aguarda o fim da descoberta antes de retornar.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._concluida.clear()
+                self._thread = threading.Thread(target=self._executar, name="descoberta-cameras", daemon=True)
+                self._thread.start()
+        if esperar:
+            self._concluida.wait(timeout)
+
+    def obter(self, esperar=False, timeout=None):
+        """
+        Retorna a lista de câmeras em cache; uma lista vencida dispara nova descoberta.
+        :param esperar: Sem lista em cache, aguarda a primeira descoberta.
+        :return: Lista de índices (vazia enquanto a primeira descoberta não terminar).
+        """
+        with self._lock:
+            vencida = self._atualizado_em is None or time.monotonic() - self._atualizado_em > self.validade
+        if vencida:
+            self.atualizar(esperar=esperar and self._cameras is None, timeout=timeout)
+        with self._lock:
+            return list(self._cameras or [])
+
+    @property
+    def descobertas(self):
+        """Indica se alguma descoberta já terminou"""
+        return self._atualizado_em is not None
+
+    def _executar(self):
+        try:
+            cameras = self._descobrir()
+        except Exception as e:
+            print(f"Erro ao descobrir câmeras: {e}")
+            cameras = None
+        with self._lock:
+            if cameras is not None:
+                self._cameras = cameras
+                self._atualizado_em = time.monotonic()
+            self._thread = None
+        self._concluida.set()
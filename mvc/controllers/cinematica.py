@@ -0,0 +1,75 @@
+"""
+Cálculo vetorizado dos ângulos corporais a partir dos landmarks do MediaPipe Pose.
+Os landmarks são convertidos uma única vez para um array (33, 4) float32 com
+colunas x, y, z e visibility; os ângulos de todas as articulações são então
+calculados em uma só operação NumPy, inclusive sobre lotes (N, 33, 4).
+"""
+import numpy as np
+
+NUM_LANDMARKS = 33
+
+# Índices dos landmarks no modelo MediaPipe Pose
+NARIZ = 0
+OMBRO_ESQUERDO = 11
+OMBRO_DIREITO = 12
+COTOVELO_ESQUERDO = 13
+COTOVELO_DIREITO = 14
+QUADRIL_ESQUERDO = 23
+QUADRIL_DIREITO = 24
+
+# Cada ângulo é medido no segundo ponto, entre os segmentos que o ligam ao primeiro e ao terceiro
+ARTICULACOES = {
+    'pescoco': (NARIZ, OMBRO_ESQUERDO, OMBRO_DIREITO),
+    'ombro_esquerdo': (COTOVELO_ESQUERDO, OMBRO_ESQUERDO, QUADRIL_ESQUERDO),
+    'ombro_direito': (COTOVELO_DIREITO, OMBRO_DIREITO, QUADRIL_DIREITO),
+    'coluna': (OMBRO_ESQUERDO, QUADRIL_ESQUERDO, QUADRIL_DIREITO)
+}
+
+NOMES_ARTICULACOES = tuple(ARTICULACOES)
+_TRIPLAS = np.array(list(ARTICULACOES.values()), dtype=np.intp)
+
+
+def landmarks_para_array(landmarks, saida=None):
+    """
+    Converte landmarks do MediaPipe (lista ou dicionário índice -> ponto) em um array (33, 4).
+    Pontos ausentes ficam como NaN; z e visibility ausentes valem 0 e 1.
+    :param saida: Array (33, 4) float32 opcional reaproveitado entre chamadas.
+    """
+    if saida is None:
+        saida = np.empty((NUM_LANDMARKS, 4), dtype=np.float32)
+
+    if hasattr(landmarks, 'items'):
+        saida.fill(np.nan)
+        for indice, p in landmarks.items():
+            saida[indice] = (p.x, p.y, getattr(p, 'z', 0.0), getattr(p, 'visibility', 1.0))
+    else:
+        saida[:] = [(p.x, p.y, p.z, p.visibility) for p in landmarks]
+    return saida
+
+
+def calcular_angulos(pontos, triplas=_TRIPLAS):
+    """
+    Calcula os ângulos (em graus, no plano x/y) das articulações configuradas.
+    :param pontos: Array (..., 33, 4) ou (..., 33, 2) de landmarks.
+    :param triplas: Array (K, 3) com os índices dos pontos de cada ângulo.
+    :return: Array (..., K) float32; NaN onde algum ponto estiver ausente.
+    """
+    xy = np.asarray(pontos, dtype=np.float32)[..., :2]
+    a = xy[..., triplas[:, 0], :]
+    b = xy[..., triplas[:, 1], :]
+    c = xy[..., triplas[:, 2], :]
+
+    ba = a - b
+    bc = c - b
+    produto = np.einsum('...i,...i->...', ba, bc)
+    normas = np.linalg.norm(ba, axis=-1) * np.linalg.norm(bc, axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cosseno = np.clip(produto / normas, -1.0, 1.0)
+    return np.degrees(np.arccos(cosseno))
+
+
+def angulos_para_dict(valores):
+    """
+    Converte o vetor de ângulos de um frame no dicionário usado pelo Controller.
+    """
+    return {nome: float(valor) for nome, valor in zip(NOMES_ARTICULACOES, valores)}
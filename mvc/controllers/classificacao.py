@@ -0,0 +1,110 @@
+"""
+Regras de classificação da postura a partir dos ângulos corporais.
+Compartilhadas pelo monitoramento ao vivo e pela análise em lote de vídeos.
+"""
+import math
+
+# Limites (em graus) usados na classificação
+LIMIARES = {
+    'coluna_min': 70,
+    'coluna_max': 110,
+    'pescoco_min': 60
+}
+
+POSTURA_CORRETA = "Postura correta"
+
+# Descrição registrada para cada tipo de erro
+DESCRICOES = {
+    'coluna_curvada': "Postura incorreta - Coluna muito curvada",
+    'coluna_reta': "Postura incorreta - Coluna muito reta",
+    'pescoco_inclinado': "Postura incorreta - Pescoço muito inclinado"
+}
+
+
+def classificar_postura(angulos, limiares=LIMIARES):
+    """
+    Classifica a postura com base nos ângulos do pescoço e da coluna.
+    :return: Tupla (descrição da postura, tipo do erro ou None se correta);
+        (None, None) se algum ângulo é NaN (ponto do corpo ausente no frame).
+    """
+    if math.isnan(angulos['pescoco']) or math.isnan(angulos['coluna']):
+        return None, None
+    if angulos['coluna'] < limiares['coluna_min']:
+        tipo_erro = 'coluna_curvada'
+    elif angulos['coluna'] > limiares['coluna_max']:
+        tipo_erro = 'coluna_reta'
+    elif angulos['pescoco'] < limiares['pescoco_min']:
+        tipo_erro = 'pescoco_inclinado'
+    else:
+        return POSTURA_CORRETA, None
+    return DESCRICOES[tipo_erro], tipo_erro
+
+
+class MaquinaEstadosPostura:
+    """
+    Estado estável da postura a partir da classificação de cada frame.
+
+    Ângulos perto de um limite alternariam a classificação a cada frame; aqui a
+    postura só muda quando o ângulo passa do limite por mais de `histerese` graus
+    (para entrar em um erro ou para sair dele) e a nova classificação se mantém por
+    `permanencia_minima` segundos. Assim, gravação, alertas e interface trabalham
+    na proporção das mudanças de postura, não da taxa de frames.
+    """
+    def __init__(self, limiares=LIMIARES, histerese=5.0, permanencia_minima=1.0):
+        """
+        :param limiares: Limites de classificação (o mesmo dicionário pode ser alterado depois).
+        :param histerese: Graus além do limite exigidos para mudar de estado.
+        :param permanencia_minima: Segundos que uma nova classificação precisa durar para ser aceita.
+        """
+        self.limiares = limiares
+        self.histerese = histerese
+        self.permanencia_minima = permanencia_minima
+        self.postura = None
+        self.tipo_erro = None
+        self.transicoes = 0
+        self._candidato = None
+        self._candidato_desde = None
+
+    def _limiares_efetivos(self):
+        """Limites deslocados pela histerese a favor do estado atual"""
+        if self.postura is None:
+            return self.limiares
+        h = self.histerese
+        return {
+            'coluna_min': self.limiares['coluna_min'] + (h if self.tipo_erro == 'coluna_curvada' else -h),
+            'coluna_max': self.limiares['coluna_max'] + (-h if self.tipo_erro == 'coluna_reta' else h),
+            'pescoco_min': self.limiares['pescoco_min'] + (h if self.tipo_erro == 'pescoco_inclinado' else -h)
+        }
+
+    def atualizar(self, angulos, instante):
+        """
+        Classifica os ângulos de um frame e atualiza o estado.
+        :param instante: Momento do frame em segundos (ex: time.monotonic() ou o tempo do vídeo).
+        :return: Tupla (descrição da postura, tipo do erro ou None, True se o estado mudou);
+            (None, None, False) se os ângulos não permitem classificar, sem alterar o estado.
+        """
+        candidato = classificar_postura(angulos, self._limiares_efetivos())
+        if candidato[0] is None:
+            return None, None, False
+        if self.postura is None:
+            # Primeira classificação: aceita de imediato
+            self.postura, self.tipo_erro = candidato
+            self.transicoes += 1
+            return self.postura, self.tipo_erro, True
+        if candidato[1] == self.tipo_erro:
+            self._candidato = None
+            return self.postura, self.tipo_erro, False
+
+        if self._candidato is None or self._candidato[1] != candidato[1]:
+            self._candidato = candidato
+            self._candidato_desde = instante
+        if instante - self._candidato_desde < self.permanencia_minima:
+            return self.postura, self.tipo_erro, False
+        self.postura, self.tipo_erro = candidato
+        self._candidato = None
+        self.transicoes += 1
+        return self.postura, self.tipo_erro, True
+
+    def reiniciar(self):
+        """Esquece o estado (a próxima classificação é aceita de imediato)"""
+        self.postura = self.tipo_erro = self._candidato = self._candidato_desde = None
@@ -1,10 +1,24 @@
-from views.view import View
 from models.model import Model
+from models.landmarks import GravadorLandmarks
+from controllers.pipeline import AnelBuffers, PipelineVideo
+from controllers.eventos import SinkNulo
+from controllers.cache import CacheLRU
+from controllers.cameras import DescobertaCameras
+from controllers.fontes import criar_fonte
+from controllers.metricas import MetricasDesempenho, formatar_resumo
+from controllers.agendador import AgendadorAnalise
+from controllers.preprocessamento import PreProcessador
+from controllers.roi import RastreadorROI
+from controllers.motores_pose import classe_motor, criar_motor
+from controllers import cinematica
+from controllers.classificacao import LIMIARES, MaquinaEstadosPostura
 import cv2
-from PIL import Image, ImageTk
 import numpy as np
-import mediapipe as mp
+import dataclasses
+from concurrent.futures import Future
+import logging
 import math
+import threading
 import time
 from datetime import datetime, timedelta
 
@@ -12,26 +26,66 @@ class Controller:
     """
     Classe responsável por controlar o fluxo do sistema de análise de postura.
     Gerencia a comunicação entre a View (interface) e o Model (dados), além de processar imagens e alertas.
+    Sem janela Tkinter, os eventos vão para um destino (ver controllers.eventos) e os
+    resultados do pipeline são consumidos por uma thread própria.
     """
-    def __init__(self, model, root):
+    def __init__(self, model, root=None, sink=None):
         """
         Inicializa o Controller, configura variáveis, cache, câmera e integra com a View.
         :param model: Instância do Model para acesso ao banco de dados.
-        :param root: Janela principal Tkinter.
+        :param root: Janela principal Tkinter; None executa sem interface gráfica.
+        :param sink: Destino dos eventos; padrão: View em root ou, sem root, SinkNulo.
         """
         self.model = model
         self.root = root  # Adiciona referência à janela principal
-        self.view = View(root, self)
+        if sink is None:
+            if root is not None:
+                from views.view import View  # Tkinter só é importado com interface
+                sink = View(root, self)
+            else:
+                sink = SinkNulo()
+        self.view = sink
         self.cap = None
+        self.pipeline = None
         self.is_running = False
+        self.fonte = {'tipo': 'webcam', 'indice': 0}  # Configuração da fonte de frames (ver criar_fonte)
+        # Frames RGB de exibição: 2 em cada fila do pipeline, 1 sendo exibido e 1 sendo escrito
+        self.tamanho_fila = 2
+        self._buffers_exibicao = AnelBuffers(2 * self.tamanho_fila + 2)
+        # Redimensionamento e brilho/contraste em buffers reaproveitados
+        self.preprocessador = PreProcessador(640, 480)
+        # Região analisada pelo MediaPipe, recortada do frame original em torno da pessoa
+        self.roi = RastreadorROI()
+        self._thread_consumo = None
         
-        # Cache para frames
-        self.frame_cache = []
-        self.max_cache_size = 5
+        # Cache de análises para poses quase idênticas
+        self.max_cache_size = 32
+        self.tolerancia_cache = 0.01  # Em coordenadas normalizadas (~6 px em 640x480)
+        self._indices_cache = sorted({i for tripla in cinematica.ARTICULACOES.values() for i in tripla})
+        self.frame_cache = CacheLRU(self.max_cache_size)
+        self._ultima_chave_exibida = None
         
+        # Métricas de desempenho por etapa (overlay, log periódico e get_metricas)
+        self.metricas = MetricasDesempenho()
+        self.intervalo_log_metricas = 30.0  # Segundos entre as linhas de log; None desativa
+        self._ultimo_log_metricas = time.monotonic()
+
         # Otimização de processamento
-        self.skip_frames = 2  # Processa 1 a cada 3 frames
-        self.frame_count = 0
+        # Passo (1 a cada N frames) e complexidade do MediaPipe ajustados pela latência medida
+        self.agendador = AgendadorAnalise()
+        self._complexidade_pose = None
+
+        # Motor de estimativa de pose (ver controllers.motores_pose e configurar_pose)
+        self.config_pose = {
+            'motor': 'mediapipe',
+            'suavizar': True,
+            'confianca_deteccao': 0.5,
+            'confianca_rastreamento': 0.5,
+            'modelo': None
+        }
+        self._pose_pendente = None  # Motor trocado em configurar_pose, assumido no próximo frame analisado
+        self._lock_pose = threading.Lock()
+        self._lock_configuracao_pose = threading.Lock()  # Uma troca de motor em segundo plano por vez
         
         # Configurações padrão da câmera
         self.camera_settings = {
@@ -41,18 +95,16 @@ class Controller:
             'contrast': 1.2
         }
         
-        # Lista de câmeras disponíveis
-        self.available_cameras = self._get_available_cameras()
-
-        # Inicializa MediaPipe Pose
-        self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5,
-            static_image_mode=False
-        )
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.mp_drawing_styles = mp.solutions.drawing_styles
+        # Lista de câmeras disponíveis, descoberta em segundo plano
+        self.cameras = DescobertaCameras()
+        self.cameras.atualizar()
+
+        # Motor de pose e MediaPipe (desenho) são carregados no primeiro início do monitoramento
+        self.mp_pose = None
+        self.pose = None
+        self.mp_drawing = None
+        self.mp_drawing_styles = None
+        self._estilo_landmarks = None
 
         # Dicionário para armazenar os ângulos
         self.angulos = {
@@ -61,12 +113,23 @@ class Controller:
             'ombro_direito': 0,
             'coluna': 0
         }
+        # Landmarks do frame atual como array (33, 4), reaproveitado entre frames
+        self.pontos = np.zeros((cinematica.NUM_LANDMARKS, 4), dtype=np.float32)
+        # Gravação opcional dos landmarks de cada frame analisado (ver models.landmarks)
+        self.diretorio_landmarks = None  # Diretório dos segmentos; None não grava
+        self.gravador_landmarks = None
+
+        # Limites de classificação da postura
+        self.limiares = dict(LIMIARES)
+        # Postura estável (histerese e permanência mínima): só as mudanças movem alertas e interface
+        self.estado_postura = MaquinaEstadosPostura(self.limiares)
 
         # Sistema de alertas
         self.ultimo_alerta = None
         self.tempo_ultimo_alerta = None
         self.duracao_postura_incorreta = 0
         self.alerta_ativo = False
+        self._alerta_emitido = False
         self.tempo_para_alerta = 10
         self.sugestoes = {
             'coluna_curvada': [
@@ -86,15 +149,97 @@ class Controller:
             ]
         }
 
-    def _get_available_cameras(self):
-        """Retorna lista de câmeras disponíveis no sistema"""
-        available = []
-        for i in range(10):
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                available.append(i)
-                cap.release()
-        return available
+    def _inicializar_pose(self):
+        """
+        Cria o motor de pose com a complexidade do agendador (operação lenta: feita no
+        primeiro início e quando a complexidade muda) ou assume o motor trocado em
+        configurar_pose. Executado na thread de processamento durante o monitoramento.
+        """
+        with self._lock_pose:
+            pendente, self._pose_pendente = self._pose_pendente, None
+        if pendente is not None:
+            motor, complexidade, minima, maxima = pendente
+            self.agendador.complexidade_minima = minima
+            self.agendador.complexidade_maxima = maxima
+            self.agendador.complexidade = complexidade
+            self._trocar_motor(motor, complexidade)
+
+        complexidade = self.agendador.complexidade
+        if self.pose is None:
+            self._trocar_motor(criar_motor(self.config_pose, complexidade), complexidade)
+        elif complexidade != self._complexidade_pose:
+            try:
+                self._trocar_motor(criar_motor(self.config_pose, complexidade), complexidade)
+            except Exception as e:
+                # Ex: modelos lite/heavy do MediaPipe são baixados no primeiro uso e podem faltar offline
+                print(f"Erro ao carregar o modelo de pose com complexidade {complexidade}: {e}")
+                atual = self._complexidade_pose
+                self.agendador.complexidade = atual
+                self.agendador.complexidade_minima = self.agendador.complexidade_maxima = atual
+
+        if self.mp_drawing is None:
+            import mediapipe as mp
+            self.mp_pose = mp.solutions.pose
+            self.mp_drawing = mp.solutions.drawing_utils
+            self.mp_drawing_styles = mp.solutions.drawing_styles
+            # Os estilos do MediaPipe têm cores BGR; o desenho é feito no frame RGB
+            self._estilo_landmarks = {
+                landmark: dataclasses.replace(estilo, color=tuple(reversed(estilo.color)))
+                for landmark, estilo in self.mp_drawing_styles.get_default_pose_landmarks_style().items()
+            }
+
+    def _trocar_motor(self, motor, complexidade):
+        if self.pose is not None:
+            self.pose.fechar()
+        self.pose = motor
+        self._complexidade_pose = complexidade
+
+    def configurar_pose(self, complexidade=None, **opcoes):
+        """
+        Troca o motor de pose ou suas opções, ex: configurar_pose(motor='mediapipe_tasks',
+        modelo='modelos') ou configurar_pose(complexidade=0, suavizar=False).
+        O motor é criado aqui (erros, como um modelo ausente, chegam a quem chamou e
+        mantêm o motor atual) e assumido no próximo frame analisado.
+        :param complexidade: Maior complexidade do modelo (0 lite, 1 full, 2 heavy); o
+                             agendador começa nela e só a reduz se a latência exigir.
+        :param opcoes: Chaves de config_pose ('motor', 'suavizar', 'confianca_deteccao',
+                       'confianca_rastreamento', 'modelo').
+        """
+        config = dict(self.config_pose, **opcoes)
+        aceitas = classe_motor(config['motor']).complexidades
+        desejada = self.agendador.complexidade_maxima if complexidade is None else complexidade
+        maxima = min(aceitas, key=lambda c: abs(c - desejada))
+        motor = criar_motor(config, maxima)
+        with self._lock_pose:
+            anterior, self._pose_pendente = self._pose_pendente, (motor, maxima, min(aceitas), maxima)
+        if anterior is not None:
+            anterior[0].fechar()
+        if self.pipeline is None:
+            # Sem monitoramento, o agendador já reflete a escolha (com ele, a troca é na thread de processamento)
+            self.agendador.complexidade_minima = min(aceitas)
+            self.agendador.complexidade_maxima = self.agendador.complexidade = maxima
+        self.config_pose = config
+
+    def configurar_pose_em_segundo_plano(self, complexidade=None, **opcoes):
+        """
+        Executa configurar_pose em uma thread própria: criar o motor (e, na primeira vez,
+        baixar o modelo) pode levar segundos e não deve travar a interface. O motor atual
+        continua em uso até o novo ficar pronto.
+        :return: Future concluída quando o novo motor é assumido (com a exceção, se falhar).
+        """
+        futuro = Future()
+
+        def configurar():
+            with self._lock_configuracao_pose:
+                try:
+                    self.configurar_pose(complexidade, **opcoes)
+                except Exception as e:
+                    futuro.set_exception(e)
+                else:
+                    futuro.set_result(None)
+
+        threading.Thread(target=configurar, name="configuracao-pose", daemon=True).start()
+        return futuro
 
     def iniciar_monitoramento(self):
         """
@@ -103,8 +248,11 @@ class Controller:
         """
         if not self.is_running:
             try:
+                self._inicializar_pose()
+                self.estado_postura.reiniciar()
+
                 # Tenta abrir a câmera
-                self.cap = cv2.VideoCapture(0)
+                self.cap = criar_fonte(self.fonte)
                 if not self.cap.isOpened():
                     raise Exception("Não foi possível acessar a câmera")
 
@@ -117,9 +265,23 @@ class Controller:
                 if width == 0 or height == 0:
                     raise Exception("Erro ao configurar resolução da câmera")
 
+                if self.diretorio_landmarks is not None:
+                    self.gravador_landmarks = GravadorLandmarks(self.diretorio_landmarks)
+
+                # Captura e processamento rodam em threads próprias
+                self.metricas.limpar()
+                self.pipeline = PipelineVideo(self.cap, self._processar_quadro, self.tamanho_fila,
+                                              metricas=self.metricas)
+                self.pipeline.iniciar()
+
                 self.is_running = True
                 self.view.atualizar_status("Monitoramento iniciado com sucesso!", "success")
-                self.atualizar_frame()
+                if self.root is not None:
+                    self.atualizar_frame()
+                else:
+                    self._thread_consumo = threading.Thread(
+                        target=self._loop_consumo, name="consumo-resultados", daemon=True)
+                    self._thread_consumo.start()
             except Exception as e:
                 self.view.atualizar_status(f"Erro ao iniciar câmera: {str(e)}", "error")
                 self.parar_monitoramento()
@@ -172,27 +334,20 @@ class Controller:
         Encerra o monitoramento e libera a câmera.
         """
         self.is_running = False
+        consumo, self._thread_consumo = self._thread_consumo, None
+        if consumo is not None and consumo is not threading.current_thread():
+            consumo.join()
+        if self.pipeline is not None:
+            self.pipeline.parar()
+            self.pipeline = None
         if self.cap is not None:
             self.cap.release()
             self.cap = None
+        if self.gravador_landmarks is not None:
+            self.gravador_landmarks.fechar()
+            self.gravador_landmarks = None
         self.view.atualizar_status("Monitoramento parado!", "info")
 
-    def _calcular_angulo(self, p1, p2, p3):
-        """
-        Calcula o ângulo formado por três pontos (usado para análise de postura).
-        """
-        a = np.array(p1)
-        b = np.array(p2)
-        c = np.array(p3)
-        
-        ba = a - b
-        bc = c - b
-        
-        cosine_angle = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc))
-        angle = np.arccos(cosine_angle)
-        
-        return np.degrees(angle)
-
     def _analisar_postura(self, landmarks):
         """
         Analisa os pontos do corpo detectados e classifica a postura.
@@ -201,42 +356,39 @@ class Controller:
             return None
 
         try:
-            # Otimização: Usa cache para landmarks similares
-            cache_key = self._gerar_cache_key(landmarks)
-            if cache_key in self.frame_cache:
-                return self.frame_cache[cache_key]
-
-            # Pontos para análise do pescoço
-            nariz = landmarks[self.mp_pose.PoseLandmark.NOSE.value]
-            ombro_esquerdo = landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-            ombro_direito = landmarks[self.mp_pose.PoseLandmark.RIGHT_SHOULDER.value]
-            quadril_esquerdo = landmarks[self.mp_pose.PoseLandmark.LEFT_HIP.value]
-            quadril_direito = landmarks[self.mp_pose.PoseLandmark.RIGHT_HIP.value]
-
-            # Calcula ângulos
-            self.angulos['pescoco'] = self._calcular_angulo(
-                (nariz.x, nariz.y),
-                (ombro_esquerdo.x, ombro_esquerdo.y),
-                (ombro_direito.x, ombro_direito.y)
-            )
-
-            self.angulos['coluna'] = self._calcular_angulo(
-                (ombro_esquerdo.x, ombro_esquerdo.y),
-                (quadril_esquerdo.x, quadril_esquerdo.y),
-                (quadril_direito.x, quadril_direito.y)
-            )
-
-            # Atualiza a view com os ângulos
-            self.view.atualizar_angulos(self.angulos)
-
-            # Analisa a postura
-            postura, tipo_erro = self._classificar_postura()
-            if postura:
-                self._gerenciar_alertas(postura, tipo_erro)
-                self.model.registrar_postura(postura, 1, self.angulos)
+            # Converte os landmarks uma única vez por frame
+            cinematica.landmarks_para_array(landmarks, self.pontos)
+            if self.gravador_landmarks is not None:
+                self.gravador_landmarks.adicionar(self.pontos)
+
+            # Otimização: Reaproveita a análise de poses quase idênticas
+            cache_key = self._gerar_cache_key(self.pontos)
+            em_cache = self.frame_cache.obter(cache_key)
+            if em_cache is not None:
+                self.angulos.update(em_cache)
+                if cache_key != self._ultima_chave_exibida:
+                    self.view.atualizar_angulos(self.angulos)
+                    self._ultima_chave_exibida = cache_key
+            else:
+                # Calcula todos os ângulos (pescoço, ombros e coluna) de uma vez
+                self.angulos.update(cinematica.angulos_para_dict(
+                    cinematica.calcular_angulos(self.pontos)
+                ))
+
+                # Atualiza a view com os ângulos
+                self.view.atualizar_angulos(self.angulos)
+                self._ultima_chave_exibida = cache_key
+
+                # Atualiza cache
+                self.frame_cache.guardar(cache_key, dict(self.angulos))
 
-            # Atualiza cache
-            self._atualizar_cache(cache_key, (postura, tipo_erro))
+            # Analisa a postura (estável: muda só em transições reais)
+            postura, tipo_erro, mudou = self._classificar_postura()
+
+            if postura:
+                self._gerenciar_alertas(postura, tipo_erro, mudou)
+                with self.metricas.medir('registro'):
+                    self.model.registrar_postura(postura, 1, self.angulos)
 
             return postura, tipo_erro
         except Exception as e:
@@ -245,40 +397,37 @@ class Controller:
 
     def _classificar_postura(self):
         """
-        Classifica a postura com base nos ângulos calculados.
+        Classifica a postura com base nos ângulos calculados, passando pela máquina de estados.
+        :return: Tupla (postura, tipo do erro, True se a postura estável mudou neste frame).
         """
         try:
-            if self.angulos['coluna'] < 70:
-                return "Postura incorreta - Coluna muito curvada", "coluna_curvada"
-            elif self.angulos['coluna'] > 110:
-                return "Postura incorreta - Coluna muito reta", "coluna_reta"
-            elif self.angulos['pescoco'] < 60:
-                return "Postura incorreta - Pescoço muito inclinado", "pescoco_inclinado"
-            else:
-                return "Postura correta", None
+            return self.estado_postura.atualizar(self.angulos, time.monotonic())
         except Exception as e:
             print(f"Erro ao classificar postura: {e}")
-            return None, None
+            return None, None, False
 
-    def _gerenciar_alertas(self, postura, tipo_erro):
+    def _gerenciar_alertas(self, postura, tipo_erro, mudou=True):
         """
         Gerencia o sistema de alertas visuais e sonoros conforme a postura detectada.
+        A interface só é acionada quando o alerta dispara, quando o tipo de erro muda
+        com o alerta ativo e quando a postura volta a ser correta.
         """
         try:
-            agora = datetime.now()
-            
             if "incorreta" in postura:
                 if not self.alerta_ativo:
                     self.alerta_ativo = True
-                    self.tempo_ultimo_alerta = agora
+                    self._alerta_emitido = False
+                    self.tempo_ultimo_alerta = datetime.now()
                     self.duracao_postura_incorreta = 0
                 else:
                     self.duracao_postura_incorreta += 1
                     
-                if self.duracao_postura_incorreta >= self.tempo_para_alerta:
+                if self.duracao_postura_incorreta >= self.tempo_para_alerta and (mudou or not self._alerta_emitido):
                     self._ativar_alertas(tipo_erro)
-            else:
+                    self._alerta_emitido = True
+            elif mudou:
                 self.alerta_ativo = False
+                self._alerta_emitido = False
                 self.duracao_postura_incorreta = 0
                 self.view.desativar_alertas()
         except Exception as e:
@@ -294,73 +443,126 @@ class Controller:
         except Exception as e:
             print(f"Erro ao ativar alertas: {e}")
 
-    def atualizar_frame(self):
+    def executar_sem_interface(self, duracao=None):
         """
-        Atualiza o frame da câmera, processa a imagem e agenda a próxima atualização.
+        Monitora sem interface gráfica até `duracao` segundos, Ctrl+C ou falha da câmera.
         """
-        if self.is_running and self.cap is not None:
-            try:
-                ret, frame = self.cap.read()
-                if not ret:
-                    raise Exception("Erro ao capturar frame")
+        self.iniciar_monitoramento()
+        limite = None if duracao is None else time.monotonic() + duracao
+        try:
+            while self.is_running and (limite is None or time.monotonic() < limite):
+                time.sleep(0.1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if self.is_running:
+                self.parar_monitoramento()
 
-                # Otimização: Redimensiona o frame para processamento mais rápido
-                frame = cv2.resize(frame, (640, 480))
-                
-                # Otimização: Processa apenas alguns frames
-                self.frame_count += 1
-                if self.frame_count % self.skip_frames != 0:
-                    # Aplica ajustes de brilho e contraste
-                    frame = self._aplicar_ajustes_imagem(frame)
-                    # Converte para formato Tkinter
-                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    photo = ImageTk.PhotoImage(image=Image.fromarray(frame))
-                    self.view.atualizar_video(photo)
-                    self.root.after(10, self.atualizar_frame)
-                    return
+    def _loop_consumo(self):
+        """
+        Substitui o agendamento do Tkinter quando não há interface gráfica.
+        """
+        while self.is_running and self.pipeline is not None:
+            self.atualizar_frame()
+            time.sleep(0.01)
 
-                # Aplica ajustes de brilho e contraste
-                frame = self._aplicar_ajustes_imagem(frame)
+    def atualizar_frame(self):
+        """
+        Exibe o resultado mais recente do pipeline e agenda a próxima atualização.
+        Executado na thread do Tkinter (ou na thread de consumo, sem interface):
+        não captura nem processa frames.
+        """
+        if self.is_running and self.pipeline is not None:
+            try:
+                resultados = self.pipeline.obter_resultados()
 
-                # Processa o frame com MediaPipe
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = self.pose.process(frame_rgb)
+                # Analisa todos os frames processados, mas desenha apenas o último
+                for _, landmarks in resultados:
+                    if landmarks is not None:
+                        with self.metricas.medir('analise'):
+                            self._analisar_postura(landmarks)
 
-                if results.pose_landmarks:
-                    # Desenha os landmarks
-                    self.mp_drawing.draw_landmarks(
-                        frame,
-                        results.pose_landmarks,
-                        self.mp_pose.POSE_CONNECTIONS,
-                        landmark_drawing_spec=self.mp_drawing_styles.get_default_pose_landmarks_style()
-                    )
+                if resultados:
+                    with self.metricas.medir('exibicao'):
+                        self.view.exibir_quadro(resultados[-1][0])
+                    self.metricas.contar('exibidos')
 
-                    # Analisa a postura
-                    self._analisar_postura(results.pose_landmarks.landmark)
+                self._registrar_metricas_periodicas()
 
-                # Converte para formato Tkinter
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                photo = ImageTk.PhotoImage(image=Image.fromarray(frame))
-                self.view.atualizar_video(photo)
+                # Falha na captura só encerra depois de exibir os últimos resultados
+                if self.pipeline.erro and not resultados:
+                    raise Exception(self.pipeline.erro)
 
                 # Agenda próxima atualização
-                self.root.after(10, self.atualizar_frame)
+                if self.root is not None:
+                    self.root.after(10, self.atualizar_frame)
 
             except Exception as e:
                 print(f"Erro ao atualizar frame: {e}")
                 self.parar_monitoramento()
 
+    def _processar_quadro(self, frame):
+        """
+        Prepara o frame, executa o motor de pose (na região de interesse, se houver) e
+        desenha os landmarks. Executado na thread de processamento do pipeline.
+        :return: Tupla (frame RGB para exibição, landmarks ou None).
+        """
+        metricas = self.metricas
+        original = frame
+        with metricas.medir('preparo'):
+            # Otimização: redimensiona e aplica brilho/contraste sem alocar frames novos
+            self.preprocessador.configurar(self.camera_settings['brightness'], self.camera_settings['contrast'])
+            frame = self.preprocessador.preparar(frame)
+
+        # Conversão única para RGB, usada pelo MediaPipe e pela exibição (a View só copia)
+        with metricas.medir('conversao'):
+            frame_rgb = self.preprocessador.para_rgb(frame, self._buffers_exibicao.proximo(frame.shape))
+
+        # Otimização: Processa apenas os frames escolhidos pelo agendador
+        landmarks = None
+        if self.agendador.deve_analisar():
+            if self._pose_pendente is not None:
+                self._inicializar_pose()
+
+            # Otimização: analisa só a região em torno da pessoa, com a resolução da câmera
+            regiao = self.roi.regiao_pixels(original.shape)
+            entrada = frame_rgb
+            if regiao is not None:
+                with metricas.medir('recorte'):
+                    entrada = self.preprocessador.recortar_rgb(original, regiao)
+
+            # Processa o frame com o motor de pose
+            inicio = time.perf_counter()
+            pose_landmarks = self.pose.processar(entrada)
+            duracao_pose = (time.perf_counter() - inicio) * 1000
+            metricas.registrar('pose', duracao_pose)
+            metricas.contar('analisados')
+            estilo_landmarks = self._estilo_landmarks
+            if self.agendador.registrar_inferencia(duracao_pose, metricas.taxa('capturados')):
+                self._inicializar_pose()
+
+            # Landmarks do recorte passam para o frame inteiro; sem detecção, volta ao frame inteiro
+            self.roi.atualizar(pose_landmarks and pose_landmarks.landmark, regiao, original.shape)
+            if pose_landmarks:
+                # Desenha os landmarks (depois da inferência, direto no frame de exibição)
+                with metricas.medir('desenho'):
+                    self.mp_drawing.draw_landmarks(
+                        frame_rgb,
+                        pose_landmarks,
+                        self.mp_pose.POSE_CONNECTIONS,
+                        landmark_drawing_spec=estilo_landmarks
+                    )
+                landmarks = pose_landmarks.landmark
+        return frame_rgb, landmarks
+
     def _aplicar_ajustes_imagem(self, frame):
         """
         Aplica ajustes de brilho e contraste no frame da câmera.
+        Retorna um novo frame; o original não é alterado.
         """
         try:
-            brightness = self.camera_settings['brightness']
-            contrast = self.camera_settings['contrast']
-            
-            # Aplica contraste
-            frame = cv2.convertScaleAbs(frame, alpha=contrast, beta=brightness)
-            return frame
+            self.preprocessador.configurar(self.camera_settings['brightness'], self.camera_settings['contrast'])
+            return self.preprocessador.ajustar(frame, np.empty_like(frame))
         except Exception as e:
             print(f"Erro ao aplicar ajustes de imagem: {e}")
             return frame
@@ -371,37 +573,59 @@ class Controller:
         """
         return self.camera_settings.copy()
 
-    def get_available_cameras(self):
+    def get_available_cameras(self, esperar=False):
         """
-        Retorna a lista de câmeras disponíveis no sistema.
+        Retorna a lista de câmeras disponíveis no sistema (em cache).
+        :param esperar: Aguarda a primeira descoberta se ela ainda não terminou.
         """
-        return self.available_cameras.copy()
+        return self.cameras.obter(esperar=esperar)
 
-    def _gerar_cache_key(self, landmarks):
+    def atualizar_cameras(self):
         """
-        Gera uma chave única para o cache baseada nos principais pontos do corpo.
+        Descobre novamente as câmeras (ex: após conectar uma webcam USB).
         """
-        try:
-            # Usa apenas os pontos principais para gerar a chave
-            pontos = [
-                landmarks[self.mp_pose.PoseLandmark.NOSE.value],
-                landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER.value],
-                landmarks[self.mp_pose.PoseLandmark.RIGHT_SHOULDER.value]
-            ]
-            return tuple((p.x, p.y) for p in pontos)
-        except:
-            return None
+        self.cameras.atualizar()
+
+    def get_metricas(self):
+        """
+        Retorna as métricas de desempenho: percentis por etapa, FPS de captura,
+        processamento, análise e exibição, tamanho das filas, frames descartados,
+        agendador, motor de pose, região de interesse e cache.
+        """
+        estatisticas = self.metricas.estatisticas()
+        pipeline = self.pipeline
+        if pipeline is not None:
+            estatisticas.update(pipeline.estatisticas_filas())
+        estatisticas['agendador'] = self.agendador.estado(estatisticas['fps'].get('capturados', 0.0))
+        estatisticas['motor'] = self.config_pose['motor']
+        estatisticas['roi'] = self.roi.estado()
+        estatisticas['cache'] = self.frame_cache.estatisticas()
+        return estatisticas
 
-    def _atualizar_cache(self, key, value):
+    def _registrar_metricas_periodicas(self):
         """
-        Atualiza o cache de frames processados para otimização.
+        Escreve uma linha de log com o resumo das métricas a cada intervalo_log_metricas segundos.
         """
-        if key is None:
+        if self.intervalo_log_metricas is None:
             return
+        agora = time.monotonic()
+        if agora - self._ultimo_log_metricas >= self.intervalo_log_metricas:
+            self._ultimo_log_metricas = agora
+            logging.getLogger('postura.desempenho').info(formatar_resumo(self.get_metricas()))
 
-        # Adiciona ao cache
-        self.frame_cache.append((key, value))
-        
-        # Remove itens antigos se necessário
-        if len(self.frame_cache) > self.max_cache_size:
-            self.frame_cache.pop(0) 
\ No newline at end of file
+    def get_estatisticas_cache(self):
+        """
+        Retorna os contadores de acerto/falha do cache de análises.
+        """
+        return self.frame_cache.estatisticas()
+
+    def _gerar_cache_key(self, pontos):
+        """
+        Gera a chave do cache quantizando os pontos usados no cálculo dos ângulos.
+        Poses que diferem menos que a tolerância caem na mesma chave.
+        """
+        try:
+            principais = np.nan_to_num(pontos[self._indices_cache, :2] / self.tolerancia_cache, nan=-1.0)
+            return tuple(np.rint(principais).astype(np.int32).ravel().tolist())
+        except Exception:
+            return None
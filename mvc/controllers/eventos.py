@@ -0,0 +1,63 @@
+"""
+Destinos dos eventos do monitoramento (ângulos, alertas, status e frames).
+
+O Controller só conversa com a interface através destes métodos, então o mesmo
+núcleo de captura, análise e alertas roda com a View do Tkinter ou sem interface
+gráfica (servidores, CI e benchmarks), usando um dos destinos abaixo.
+"""
+import logging
+
+
+class SinkEventos:
+    """
+    Interface dos destinos de eventos. Os métodos não fazem nada por padrão,
+    então cada destino implementa apenas os eventos que lhe interessam.
+    """
+    def atualizar_status(self, mensagem, tipo="info"):
+        """Mensagem de status do sistema (tipo: info, success, warning ou error)"""
+
+    def atualizar_angulos(self, angulos):
+        """Ângulos do frame analisado mais recente"""
+
+    def ativar_alertas(self, tipo_erro, sugestoes):
+        """Postura incorreta mantida por tempo suficiente para alertar"""
+
+    def desativar_alertas(self):
+        """Postura voltou a ser correta"""
+
+    def exibir_quadro(self, frame_rgb):
+        """Frame RGB mais recente do pipeline, já com os landmarks desenhados"""
+
+
+class SinkNulo(SinkEventos):
+    """
+    Descarta todos os eventos. Útil para benchmarks do motor de análise.
+    """
+
+
+class SinkLog(SinkEventos):
+    """
+    Registra os eventos com o módulo logging, para execução em servidores.
+    Ângulos e frames não são registrados (um evento por frame); alertas
+    são registrados apenas quando mudam.
+    """
+    def __init__(self, logger=None):
+        """
+        :param logger: Logger de destino (padrão: 'postura.monitoramento').
+        """
+        self.logger = logger or logging.getLogger('postura.monitoramento')
+        self._alerta_atual = None
+
+    def atualizar_status(self, mensagem, tipo="info"):
+        nivel = logging.ERROR if tipo == "error" else logging.WARNING if tipo == "warning" else logging.INFO
+        self.logger.log(nivel, mensagem)
+
+    def ativar_alertas(self, tipo_erro, sugestoes):
+        if tipo_erro != self._alerta_atual:
+            self._alerta_atual = tipo_erro
+            self.logger.warning("Alerta de postura: %s (%s)", tipo_erro, "; ".join(sugestoes))
+
+    def desativar_alertas(self):
+        if self._alerta_atual is not None:
+            self._alerta_atual = None
+            self.logger.info("Postura corrigida")
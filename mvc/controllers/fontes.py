@@ -0,0 +1,277 @@
+"""
+Fontes de frames para o pipeline de vídeo.
+
+Todas as fontes seguem a interface usada do cv2.VideoCapture (isOpened, read,
+get, set e release), então o pipeline e o Controller não sabem de onde os frames
+vêm. Além da webcam, há fontes reproduzíveis para testes e benchmarks: arquivo de
+vídeo, diretório de imagens, dump de frames brutos (memmap) e um gerador sintético
+determinístico. Fontes finitas podem repetir em laço, posicionar em um frame
+(seek) e entregar os frames no ritmo do FPS (tempo real).
+
+As fontes são criadas a partir de uma configuração com criar_fonte, por exemplo:
+    criar_fonte({'tipo': 'video', 'caminho': 'sessao.mp4', 'repetir': True, 'tempo_real': True})
+"""
+import os
+import time
+import cv2
+import numpy as np
+
+EXTENSOES_IMAGEM = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+
+class FonteQuadros:
+    """
+    Base das fontes finitas ou sintéticas: controla laço, seek e ritmo de entrega.
+    As subclasses implementam _ler_quadro(indice) e informam largura, altura e total.
+    """
+    def __init__(self, fps=30.0, repetir=False, tempo_real=False):
+        """
+        :param fps: Frames por segundo da fonte (usado no ritmo de tempo real).
+        :param repetir: Volta ao primeiro frame ao chegar ao fim.
+        :param tempo_real: Entrega os frames no ritmo do FPS em vez de o mais rápido possível.
+        """
+        self.fps = float(fps)
+        self.repetir = repetir
+        self.tempo_real = tempo_real
+        self.largura = 0
+        self.altura = 0
+        self.total = None  # None = sem fim
+        self.posicao = 0
+        self._aberta = True
+        self._proximo_instante = None
+
+    def _ler_quadro(self, indice):
+        """Retorna o frame BGR do índice (ou None se não houver)"""
+        raise NotImplementedError
+
+    def seek(self, indice):
+        """Posiciona a fonte no frame `indice`"""
+        self.posicao = max(0, int(indice))
+        self._proximo_instante = None
+
+    def read(self):
+        """
+        Lê o próximo frame.
+        :return: Tupla (sucesso, frame BGR) como em cv2.VideoCapture.read().
+        """
+        if not self._aberta:
+            return False, None
+        if self.total is not None and self.posicao >= self.total:
+            if not self.repetir or self.total == 0:
+                return False, None
+            self.seek(0)
+
+        quadro = self._ler_quadro(self.posicao)
+        if quadro is None and self.repetir and self.posicao > 0:
+            self.seek(0)
+            quadro = self._ler_quadro(0)
+        if quadro is None:
+            return False, None
+        self.posicao += 1
+        if self.tempo_real:
+            self._aguardar_ritmo()
+        return True, quadro
+
+    def _aguardar_ritmo(self):
+        """Dorme até o instante do frame, sem acumular atraso entre frames"""
+        agora = time.perf_counter()
+        if self._proximo_instante is None or agora - self._proximo_instante > 1.0:
+            self._proximo_instante = agora
+        espera = self._proximo_instante - agora
+        if espera > 0:
+            time.sleep(espera)
+        self._proximo_instante += 1.0 / self.fps
+
+    def isOpened(self):
+        return self._aberta
+
+    def get(self, propriedade):
+        if propriedade == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.largura)
+        if propriedade == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.altura)
+        if propriedade == cv2.CAP_PROP_FPS:
+            return self.fps
+        if propriedade == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.total if self.total is not None else -1)
+        if propriedade == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.posicao)
+        return 0.0
+
+    def set(self, propriedade, valor):
+        """Apenas a posição pode ser alterada; ajustes de câmera são ignorados"""
+        if propriedade == cv2.CAP_PROP_POS_FRAMES:
+            self.seek(valor)
+            return True
+        return False
+
+    def release(self):
+        self._aberta = False
+
+
+class FonteWebcam:
+    """
+    Câmera do sistema (cv2.VideoCapture pelo índice).
+    """
+    def __init__(self, indice=0):
+        self.indice = indice
+        self._cap = cv2.VideoCapture(indice)
+
+    def __getattr__(self, nome):
+        # isOpened, read, get, set e release vão direto para o cv2.VideoCapture
+        return getattr(self._cap, nome)
+
+
+class FonteVideo(FonteQuadros):
+    """
+    Arquivo de vídeo decodificado pelo OpenCV.
+    """
+    def __init__(self, caminho, repetir=False, tempo_real=False, fps=None):
+        """
+        :param fps: Sobrescreve o FPS do arquivo (ex: replay acelerado).
+        """
+        self._cap = cv2.VideoCapture(caminho)
+        if not self._cap.isOpened():
+            raise IOError(f"Não foi possível abrir o vídeo: {caminho}")
+        super().__init__(fps or self._cap.get(cv2.CAP_PROP_FPS) or 30.0, repetir, tempo_real)
+        self.caminho = caminho
+        self.largura = int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.altura = int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        total = int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.total = total if total > 0 else None
+        self._indice_decodificador = 0
+
+    def seek(self, indice):
+        super().seek(indice)
+        self._cap.set(cv2.CAP_PROP_POS_FRAMES, self.posicao)
+        self._indice_decodificador = self.posicao
+
+    def _ler_quadro(self, indice):
+        if indice != self._indice_decodificador:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, indice)
+        ret, quadro = self._cap.read()
+        self._indice_decodificador = indice + 1
+        if not ret:
+            # A contagem de frames do contêiner pode ser maior que a real
+            if self.total is not None and 0 < indice < self.total:
+                self.total = indice
+            return None
+        return quadro
+
+    def release(self):
+        super().release()
+        self._cap.release()
+
+
+class FonteImagens(FonteQuadros):
+    """
+    Diretório de imagens lidas em ordem alfabética, uma por frame.
+    """
+    def __init__(self, diretorio, fps=30.0, repetir=False, tempo_real=False):
+        super().__init__(fps, repetir, tempo_real)
+        self.arquivos = [
+            os.path.join(diretorio, nome) for nome in sorted(os.listdir(diretorio))
+            if nome.lower().endswith(EXTENSOES_IMAGEM)
+        ]
+        if not self.arquivos:
+            raise IOError(f"Nenhuma imagem encontrada em: {diretorio}")
+        self.total = len(self.arquivos)
+        primeiro = cv2.imread(self.arquivos[0])
+        self.altura, self.largura = primeiro.shape[:2]
+
+    def _ler_quadro(self, indice):
+        return cv2.imread(self.arquivos[indice])
+
+
+class FonteMemmap(FonteQuadros):
+    """
+    Dump de frames BGR brutos (uint8, altura x largura x canais, sem cabeçalho),
+    mapeado em memória: cada frame é uma visão do arquivo, sem cópia nem decodificação.
+    """
+    def __init__(self, caminho, largura, altura, canais=3, fps=30.0, repetir=False, tempo_real=False):
+        super().__init__(fps, repetir, tempo_real)
+        self.caminho = caminho
+        self.largura = largura
+        self.altura = altura
+        self._quadros = np.memmap(caminho, dtype=np.uint8, mode='r').reshape(-1, altura, largura, canais)
+        self.total = len(self._quadros)
+
+    def _ler_quadro(self, indice):
+        return self._quadros[indice]
+
+    def release(self):
+        super().release()
+        self._quadros = None
+
+
+def gravar_memmap(caminho, quadros):
+    """
+    Grava frames BGR (mesmo tamanho) no formato lido por FonteMemmap.
+    :return: Quantidade de frames gravados.
+    """
+    total = 0
+    with open(caminho, 'wb') as arquivo:
+        for quadro in quadros:
+            arquivo.write(np.ascontiguousarray(quadro, dtype=np.uint8).tobytes())
+            total += 1
+    return total
+
+
+class FonteSintetica(FonteQuadros):
+    """
+    Frames gerados deterministicamente (mesma semente = mesmos frames): ruído fixo
+    com uma faixa que se desloca a cada frame. Não depende de câmera nem de arquivos.
+    """
+    def __init__(self, largura=640, altura=480, total=None, semente=0, fps=30.0, repetir=False, tempo_real=False):
+        """
+        :param total: Quantidade de frames (None = infinito).
+        """
+        super().__init__(fps, repetir, tempo_real)
+        self.largura = largura
+        self.altura = altura
+        self.total = total
+        self._fundo = np.random.default_rng(semente).integers(0, 256, (altura, largura, 3), dtype=np.uint8)
+
+    def _ler_quadro(self, indice):
+        quadro = self._fundo.copy()
+        inicio = (indice * 8) % self.largura
+        quadro[:, inicio:inicio + self.largura // 10] = (0, 255, 0)
+        return quadro
+
+
+TIPOS_FONTE = {
+    'webcam': FonteWebcam,
+    'video': FonteVideo,
+    'imagens': FonteImagens,
+    'memmap': FonteMemmap,
+    'sintetica': FonteSintetica
+}
+
+
+def config_de_argumento(texto, repetir=False, tempo_real=False):
+    """
+    Converte um argumento de linha de comando na configuração de uma fonte:
+    índice da câmera, 'sintetica', diretório de imagens ou arquivo de vídeo.
+    """
+    if texto.isdigit():
+        return {'tipo': 'webcam', 'indice': int(texto)}
+    if texto == 'sintetica':
+        config = {'tipo': 'sintetica'}
+    elif os.path.isdir(texto):
+        config = {'tipo': 'imagens', 'diretorio': texto}
+    else:
+        config = {'tipo': 'video', 'caminho': texto}
+    config.update(repetir=repetir, tempo_real=tempo_real)
+    return config
+
+
+def criar_fonte(config):
+    """
+    Cria uma fonte de frames a partir da configuração.
+    :param config: Dicionário com 'tipo' (ver TIPOS_FONTE) e os parâmetros da fonte.
+    """
+    parametros = dict(config)
+    tipo = parametros.pop('tipo', 'webcam')
+    if tipo not in TIPOS_FONTE:
+        raise ValueError(f"Tipo de fonte desconhecido: {tipo}")
+    return TIPOS_FONTE[tipo](**parametros)
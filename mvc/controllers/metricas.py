@@ -0,0 +1,160 @@
+"""
+Instrumentação leve do caminho crítico do monitoramento.
+
+Cada etapa (captura, preparo, conversão, recorte, pose, desenho, análise, registro,
+exibição) guarda suas últimas durações em uma janela circular, da qual saem
+p50/p95/p99. Eventos como frames capturados e processados viram taxas (FPS)
+sobre os últimos segundos.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+
+# Etapas na ordem em que aparecem no resumo
+ETAPAS = ('captura', 'preparo', 'conversao', 'recorte', 'pose', 'desenho', 'analise', 'registro', 'exibicao')
+
+
+class JanelaTempos:
+    """
+    Últimas `capacidade` durações (ms) de uma etapa, em um buffer circular.
+    """
+    def __init__(self, capacidade=300):
+        self._valores = np.zeros(capacidade, dtype=np.float64)
+        self._proximo = 0
+        self._preenchidos = 0
+        self.total = 0
+
+    def adicionar(self, duracao_ms):
+        self._valores[self._proximo] = duracao_ms
+        self._proximo = (self._proximo + 1) % len(self._valores)
+        self._preenchidos = min(self._preenchidos + 1, len(self._valores))
+        self.total += 1
+
+    def percentis(self):
+        """
+        Retorna amostras na janela, p50, p95 e p99 (ms); None sem amostras.
+        """
+        if not self._preenchidos:
+            return None
+        p50, p95, p99 = np.percentile(self._valores[:self._preenchidos], (50, 95, 99))
+        return {'amostras': self._preenchidos, 'p50_ms': float(p50), 'p95_ms': float(p95), 'p99_ms': float(p99)}
+
+
+class ContadorTaxa:
+    """
+    Taxa de eventos por segundo nos últimos `janela` segundos.
+    """
+    def __init__(self, janela=2.0):
+        self.janela = janela
+        self._instantes = deque()
+        self.total = 0
+
+    def registrar(self, agora=None):
+        agora = time.monotonic() if agora is None else agora
+        self._instantes.append(agora)
+        self.total += 1
+        self._descartar_antigos(agora)
+
+    def taxa(self, agora=None):
+        agora = time.monotonic() if agora is None else agora
+        self._descartar_antigos(agora)
+        return len(self._instantes) / self.janela
+
+    def _descartar_antigos(self, agora):
+        while self._instantes and agora - self._instantes[0] > self.janela:
+            self._instantes.popleft()
+
+
+class MetricasDesempenho:
+    """
+    Durações por etapa e taxas de eventos, alimentadas pelas threads do pipeline
+    e lidas pela interface, pelo log periódico ou por código (estatisticas()).
+    """
+    def __init__(self, capacidade=300, janela_taxa=2.0):
+        """
+        :param capacidade: Durações mantidas por etapa para os percentis.
+        :param janela_taxa: Segundos considerados no cálculo dos FPS.
+        """
+        self.capacidade = capacidade
+        self.janela_taxa = janela_taxa
+        self._etapas = {}
+        self._taxas = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def medir(self, etapa):
+        """
+        Mede a duração do bloco: `with metricas.medir('pose'): ...`
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(etapa, (time.perf_counter() - inicio) * 1000)
+
+    def registrar(self, etapa, duracao_ms):
+        """Registra a duração (ms) de uma execução da etapa"""
+        with self._lock:
+            janela = self._etapas.get(etapa)
+            if janela is None:
+                janela = self._etapas[etapa] = JanelaTempos(self.capacidade)
+            janela.adicionar(duracao_ms)
+
+    def contar(self, evento):
+        """Registra uma ocorrência do evento (ex: 'capturados', 'processados')"""
+        with self._lock:
+            contador = self._taxas.get(evento)
+            if contador is None:
+                contador = self._taxas[evento] = ContadorTaxa(self.janela_taxa)
+            contador.registrar()
+
+    def taxa(self, evento):
+        """Ocorrências por segundo do evento na janela atual (0 se nunca ocorreu)"""
+        with self._lock:
+            contador = self._taxas.get(evento)
+            return contador.taxa() if contador is not None else 0.0
+
+    def limpar(self):
+        """Descarta todas as medições"""
+        with self._lock:
+            self._etapas.clear()
+            self._taxas.clear()
+
+    def estatisticas(self):
+        """
+        Retorna {'etapas': {etapa: percentis}, 'fps': {evento: taxa}, 'totais': {evento: total}}.
+        """
+        with self._lock:
+            etapas = {nome: janela.percentis() for nome, janela in self._etapas.items()}
+            agora = time.monotonic()
+            fps = {nome: contador.taxa(agora) for nome, contador in self._taxas.items()}
+            totais = {nome: contador.total for nome, contador in self._taxas.items()}
+        ordem = {nome: i for i, nome in enumerate(ETAPAS)}
+        return {
+            'etapas': dict(sorted(etapas.items(), key=lambda item: ordem.get(item[0], len(ordem)))),
+            'fps': fps,
+            'totais': totais
+        }
+
+
+def formatar_resumo(estatisticas, separador=" | "):
+    """
+    Texto curto com FPS, filas, descartes e p50/p95 de cada etapa (overlay e log).
+    """
+    partes = [" ".join(f"{nome} {taxa:.1f} FPS" for nome, taxa in estatisticas['fps'].items())]
+    if 'filas' in estatisticas:
+        partes.append(" ".join(f"fila {nome} {tamanho}" for nome, tamanho in estatisticas['filas'].items()))
+    if 'descartados' in estatisticas:
+        partes.append(" ".join(f"descartados {nome} {total}"
+                               for nome, total in estatisticas['descartados'].items()))
+    if 'agendador' in estatisticas:
+        agendador = estatisticas['agendador']
+        partes.append(f"passo {agendador['passo']} complexidade {agendador['complexidade']} "
+                      f"({agendador['taxa_analise']:.1f} análises/s)")
+    for nome, percentis in estatisticas['etapas'].items():
+        if percentis:
+            partes.append(f"{nome} p50 {percentis['p50_ms']:.1f} p95 {percentis['p95_ms']:.1f} "
+                          f"p99 {percentis['p99_ms']:.1f} ms")
+    return separador.join(parte for parte in partes if parte)
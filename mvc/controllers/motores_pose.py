@@ -0,0 +1,257 @@
+"""
+Motores de estimativa de pose intercambiáveis.
+
+Todos recebem um frame RGB e devolvem os 33 landmarks no formato do MediaPipe
+Pose (NormalizedLandmarkList), ou None sem pessoa detectada, então desenho,
+ângulos e classificação não dependem do motor. Disponíveis:
+
+- 'mediapipe': MediaPipe Pose (solutions), complexidade lite/full/heavy;
+- 'mediapipe_tasks': PoseLandmarker do MediaPipe Tasks, com os modelos
+  pose_landmarker_{lite,full,heavy}.task em um diretório local;
+- 'opencv_dnn': rede de pose no formato COCO (18 pontos, ex: OpenPose) lida
+  pelo cv2.dnn; só os pontos usados nos ângulos são preenchidos.
+
+Todos aceitam a mesma configuração (suavizar, confiancas e 'modelo', o arquivo ou
+diretório dos modelos; cada motor ignora o que não usa), então o motor pode ser
+trocado sem refazer a configuração. Os motores são criados com criar_motor, por exemplo:
+    criar_motor({'motor': 'mediapipe', 'suavizar': True}, complexidade=0)
+"""
+import os
+import time
+import cv2
+import numpy as np
+
+# Nome de cada complexidade de modelo
+COMPLEXIDADES = {0: 'lite', 1: 'full', 2: 'heavy'}
+
+
+def _lista_landmarks():
+    from mediapipe.framework.formats import landmark_pb2
+    return landmark_pb2.NormalizedLandmarkList()
+
+
+class MotorPose:
+    """
+    Base dos motores: processar(frame_rgb) -> NormalizedLandmarkList ou None.
+    Usado apenas pela thread de processamento do pipeline.
+    """
+    # Complexidades aceitas pelo motor (o agendador fica limitado a elas)
+    complexidades = (0, 1, 2)
+
+    def processar(self, frame_rgb):
+        """Estima a pose no frame RGB"""
+        raise NotImplementedError
+
+    def reiniciar(self):
+        """Descarta o rastreamento entre frames (ex: ao trocar de vídeo)"""
+
+    def fechar(self):
+        """Libera os recursos do motor"""
+
+
+class MotorMediaPipe(MotorPose):
+    """
+    MediaPipe Pose (mp.solutions.pose), sem segmentação.
+    """
+    def __init__(self, complexidade=1, suavizar=True, confianca_deteccao=0.5, confianca_rastreamento=0.5,
+                 modelo=None, imagem_estatica=False):
+        """
+        :param modelo: Ignorado (os modelos vêm com o pacote mediapipe).
+        """
+        import mediapipe as mp
+        self.complexidade = complexidade
+        self._pose = mp.solutions.pose.Pose(
+            static_image_mode=imagem_estatica,
+            model_complexity=complexidade,
+            smooth_landmarks=suavizar,
+            enable_segmentation=False,
+            min_detection_confidence=confianca_deteccao,
+            min_tracking_confidence=confianca_rastreamento
+        )
+
+    def processar(self, frame_rgb):
+        return self._pose.process(frame_rgb).pose_landmarks
+
+    def reiniciar(self):
+        self._pose.reset()
+
+    def fechar(self):
+        self._pose.close()
+
+
+class MotorMediaPipeTasks(MotorPose):
+    """
+    PoseLandmarker do MediaPipe Tasks em modo de vídeo (suavização própria do modelo).
+    """
+    def __init__(self, complexidade=1, suavizar=True, confianca_deteccao=0.5, confianca_rastreamento=0.5,
+                 modelo=None):
+        """
+        :param modelo: Arquivo .task ou diretório com pose_landmarker_{lite,full,heavy}.task
+                       (padrão: 'modelos').
+        :param suavizar: Ignorado (o modo de vídeo do Tasks sempre suaviza).
+        """
+        caminho = modelo or 'modelos'
+        if not caminho.lower().endswith('.task'):
+            caminho = os.path.join(caminho, f'pose_landmarker_{COMPLEXIDADES[complexidade]}.task')
+        if not os.path.isfile(caminho):
+            raise IOError(f"Modelo do PoseLandmarker não encontrado: {caminho}")
+        import mediapipe as mp
+        from mediapipe.tasks.python import BaseOptions, vision
+        self._mp = mp
+        self.complexidade = complexidade
+        self._opcoes = vision.PoseLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=caminho),
+            running_mode=vision.RunningMode.VIDEO,
+            num_poses=1,
+            min_pose_detection_confidence=confianca_deteccao,
+            min_tracking_confidence=confianca_rastreamento,
+            output_segmentation_masks=False
+        )
+        self._landmarker = vision.PoseLandmarker.create_from_options(self._opcoes)
+        self._ultimo_instante_ms = -1
+
+    def processar(self, frame_rgb):
+        # O modo de vídeo exige instantes estritamente crescentes
+        instante_ms = max(self._ultimo_instante_ms + 1, int(time.monotonic() * 1000))
+        self._ultimo_instante_ms = instante_ms
+        imagem = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=np.ascontiguousarray(frame_rgb))
+        resultado = self._landmarker.detect_for_video(imagem, instante_ms)
+        if not resultado.pose_landmarks:
+            return None
+        lista = _lista_landmarks()
+        for ponto in resultado.pose_landmarks[0]:
+            lista.landmark.add(x=ponto.x, y=ponto.y, z=ponto.z, visibility=ponto.visibility or 0.0)
+        return lista
+
+    def reiniciar(self):
+        from mediapipe.tasks.python import vision
+        self._landmarker.close()
+        self._landmarker = vision.PoseLandmarker.create_from_options(self._opcoes)
+        self._ultimo_instante_ms = -1
+
+    def fechar(self):
+        self._landmarker.close()
+
+
+# Índice COCO (18 pontos) -> índice MediaPipe Pose, para os pontos usados nos ângulos
+COCO_PARA_MEDIAPIPE = {
+    0: 0,    # nariz
+    5: 11,   # ombro esquerdo
+    2: 12,   # ombro direito
+    6: 13,   # cotovelo esquerdo
+    3: 14,   # cotovelo direito
+    11: 23,  # quadril esquerdo
+    8: 24    # quadril direito
+}
+
+# Arquivos de pesos aceitos pelo cv2.dnn.readNet
+EXTENSOES_PESOS = ('.caffemodel', '.onnx', '.pb', '.t7', '.net', '.weights', '.tflite')
+
+# Pontos COCO sem os quais a postura não é classificada (nariz, ombros e quadris)
+COCO_NECESSARIOS = (0, 2, 5, 8, 11)
+
+
+class MotorOpenCVDNN(MotorPose):
+    """
+    Rede de pose lida pelo cv2.dnn que produz mapas de calor no formato COCO
+    (saída 1 x K x H x W, K >= 18), como o modelo COCO do OpenPose.
+    """
+    complexidades = (1,)
+
+    def __init__(self, complexidade=None, suavizar=True, confianca_deteccao=None, confianca_rastreamento=None,
+                 modelo=None, tamanho_entrada=(368, 368), limiar=0.1):
+        """
+        :param modelo: Arquivo de pesos (ex: .caffemodel, .onnx, .pb) ou diretório com os
+                       pesos e, se o formato exigir, a topologia (.prototxt).
+        :param tamanho_entrada: Largura e altura da entrada da rede.
+        :param limiar: Confiança mínima do mapa de calor para um ponto ser considerado.
+        Os demais parâmetros existem para aceitar a configuração comum e são ignorados.
+        """
+        pesos, topologia = _arquivos_rede(modelo)
+        self._rede = cv2.dnn.readNet(pesos, topologia)
+        self.tamanho_entrada = tuple(tamanho_entrada)
+        self.limiar = limiar
+
+    def processar(self, frame_rgb):
+        # Modelos COCO do OpenPose esperam BGR em 0..1
+        blob = cv2.dnn.blobFromImage(frame_rgb, 1.0 / 255, self.tamanho_entrada, (0, 0, 0), swapRB=True, crop=False)
+        self._rede.setInput(blob)
+        return landmarks_de_mapas(self._rede.forward()[0], self.limiar)
+
+
+def landmarks_de_mapas(mapas, limiar=0.1):
+    """
+    Converte mapas de calor COCO (K x H x W, K >= 18) em landmarks do MediaPipe Pose:
+    cada ponto é o máximo do seu mapa, em coordenadas normalizadas. Os landmarks sem
+    equivalente COCO ficam invisíveis (visibility 0).
+    :return: NormalizedLandmarkList, ou None se nariz, ombros ou quadris não forem encontrados.
+    """
+    origem = np.fromiter(COCO_PARA_MEDIAPIPE, dtype=np.intp)
+    planos = mapas[origem].reshape(len(origem), -1)
+    altura, largura = mapas.shape[1:]
+    indices = planos.argmax(axis=1)
+    confiancas = planos[np.arange(len(indices)), indices]
+    if (confiancas[np.isin(origem, COCO_NECESSARIOS)] < limiar).any():
+        return None
+    linhas, colunas = np.divmod(indices, largura)
+
+    lista = _lista_landmarks()
+    for _ in range(33):
+        lista.landmark.add(x=0.0, y=0.0, z=0.0, visibility=0.0)
+    for destino, x, y, confianca in zip(COCO_PARA_MEDIAPIPE.values(), (colunas + 0.5) / largura,
+                                        (linhas + 0.5) / altura, confiancas):
+        ponto = lista.landmark[destino]
+        if confianca >= limiar:
+            ponto.x, ponto.y, ponto.visibility = float(x), float(y), float(min(confianca, 1.0))
+        else:
+            ponto.x = ponto.y = float('nan')
+    return lista
+
+
+def _arquivos_rede(modelo):
+    """Pesos e topologia (ou '') da rede a partir de um arquivo ou diretório"""
+    if modelo and os.path.isdir(modelo):
+        arquivos = sorted(os.listdir(modelo))
+        pesos = [nome for nome in arquivos if nome.lower().endswith(EXTENSOES_PESOS)]
+        topologia = [nome for nome in arquivos if nome.lower().endswith('.prototxt')]
+        if pesos:
+            return (os.path.join(modelo, pesos[0]),
+                    os.path.join(modelo, topologia[0]) if topologia else '')
+        if topologia:
+            # Redes sem camadas treinadas podem ser lidas só da topologia
+            return os.path.join(modelo, topologia[0]), ''
+    elif modelo and os.path.isfile(modelo):
+        # Pesos do Caffe precisam do .prototxt, procurado no mesmo diretório
+        diretorio = os.path.dirname(modelo) or '.'
+        topologia = sorted(nome for nome in os.listdir(diretorio) if nome.lower().endswith('.prototxt'))
+        if modelo.lower().endswith('.caffemodel') and topologia:
+            return modelo, os.path.join(diretorio, topologia[0])
+        return modelo, ''
+    raise IOError(f"Modelo da rede de pose não encontrado: {modelo}")
+
+
+MOTORES = {
+    'mediapipe': MotorMediaPipe,
+    'mediapipe_tasks': MotorMediaPipeTasks,
+    'opencv_dnn': MotorOpenCVDNN
+}
+
+
+def classe_motor(nome):
+    """Classe do motor pelo nome (ver MOTORES)"""
+    if nome not in MOTORES:
+        raise ValueError(f"Motor de pose desconhecido: {nome}")
+    return MOTORES[nome]
+
+
+def criar_motor(config, complexidade=1):
+    """
+    Cria um motor de pose a partir da configuração.
+    :param config: Dicionário com 'motor' (ver MOTORES) e os parâmetros do motor.
+    :param complexidade: Complexidade do modelo (0 lite, 1 full, 2 heavy), se o motor aceitar.
+    """
+    parametros = dict(config)
+    classe = classe_motor(parametros.pop('motor', 'mediapipe'))
+    if complexidade not in classe.complexidades:
+        complexidade = min(classe.complexidades, key=lambda c: abs(c - complexidade))
+    return classe(complexidade=complexidade, **parametros)
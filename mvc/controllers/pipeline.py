@@ -0,0 +1,183 @@
+import queue
+import threading
+import time
+import numpy as np
+
+
+class FilaDescarte:
+    """
+    Fila limitada que, quando cheia, descarta o item mais antigo para aceitar o novo.
+    Garante que o produtor nunca fique bloqueado esperando o consumidor.
+    """
+    def __init__(self, tamanho_maximo=2):
+        """
+        :param tamanho_maximo: Quantidade máxima de itens mantidos na fila.
+        """
+        self._fila = queue.Queue(maxsize=tamanho_maximo)
+        self.descartados = 0
+
+    def colocar(self, item):
+        """
+        Insere um item na fila, removendo o mais antigo se não houver espaço.
+        """
+        while True:
+            try:
+                self._fila.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._fila.get_nowait()
+                    self.descartados += 1
+                except queue.Empty:
+                    pass
+
+    def obter(self, timeout=None):
+        """
+        Retira o item mais antigo da fila, aguardando até `timeout` segundos.
+        Lança queue.Empty se nada chegar no período.
+        """
+        return self._fila.get(timeout=timeout)
+
+    def obter_todos(self):
+        """
+        Retira todos os itens disponíveis sem bloquear, do mais antigo ao mais recente.
+        """
+        itens = []
+        while True:
+            try:
+                itens.append(self._fila.get_nowait())
+            except queue.Empty:
+                return itens
+
+    def tamanho(self):
+        """Retorna a quantidade aproximada de itens na fila"""
+        return self._fila.qsize()
+
+
+class AnelBuffers:
+    """
+    Conjunto circular de arrays pré-alocados, reaproveitados frame a frame.
+    Um buffer só é reutilizado depois de `quantidade - 1` outros, então a quantidade
+    deve cobrir os frames que ainda podem estar nas filas ou sendo exibidos.
+    """
+    def __init__(self, quantidade, dtype=np.uint8):
+        """
+        :param quantidade: Número de buffers no anel.
+        """
+        self.quantidade = quantidade
+        self.dtype = dtype
+        self._buffers = []
+        self._indice = 0
+
+    def proximo(self, formato):
+        """
+        Retorna o próximo buffer do anel com o formato pedido (realocando se o formato mudar).
+        """
+        if not self._buffers or self._buffers[0].shape != tuple(formato):
+            self._buffers = [np.empty(formato, dtype=self.dtype) for _ in range(self.quantidade)]
+            self._indice = 0
+        buffer = self._buffers[self._indice]
+        self._indice = (self._indice + 1) % self.quantidade
+        return buffer
+
+
+class PipelineVideo:
+    """
+    Pipeline em estágios para o vídeo: uma thread de captura alimenta uma fila limitada,
+    uma thread de processamento (MediaPipe) consome essa fila e publica os resultados
+    em outra fila, lida pela interface apenas quando ela está pronta para desenhar.
+    """
+    def __init__(self, cap, processar_quadro, tamanho_fila=2, metricas=None):
+        """
+        :param cap: Fonte de vídeo com o método read() (ex: cv2.VideoCapture).
+        :param processar_quadro: Função executada na thread de processamento para cada frame.
+        :param tamanho_fila: Tamanho máximo das filas entre os estágios.
+        :param metricas: MetricasDesempenho opcional (duração da captura e FPS dos estágios).
+        """
+        self.cap = cap
+        self._processar_quadro = processar_quadro
+        self.metricas = metricas
+        self.fila_captura = FilaDescarte(tamanho_fila)
+        self.fila_resultados = FilaDescarte(tamanho_fila)
+        self._parar = threading.Event()
+        self._threads = []
+        self.erro = None
+
+    def iniciar(self):
+        """
+        Inicia as threads de captura e de processamento.
+        """
+        self._parar.clear()
+        self.erro = None
+        self._threads = [
+            threading.Thread(target=self._loop_captura, name="captura", daemon=True),
+            threading.Thread(target=self._loop_processamento, name="processamento", daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def parar(self, timeout=1.0):
+        """
+        Sinaliza o encerramento e aguarda as threads terminarem.
+        """
+        self._parar.set()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+        self._threads = []
+
+    @property
+    def ativo(self):
+        """Indica se o pipeline está em execução"""
+        return not self._parar.is_set() and any(t.is_alive() for t in self._threads)
+
+    def estatisticas_filas(self):
+        """
+        Retorna o tamanho atual e os frames descartados de cada fila.
+        """
+        return {
+            'filas': {'captura': self.fila_captura.tamanho(), 'resultados': self.fila_resultados.tamanho()},
+            'descartados': {'captura': self.fila_captura.descartados, 'resultados': self.fila_resultados.descartados}
+        }
+
+    def obter_resultados(self):
+        """
+        Retorna os resultados processados desde a última chamada (pode ser vazio).
+        """
+        return self.fila_resultados.obter_todos()
+
+    def _loop_captura(self):
+        """
+        Lê frames da câmera o mais rápido possível, sem esperar pelo processamento.
+        """
+        while not self._parar.is_set():
+            inicio = time.perf_counter()
+            ret, frame = self.cap.read()
+            if not ret:
+                self.erro = "Erro ao capturar frame"
+                self._parar.set()
+                return
+            if self.metricas is not None:
+                self.metricas.registrar('captura', (time.perf_counter() - inicio) * 1000)
+                self.metricas.contar('capturados')
+            self.fila_captura.colocar(frame)
+
+    def _loop_processamento(self):
+        """
+        Processa o frame mais recente disponível e publica o resultado.
+        """
+        while not self._parar.is_set():
+            try:
+                frame = self.fila_captura.obter(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            try:
+                resultado = self._processar_quadro(frame)
+            except Exception as e:
+                print(f"Erro ao processar frame: {e}")
+                continue
+
+            if self.metricas is not None:
+                self.metricas.contar('processados')
+            self.fila_resultados.colocar(resultado)
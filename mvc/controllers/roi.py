@@ -0,0 +1,121 @@
+"""
+Rastreamento da região de interesse (ROI) analisada pelo MediaPipe.
+
+Os landmarks do frame analisado anterior definem, com uma margem, a região do
+próximo frame entregue ao pose.process; sem detecção, a busca volta ao frame
+inteiro. A região é guardada em coordenadas normalizadas, então vale para qualquer
+resolução: o recorte pode vir do frame original da câmera, com mais detalhe que o
+frame de trabalho, sem aumentar o custo da inferência (a entrada do modelo tem
+tamanho fixo). Para não desalinhar o rastreamento interno do MediaPipe, a região
+só muda quando a pessoa se aproxima da borda ou passa a ocupar bem menos dela.
+"""
+import numpy as np
+
+
+class RastreadorROI:
+    """
+    Mantém a região analisada e converte os landmarks do recorte para o frame inteiro.
+    Usado apenas pela thread de processamento do pipeline.
+    """
+    def __init__(self, margem=0.3, tamanho_minimo=0.25, visibilidade_minima=0.5,
+                 folga_borda=0.1, area_maxima=2.5, ativo=True):
+        """
+        :param margem: Margem em volta dos landmarks, em fração da largura/altura deles.
+        :param tamanho_minimo: Menor largura/altura da região, em fração do frame.
+        :param visibilidade_minima: Landmarks menos visíveis não definem a região.
+        :param folga_borda: Fração da região junto à borda que, se atingida, recalcula a região.
+        :param area_maxima: Região atual até esta razão da área necessária é mantida.
+        :param ativo: False analisa sempre o frame inteiro.
+        """
+        self.margem = margem
+        self.tamanho_minimo = tamanho_minimo
+        self.visibilidade_minima = visibilidade_minima
+        self.folga_borda = folga_borda
+        self.area_maxima = area_maxima
+        self.ativo = ativo
+        self.regiao = None  # (x0, y0, x1, y1) normalizada; None = frame inteiro
+        self.trocas = 0
+        self.perdas = 0
+
+    def regiao_pixels(self, formato):
+        """
+        Região atual em pixels para um frame de `formato` (altura, largura, ...).
+        :return: (x0, y0, x1, y1) inteiros, ou None para analisar o frame inteiro.
+        """
+        if not self.ativo or self.regiao is None:
+            return None
+        altura, largura = formato[:2]
+        x0, y0, x1, y1 = self.regiao
+        inicio_x, inicio_y = round(x0 * largura), round(y0 * altura)
+        return (inicio_x, inicio_y,
+                max(inicio_x + 1, round(x1 * largura)), max(inicio_y + 1, round(y1 * altura)))
+
+    def atualizar(self, landmarks, regiao_pixels, formato):
+        """
+        Converte os landmarks detectados no recorte para o frame inteiro (no próprio
+        objeto) e atualiza a região do próximo frame.
+        :param landmarks: Landmarks do MediaPipe (x, y, z, visibility) ou None se não houve detecção.
+        :param regiao_pixels: Região recortada (de regiao_pixels) ou None se foi o frame inteiro.
+        :param formato: Formato do frame de onde o recorte foi feito.
+        """
+        if not landmarks:
+            if self.regiao is not None:
+                self.perdas += 1
+            self.regiao = None
+            return
+        if regiao_pixels is not None:
+            altura, largura = formato[:2]
+            x0, y0, x1, y1 = regiao_pixels
+            escala_x = (x1 - x0) / largura
+            escala_y = (y1 - y0) / altura
+            for ponto in landmarks:
+                ponto.x = x0 / largura + ponto.x * escala_x
+                ponto.y = y0 / altura + ponto.y * escala_y
+                ponto.z *= escala_x  # z usa a mesma escala de x
+        if self.ativo:
+            self._atualizar_regiao(landmarks)
+
+    def _atualizar_regiao(self, landmarks):
+        pontos = np.array([(p.x, p.y) for p in landmarks if p.visibility >= self.visibilidade_minima],
+                          dtype=np.float32)
+        if len(pontos) < 2:
+            self.regiao = None
+            return
+        minimo = pontos.min(axis=0)
+        maximo = pontos.max(axis=0)
+        necessaria = self._expandir(minimo, maximo)
+
+        if self.regiao is not None:
+            x0, y0, x1, y1 = self.regiao
+            folga_x = (x1 - x0) * self.folga_borda
+            folga_y = (y1 - y0) * self.folga_borda
+            # Mantida se os pontos estão longe das bordas internas (ou a borda é a do frame)
+            dentro = ((minimo[0] >= x0 + folga_x or x0 <= 0) and (maximo[0] <= x1 - folga_x or x1 >= 1)
+                      and (minimo[1] >= y0 + folga_y or y0 <= 0) and (maximo[1] <= y1 - folga_y or y1 >= 1))
+            if dentro and _area(self.regiao) <= _area(necessaria) * self.area_maxima:
+                return
+        self.regiao = necessaria
+        self.trocas += 1
+
+    def _expandir(self, minimo, maximo):
+        """Caixa dos pontos com margem e tamanho mínimo, limitada ao frame"""
+        centro = (minimo + maximo) / 2
+        tamanho = np.maximum((maximo - minimo) * (1 + 2 * self.margem), self.tamanho_minimo)
+        tamanho = np.minimum(tamanho, 1.0)
+        inicio = np.clip(centro - tamanho / 2, 0.0, 1.0 - tamanho)
+        fim = inicio + tamanho
+        return (float(inicio[0]), float(inicio[1]), float(fim[0]), float(fim[1]))
+
+    def estado(self):
+        """Região atual, trocas de região e perdas de rastreamento"""
+        return {
+            'regiao': self.regiao,
+            'trocas': self.trocas,
+            'perdas': self.perdas,
+            'ativo': self.ativo
+        }
+
+
+def _area(regiao):
+    x0, y0, x1, y1 = regiao
+    return (x1 - x0) * (y1 - y0)
@@ -1,12 +1,41 @@
-import tkinter as tk
+import argparse
+import logging
 from models.model import Model
 from controllers.controller import Controller
+from controllers.eventos import SinkLog
+from controllers.fontes import config_de_argumento
 
 def main():
-    root = tk.Tk()
-    model = Model()
-    controller = Controller(model, root)
-    root.mainloop()
+    parser = argparse.ArgumentParser(description="Sistema de Análise de Postura")
+    parser.add_argument('--sem-interface', action='store_true',
+                        help="Executa o monitoramento sem interface gráfica, registrando os eventos no log")
+    parser.add_argument('--fonte', default='0',
+                        help="Índice da câmera, arquivo de vídeo, diretório de imagens ou 'sintetica'")
+    parser.add_argument('--repetir', action='store_true', help="Repete vídeos e imagens em laço")
+    parser.add_argument('--tempo-real', action='store_true',
+                        help="Entrega vídeos e imagens no ritmo do FPS em vez de o mais rápido possível")
+    parser.add_argument('--duracao', type=float, help="Encerra após N segundos (apenas sem interface)")
+    parser.add_argument('--banco', default='postura.db', help="Banco SQLite de destino")
+    parser.add_argument('--gravar-landmarks', nargs='?', const='gravacoes', metavar='DIRETORIO',
+                        help="Grava os landmarks de cada frame analisado (padrão: gravacoes)")
+    args = parser.parse_args()
+
+    fonte = config_de_argumento(args.fonte, args.repetir, args.tempo_real)
+    model = Model(args.banco)
+    if args.sem_interface:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+        controller = Controller(model, sink=SinkLog())
+        controller.fonte = fonte
+        controller.diretorio_landmarks = args.gravar_landmarks
+        controller.executar_sem_interface(args.duracao)
+    else:
+        import tkinter as tk
+        root = tk.Tk()
+        controller = Controller(model, root)
+        controller.fonte = fonte
+        controller.diretorio_landmarks = args.gravar_landmarks
+        root.mainloop()
+    model.fechar()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,123 @@
+import queue
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Union
+
+# Perfis de armazenamento: ajustes do SQLite aplicados a todas as conexões do Model
+PERFIS_ARMAZENAMENTO = {
+    'desempenho': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,       # Valor negativo = KiB (aprox. 16 MB)
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'cached_statements': 128,
+        'leitores': 2,
+        'timeout': 30
+    },
+    'seguro': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -16000,
+        'mmap_size': 0,
+        'temp_store': 'MEMORY',
+        'cached_statements': 128,
+        'leitores': 2,
+        'timeout': 30
+    },
+    'legado': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'cache_size': -2000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+        'cached_statements': 128,
+        'leitores': 1,
+        'timeout': 30
+    }
+}
+
+
+def carregar_perfil(perfil: Union[str, Dict[str, Any], None] = None) -> Dict[str, Any]:
+    """
+    Retorna o perfil de armazenamento completo.
+    :param perfil: Nome de um perfil predefinido ou dicionário com os ajustes a sobrescrever
+                   no perfil 'desempenho'. None usa o perfil 'desempenho'.
+    """
+    if perfil is None:
+        perfil = 'desempenho'
+    if isinstance(perfil, str):
+        if perfil not in PERFIS_ARMAZENAMENTO:
+            raise ValueError(f"Perfil de armazenamento desconhecido: {perfil}")
+        return dict(PERFIS_ARMAZENAMENTO[perfil])
+    completo = dict(PERFIS_ARMAZENAMENTO['desempenho'])
+    completo.update(perfil)
+    return completo
+
+
+def abrir_conexao(caminho_db: str, perfil: Dict[str, Any], somente_leitura: bool = False) -> sqlite3.Connection:
+    """
+    Abre uma conexão com o banco aplicando os ajustes do perfil.
+    Conexões somente leitura podem ser usadas por qualquer thread (uma de cada vez).
+    """
+    if somente_leitura:
+        conexao = sqlite3.connect(
+            f"{Path(caminho_db).absolute().as_uri()}?mode=ro",
+            uri=True,
+            timeout=perfil['timeout'],
+            cached_statements=perfil['cached_statements'],
+            check_same_thread=False
+        )
+    else:
+        conexao = sqlite3.connect(
+            caminho_db,
+            timeout=perfil['timeout'],
+            cached_statements=perfil['cached_statements']
+        )
+        # O modo de journal é persistente no arquivo, basta a conexão de escrita definir
+        conexao.execute(f"PRAGMA journal_mode = {perfil['journal_mode']}")
+
+    conexao.execute(f"PRAGMA synchronous = {perfil['synchronous']}")
+    conexao.execute(f"PRAGMA cache_size = {int(perfil['cache_size'])}")
+    conexao.execute(f"PRAGMA mmap_size = {int(perfil['mmap_size'])}")
+    conexao.execute(f"PRAGMA temp_store = {perfil['temp_store']}")
+    return conexao
+
+
+class PoolLeitura:
+    """
+    Pequeno pool de conexões somente leitura, usado pelas consultas da interface.
+    Com o journal em WAL, as leituras não disputam o banco com a thread de escrita.
+    """
+    def __init__(self, caminho_db: str, perfil: Dict[str, Any]):
+        """
+        :param caminho_db: Caminho do arquivo do banco SQLite.
+        :param perfil: Perfil de armazenamento (ver carregar_perfil).
+        """
+        self.caminho_db = caminho_db
+        self.perfil = perfil
+        self._disponiveis = queue.LifoQueue()
+        self._criadas = []
+        for _ in range(max(1, perfil['leitores'])):
+            self._disponiveis.put(None)
+
+    @contextmanager
+    def conexao(self):
+        """
+        Empresta uma conexão do pool, abrindo-a no primeiro uso.
+        """
+        conexao = self._disponiveis.get()
+        try:
+            if conexao is None:
+                conexao = abrir_conexao(self.caminho_db, self.perfil, somente_leitura=True)
+                self._criadas.append(conexao)
+            yield conexao
+        finally:
+            self._disponiveis.put(conexao)
+
+    def fechar(self):
+        """Fecha todas as conexões abertas pelo pool"""
+        for conexao in self._criadas:
+            conexao.close()
+        self._criadas = []
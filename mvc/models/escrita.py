@@ -0,0 +1,128 @@
+import sqlite3
+import threading
+
+
+class EscritorEmLote:
+    """
+    Buffer de escrita em memória descarregado no banco por uma thread própria.
+    Os itens são gravados em uma única transação quando o buffer atinge o tamanho
+    do lote, quando o intervalo de tempo expira, sob demanda ou no encerramento.
+    """
+    def __init__(self, abrir_conexao, gravar_lote, tamanho_lote=50, intervalo=1.0):
+        """
+        :param abrir_conexao: Função que abre a conexão de escrita (chamada na thread do escritor).
+        :param gravar_lote: Função (conexao, itens) que grava os itens na transação aberta.
+        :param tamanho_lote: Quantidade de itens que dispara a gravação imediata.
+        :param intervalo: Tempo máximo (segundos) que um item espera no buffer.
+        """
+        self._abrir_conexao = abrir_conexao
+        self._gravar_lote = gravar_lote
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+
+        self._buffer = []
+        self._condicao = threading.Condition()
+        self._adicionados = 0
+        self._gravados = 0
+        self._forcar = False
+        self._encerrar = False
+
+        self._thread = threading.Thread(target=self._loop, name="escritor-db", daemon=True)
+        self._thread.start()
+
+    def adicionar(self, item):
+        """
+        Adiciona um item ao buffer sem acessar o disco.
+        :return: False se o escritor já foi encerrado.
+        """
+        with self._condicao:
+            if self._encerrar:
+                return False
+            self._buffer.append(item)
+            self._adicionados += 1
+            if len(self._buffer) >= self.tamanho_lote:
+                self._condicao.notify_all()
+            return True
+
+    def adicionar_varios(self, itens):
+        """
+        Adiciona vários itens ao buffer de uma só vez, na ordem recebida.
+        :return: False se o escritor já foi encerrado.
+        """
+        with self._condicao:
+            if self._encerrar:
+                return False
+            self._buffer.extend(itens)
+            self._adicionados += len(itens)
+            if len(self._buffer) >= self.tamanho_lote:
+                self._condicao.notify_all()
+            return True
+
+    def descarregar(self, timeout=None):
+        """
+        Força a gravação do buffer e aguarda até que os itens pendentes estejam no banco.
+        """
+        with self._condicao:
+            alvo = self._adicionados
+            self._forcar = True
+            self._condicao.notify_all()
+            return self._condicao.wait_for(
+                lambda: self._gravados >= alvo or not self._thread.is_alive(),
+                timeout
+            )
+
+    def fechar(self, timeout=None):
+        """
+        Grava os itens pendentes e encerra a thread de escrita.
+        :param timeout: Tempo máximo de espera (segundos); None espera a gravação terminar.
+        :return: False se a thread ainda está gravando quando o tempo acaba.
+        """
+        with self._condicao:
+            self._encerrar = True
+            self._condicao.notify_all()
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def pendentes(self):
+        """Retorna a quantidade de itens aguardando gravação"""
+        with self._condicao:
+            return len(self._buffer)
+
+    def gravados(self):
+        """Retorna a quantidade de itens já processados pela thread de escrita"""
+        with self._condicao:
+            return self._gravados
+
+    def _loop(self):
+        """
+        Aguarda itens e os grava em lote com a conexão exclusiva da thread.
+        """
+        conexao = self._abrir_conexao()
+        try:
+            while True:
+                with self._condicao:
+                    self._condicao.wait_for(
+                        lambda: self._encerrar or self._forcar
+                        or len(self._buffer) >= self.tamanho_lote,
+                        self.intervalo
+                    )
+                    itens = self._buffer
+                    self._buffer = []
+                    self._forcar = False
+                    encerrar = self._encerrar
+
+                if itens:
+                    try:
+                        with conexao:
+                            self._gravar_lote(conexao, itens)
+                    except sqlite3.Error as e:
+                        print(f"Erro ao gravar lote de {len(itens)} registros: {e}")
+
+                with self._condicao:
+                    self._gravados += len(itens)
+                    self._condicao.notify_all()
+
+                if encerrar:
+                    return
+        finally:
+            conexao.close()
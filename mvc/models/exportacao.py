@@ -0,0 +1,298 @@
+"""
+Exportação dos dados em fluxo, fora da thread da interface.
+
+As linhas saem do banco em blocos (fetchmany em um cursor aberto na conexão de
+leitura) e vão direto para o arquivo, então a memória usada não depende do
+tamanho do período. Formatos: CSV, CSV compactado (gzip) e Excel (openpyxl em
+modo write_only, com as abas de posturas e de estatísticas gravadas em uma só
+passada). O arquivo é escrito com a extensão .parcial e só recebe o nome final
+quando a exportação termina; cancelada ou com erro, o parcial é apagado.
+
+Para análise há os formatos colunares, lidos de volta com carregar_exportacao:
+Parquet (se o pyarrow estiver instalado, um row group por bloco) ou NumPy .npz
+compactado. Neles os instantes ficam em epoch (ms, int64), tipo_postura é
+codificado por dicionário (códigos int16 + categorias) e os ângulos são float32.
+O .npz é gravado de uma vez no fim, então os blocos ficam em memória já no
+formato compacto (cerca de 50 bytes por linha).
+"""
+import csv
+import gzip
+import importlib.util
+import os
+import threading
+from contextlib import closing
+from datetime import datetime, timedelta
+from typing import Dict
+import numpy as np
+from models.conexoes import abrir_conexao
+from models.intervalos import DURACAO_MAXIMA_INTERVALO_MS
+
+# Colunas das abas (mesmos nomes de Model.get_historico e Model.get_estatisticas)
+COLUNAS_POSTURAS = (
+    'data_hora', 'fim', 'tipo_postura', 'amostras', 'duracao', 'angulo_pescoco', 'angulo_coluna',
+    'pescoco_min', 'pescoco_max', 'coluna_min', 'coluna_max'
+)
+COLUNAS_ESTATISTICAS = ('data', 'total_correto', 'total_incorreto', 'tipos_incorretos')
+
+# Colunas dos formatos colunares, na ordem de SQL_EXPORTAR
+COLUNAS_COLUNARES = (
+    'inicio_ms', 'fim_ms', 'tipo_postura', 'amostras', 'duracao', 'angulo_pescoco', 'angulo_coluna',
+    'pescoco_min', 'pescoco_max', 'coluna_min', 'coluna_max'
+)
+TIPOS_COLUNARES = {
+    'inicio_ms': np.int64, 'fim_ms': np.int64, 'tipo_postura': np.int16, 'amostras': np.int32,
+    'duracao': np.int32
+}  # As demais colunas (ângulos) são float32
+
+# Extensão do arquivo de cada formato ('colunar' escolhe entre parquet e npz)
+EXTENSOES = {'csv': '.csv', 'csv.gz': '.csv.gz', 'excel': '.xlsx', 'parquet': '.parquet', 'npz': '.npz'}
+
+_FILTRO_PERIODO = '''
+    FROM registros
+    WHERE inicio BETWEEN ? AND ?
+    AND fim >= ?
+'''
+
+SQL_CONTAR_EXPORTACAO = 'SELECT COUNT(*)' + _FILTRO_PERIODO
+
+SQL_EXPORTAR = '''
+    SELECT
+        inicio, fim, tipo_postura, amostras, duracao, pescoco_media, coluna_media,
+        pescoco_min, pescoco_max, coluna_min, coluna_max
+''' + _FILTRO_PERIODO + '''
+    ORDER BY inicio DESC
+'''
+
+# Estados de uma exportação
+PENDENTE = 'pendente'
+EXECUTANDO = 'executando'
+CONCLUIDA = 'concluida'
+VAZIA = 'vazia'
+CANCELADA = 'cancelada'
+ERRO = 'erro'
+
+
+class ExportacaoDados:
+    """
+    Uma exportação do período [data_inicio, data_fim] para um arquivo em `diretorio`.
+    executar() roda na thread de quem chama; iniciar() roda em uma thread própria e a
+    interface acompanha `escritas`, `total` e `estado` (ou usa aguardar()).
+    """
+    def __init__(self, model, formato: str = 'excel', data_inicio: datetime = None, data_fim: datetime = None,
+                 diretorio: str = 'exportacoes', tamanho_bloco: int = 5000):
+        """
+        :param model: Model de onde os dados são lidos.
+        :param formato: 'csv', 'csv.gz', 'excel', 'parquet', 'npz' ou 'colunar'
+                        (Parquet com pyarrow, senão .npz).
+        :param tamanho_bloco: Linhas lidas do banco por vez.
+        """
+        if formato == 'colunar':
+            formato = formato_colunar()
+        if formato not in EXTENSOES:
+            raise ValueError(f"Formato de exportação desconhecido: {formato}")
+        from models.model import para_epoch  # models.model importa este módulo
+        agora = datetime.now()
+        self.model = model
+        self.formato = formato
+        # Mesmo período padrão de Model.get_historico: os últimos 7 dias
+        self.inicio_ms = para_epoch(data_inicio if data_inicio is not None else agora - timedelta(days=7))
+        self.fim_ms = para_epoch(data_fim if data_fim is not None else agora)
+        self.diretorio = diretorio
+        self.tamanho_bloco = tamanho_bloco
+        timestamp = agora.strftime('%Y%m%d_%H%M%S')
+        self.arquivo = os.path.join(diretorio, f'posturas_{timestamp}{EXTENSOES[formato]}')
+        self.estado = PENDENTE
+        self.erro = None
+        self.escritas = 0
+        self.total = None  # Conhecido após a contagem inicial
+        self._cancelar = threading.Event()
+        self._concluida = threading.Event()
+        self._thread = None
+
+    @property
+    def progresso(self) -> float:
+        """Fração das linhas já escritas (0 enquanto o total não é conhecido)"""
+        return self.escritas / self.total if self.total else 0.0
+
+    def iniciar(self) -> 'ExportacaoDados':
+        """Executa a exportação em uma thread de fundo"""
+        self._thread = threading.Thread(target=self.executar, name="exportacao-dados", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancelar(self):
+        """Pede o cancelamento; o arquivo parcial é apagado"""
+        self._cancelar.set()
+
+    def aguardar(self, timeout: float = None) -> bool:
+        """Aguarda o fim da exportação; retorna False se o tempo acabou antes"""
+        return self._concluida.wait(timeout)
+
+    def executar(self) -> str:
+        """
+        Exporta os dados e retorna o estado final: 'concluida', 'vazia' (sem dados no
+        período), 'cancelada' ou 'erro' (detalhe em `erro`).
+        """
+        self.estado = EXECUTANDO
+        parcial = self.arquivo + '.parcial'
+        try:
+            # Garante que os registros em memória entrem na exportação
+            self.model.descarregar()
+            estatisticas = self.model.get_estatisticas() if self.formato == 'excel' else None
+            parametros = (self.inicio_ms - DURACAO_MAXIMA_INTERVALO_MS, self.fim_ms, self.inicio_ms)
+            # Conexão própria, não emprestada do pool de leitura: uma exportação longa não
+            # pode deixar as consultas da interface esperando (o perfil 'legado' tem um único leitor)
+            with closing(abrir_conexao(self.model.caminho_db, self.model.perfil, somente_leitura=True)) as conexao:
+                self.total = conexao.execute(SQL_CONTAR_EXPORTACAO, parametros).fetchone()[0]
+                if not self.total:
+                    self.estado = VAZIA
+                    return self.estado
+                os.makedirs(self.diretorio, exist_ok=True)
+                cursor = conexao.execute(SQL_EXPORTAR, parametros)
+                try:
+                    if self.formato == 'excel':
+                        self._escrever_excel(parcial, cursor, estatisticas)
+                    elif self.formato == 'parquet':
+                        self._escrever_parquet(parcial, cursor)
+                    elif self.formato == 'npz':
+                        self._escrever_npz(parcial, cursor)
+                    else:
+                        self._escrever_csv(parcial, cursor)
+                finally:
+                    cursor.close()
+
+            if self._cancelar.is_set():
+                if os.path.exists(parcial):
+                    os.remove(parcial)
+                self.estado = CANCELADA
+            else:
+                os.replace(parcial, self.arquivo)
+                self.estado = CONCLUIDA
+        except Exception as e:
+            print(f"Erro ao exportar dados: {e}")
+            self.erro = e
+            self.estado = ERRO
+            if os.path.exists(parcial):
+                os.remove(parcial)
+        finally:
+            self._concluida.set()
+        return self.estado
+
+    def _blocos(self, cursor):
+        """Blocos de linhas do banco (instantes em epoch), até o fim ou o cancelamento"""
+        while not self._cancelar.is_set():
+            linhas = cursor.fetchmany(self.tamanho_bloco)
+            if not linhas:
+                return
+            yield linhas
+            self.escritas += len(linhas)
+
+    def _blocos_texto(self, cursor):
+        """Blocos com os instantes em datetime, para CSV e Excel"""
+        from models.model import de_epoch
+        for linhas in self._blocos(cursor):
+            yield [(de_epoch(linha[0]), de_epoch(linha[1])) + tuple(linha[2:]) for linha in linhas]
+
+    def _blocos_colunares(self, cursor, categorias: Dict[str, int]):
+        """
+        Blocos como dicionários coluna -> array; tipo_postura vira o código da
+        categoria em `categorias` (acrescentada na primeira ocorrência).
+        """
+        for linhas in self._blocos(cursor):
+            colunas = dict(zip(COLUNAS_COLUNARES, zip(*linhas)))
+            colunas['tipo_postura'] = [categorias.setdefault(tipo, len(categorias))
+                                       for tipo in colunas['tipo_postura']]
+            yield {nome: np.array(valores, dtype=TIPOS_COLUNARES.get(nome, np.float32))
+                   for nome, valores in colunas.items()}
+
+    def _escrever_csv(self, caminho: str, cursor):
+        abrir = gzip.open if self.formato == 'csv.gz' else open
+        with abrir(caminho, 'wt', newline='', encoding='utf-8') as arquivo:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(COLUNAS_POSTURAS)
+            for bloco in self._blocos_texto(cursor):
+                escritor.writerows(bloco)
+
+    def _escrever_excel(self, caminho: str, cursor, estatisticas):
+        from openpyxl import Workbook  # Carregado apenas na exportação para Excel
+        pasta = Workbook(write_only=True)
+        try:
+            posturas = pasta.create_sheet('Posturas')
+            posturas.append(COLUNAS_POSTURAS)
+            for bloco in self._blocos_texto(cursor):
+                for linha in bloco:
+                    posturas.append(linha)
+            if self._cancelar.is_set():
+                return
+
+            aba_estatisticas = pasta.create_sheet('Estatísticas')
+            aba_estatisticas.append(COLUNAS_ESTATISTICAS)
+            for dia in estatisticas:
+                aba_estatisticas.append([dia[coluna] for coluna in COLUNAS_ESTATISTICAS])
+        finally:
+            # Salvar encerra o fluxo de cada aba e apaga os temporários do openpyxl; também
+            # na exportação cancelada ou com erro (executar apaga o .parcial)
+            pasta.save(caminho)
+
+    def _escrever_parquet(self, caminho: str, cursor):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        esquema = _esquema_arrow(pa)
+        categorias = {}
+        with pq.ParquetWriter(caminho, esquema, compression='zstd') as escritor:
+            for bloco in self._blocos_colunares(cursor, categorias):
+                dicionario = pa.array(list(categorias), type=pa.string())
+                colunas = [pa.DictionaryArray.from_arrays(valores, dicionario) if nome == 'tipo_postura'
+                           else pa.array(valores) for nome, valores in bloco.items()]
+                escritor.write_table(pa.Table.from_arrays(colunas, schema=esquema))
+
+    def _escrever_npz(self, caminho: str, cursor):
+        categorias = {}
+        blocos = list(self._blocos_colunares(cursor, categorias))
+        if self._cancelar.is_set():
+            return
+        colunas = {nome: np.concatenate([bloco[nome] for bloco in blocos]) for nome in COLUNAS_COLUNARES}
+        colunas['tipo_postura_categorias'] = np.array(list(categorias), dtype=str)
+        with open(caminho, 'wb') as arquivo:  # Com o nome, o savez acrescentaria .npz ao .parcial
+            np.savez_compressed(arquivo, **colunas)
+
+
+def formato_colunar() -> str:
+    """Formato colunar disponível: 'parquet' com o pyarrow instalado, senão 'npz'"""
+    return 'parquet' if importlib.util.find_spec('pyarrow') is not None else 'npz'
+
+
+def _esquema_arrow(pa):
+    campos = []
+    for nome in COLUNAS_COLUNARES:
+        tipo = TIPOS_COLUNARES.get(nome, np.float32)
+        if nome == 'tipo_postura':
+            campos.append(pa.field(nome, pa.dictionary(pa.int16(), pa.string())))
+        else:
+            campos.append(pa.field(nome, pa.from_numpy_dtype(tipo)))
+    return pa.schema(campos)
+
+
+def carregar_exportacao(caminho: str) -> Dict[str, np.ndarray]:
+    """
+    Carrega uma exportação colunar (.parquet ou .npz) como arrays NumPy.
+    :return: Dicionário coluna -> array (ver COLUNAS_COLUNARES). 'tipo_postura' traz os
+             códigos e 'tipo_postura_categorias' os nomes, ou seja, o tipo de cada linha é
+             dados['tipo_postura_categorias'][dados['tipo_postura']].
+    """
+    if caminho.lower().endswith('.parquet'):
+        import pyarrow.parquet as pq
+        tabela = pq.read_table(caminho).unify_dictionaries()
+        dados = {}
+        for nome in COLUNAS_COLUNARES:
+            coluna = tabela.column(nome)
+            if nome == 'tipo_postura':
+                dados[nome] = np.concatenate([parte.indices.to_numpy() for parte in coluna.chunks]
+                                             or [np.empty(0, dtype=np.int16)])
+                dicionario = coluna.chunks[0].dictionary.to_pylist() if coluna.num_chunks else []
+                dados['tipo_postura_categorias'] = np.array(dicionario, dtype=str)
+            else:
+                dados[nome] = coluna.to_numpy()
+        return dados
+    with np.load(caminho) as arquivo:
+        return {nome: arquivo[nome] for nome in arquivo.files}
@@ -0,0 +1,90 @@
+"""
+Codificação das amostras de postura em intervalos contínuos (run-length).
+Amostras consecutivas com a mesma classificação estendem o mesmo intervalo,
+que guarda início, fim e mínimo/média/máximo dos ângulos.
+"""
+from typing import Iterable, List, Optional, Tuple
+
+# Amostras separadas por mais que isso não pertencem ao mesmo intervalo (monitoramento parado)
+LACUNA_MAXIMA_MS = 2000
+
+# Limite de duração de um intervalo; permite buscar por período usando apenas o índice do início
+DURACAO_MAXIMA_INTERVALO_MS = 60000
+
+
+class Intervalo:
+    """
+    Intervalo de tempo em que a postura manteve a mesma classificação.
+    """
+    __slots__ = ('id', 'inicio', 'fim', 'tipo_postura', 'amostras', 'duracao',
+                 'pescoco_min', 'pescoco_soma', 'pescoco_max',
+                 'coluna_min', 'coluna_soma', 'coluna_max')
+
+    def __init__(self, data_hora: int, tipo_postura: str, duracao: int, pescoco: float, coluna: float):
+        self.id = None
+        self.inicio = data_hora
+        self.fim = data_hora
+        self.tipo_postura = tipo_postura
+        self.amostras = 1
+        self.duracao = duracao
+        self.pescoco_min = self.pescoco_max = self.pescoco_soma = pescoco
+        self.coluna_min = self.coluna_max = self.coluna_soma = coluna
+
+    def aceita(self, data_hora: int, tipo_postura: str) -> bool:
+        """
+        Indica se a amostra pode estender este intervalo.
+        """
+        return (tipo_postura == self.tipo_postura
+                and 0 <= data_hora - self.fim <= LACUNA_MAXIMA_MS
+                and data_hora - self.inicio <= DURACAO_MAXIMA_INTERVALO_MS)
+
+    def estender(self, data_hora: int, duracao: int, pescoco: float, coluna: float):
+        """
+        Inclui uma nova amostra no intervalo.
+        """
+        self.fim = data_hora
+        self.amostras += 1
+        self.duracao += duracao
+        self.pescoco_soma += pescoco
+        self.pescoco_min = min(self.pescoco_min, pescoco)
+        self.pescoco_max = max(self.pescoco_max, pescoco)
+        self.coluna_soma += coluna
+        self.coluna_min = min(self.coluna_min, coluna)
+        self.coluna_max = max(self.coluna_max, coluna)
+
+    def valores(self) -> Tuple:
+        """
+        Retorna os valores na ordem das colunas da tabela registros (sem o id).
+        """
+        return (
+            self.inicio, self.fim, self.tipo_postura, self.amostras, self.duracao,
+            self.pescoco_min, self.pescoco_soma / self.amostras, self.pescoco_max,
+            self.coluna_min, self.coluna_soma / self.amostras, self.coluna_max
+        )
+
+
+class CodificadorIntervalos:
+    """
+    Agrupa uma sequência de amostras em intervalos, mantendo o último intervalo aberto
+    para ser estendido pelas próximas amostras.
+    """
+    def __init__(self):
+        self.aberto: Optional[Intervalo] = None
+
+    def adicionar(self, amostras: Iterable[Tuple]) -> List[Intervalo]:
+        """
+        Processa amostras (data_hora, tipo_postura, duracao, pescoco, coluna) em ordem.
+        :return: Intervalos alterados, na ordem em que foram criados
+                 (o primeiro pode ser o intervalo que já estava aberto).
+        """
+        alterados = []
+        for data_hora, tipo_postura, duracao, pescoco, coluna in amostras:
+            pescoco = pescoco or 0
+            coluna = coluna or 0
+            if self.aberto is not None and self.aberto.aceita(data_hora, tipo_postura):
+                self.aberto.estender(data_hora, duracao, pescoco, coluna)
+            else:
+                self.aberto = Intervalo(data_hora, tipo_postura, duracao, pescoco, coluna)
+            if not alterados or alterados[-1] is not self.aberto:
+                alterados.append(self.aberto)
+        return alterados
@@ -0,0 +1,175 @@
+"""
+Gravação dos landmarks brutos de cada frame analisado.
+
+O banco guarda só os ângulos derivados; para reavaliar uma sessão com regras novas
+sem refazer a inferência, o GravadorLandmarks acrescenta a cada frame o instante
+(epoch em ms) e os 33 landmarks (x, y, z, visibility em float32) a um arquivo
+binário de registros de tamanho fixo, mapeado em memória. Cada arquivo (segmento)
+tem um cabeçalho de 64 bytes (CABECALHO) seguido de `capacidade` registros
+(REGISTRO) pré-alocados; quando enche, a gravação segue no segmento seguinte da
+sessão. A contagem no cabeçalho é atualizada a cada registro, então um segmento
+interrompido (queda do programa) continua legível até o último frame gravado.
+
+ler_segmento devolve os registros como array NumPy estruturado sobre o próprio
+arquivo (sem cópia), por exemplo:
+    registros = ler_segmento('gravacoes/landmarks_20250529_170000_0000.lmk')
+    angulos = [calcular_angulos(pontos) for pontos in registros['pontos']]
+"""
+import glob
+import os
+import time
+import numpy as np
+
+MAGICA = b'POSTLMK1'
+VERSAO = 1
+NUM_LANDMARKS = 33
+
+CABECALHO = np.dtype([
+    ('magica', 'S8'),
+    ('versao', '<u2'),
+    ('num_landmarks', '<u2'),
+    ('campos', '<u2'),
+    ('reservado', '<u2'),
+    ('tamanho_registro', '<u4'),
+    ('capacidade', '<u4'),
+    ('contagem', '<u4'),
+    ('segmento', '<u4'),
+    ('criado_ms', '<i8'),
+    ('livre', 'V24')
+])
+
+REGISTRO = np.dtype([
+    ('instante_ms', '<i8'),
+    ('pontos', '<f4', (NUM_LANDMARKS, 4))
+])
+
+# Padrão: 1 h a 30 frames analisados por segundo (cerca de 58 MB por segmento)
+REGISTROS_POR_SEGMENTO = 30 * 3600
+
+
+class GravadorLandmarks:
+    """
+    Grava os landmarks de uma sessão em segmentos mapeados em memória.
+    Usado por uma única thread (a que analisa os frames).
+    """
+    def __init__(self, diretorio: str = 'gravacoes', sessao: str = None,
+                 registros_por_segmento: int = REGISTROS_POR_SEGMENTO):
+        """
+        :param diretorio: Diretório dos segmentos.
+        :param sessao: Nome da sessão nos arquivos (padrão: data e hora de início, em ms).
+            Se já houver segmentos com esse nome, a sessão recebe o sufixo -1, -2... (ver self.sessao).
+        :param registros_por_segmento: Capacidade de cada segmento, em frames.
+        """
+        self.diretorio = diretorio
+        self.registros_por_segmento = registros_por_segmento
+        self.segmentos = []  # Caminhos dos segmentos já abertos, em ordem
+        self.gravados = 0
+        self._mapa = None
+        self._cabecalho = None
+        self._registros = None
+        os.makedirs(diretorio, exist_ok=True)
+        if sessao is None:
+            agora = time.time()
+            sessao = time.strftime('%Y%m%d_%H%M%S', time.localtime(agora)) + f'_{int(agora * 1000) % 1000:03d}'
+        self._sessao_pedida = sessao
+        self.sessao = self._sessao_livre(sessao)
+
+    def _sessao_livre(self, sessao: str) -> str:
+        """O nome pedido, ou o primeiro com sufixo -n ainda sem segmentos no diretório"""
+        candidato, numero = sessao, 0
+        while segmentos_sessao(self.diretorio, candidato):
+            numero += 1
+            candidato = f'{sessao}-{numero}'
+        return candidato
+
+    def adicionar(self, pontos: np.ndarray, instante_ms: int = None):
+        """
+        Grava os landmarks de um frame.
+        :param pontos: Array (33, 4) com x, y, z e visibility.
+        :param instante_ms: Instante do frame em epoch (ms); padrão: agora.
+        """
+        if self._mapa is None or self._cabecalho['contagem'] >= self.registros_por_segmento:
+            self._abrir_segmento()
+        indice = int(self._cabecalho['contagem'])
+        registro = self._registros[indice]
+        registro['instante_ms'] = int(time.time() * 1000) if instante_ms is None else instante_ms
+        registro['pontos'] = pontos
+        self._cabecalho['contagem'] = indice + 1
+        self.gravados += 1
+
+    def _abrir_segmento(self):
+        """Fecha o segmento atual (se houver) e pré-aloca o próximo"""
+        self._fechar_segmento()
+        numero = len(self.segmentos)
+        tamanho = CABECALHO.itemsize + self.registros_por_segmento * REGISTRO.itemsize
+        while True:
+            caminho = os.path.join(self.diretorio, f'landmarks_{self.sessao}_{numero:04d}.lmk')
+            try:
+                # 'xb': nunca sobrescreve os segmentos de outra gravação com o mesmo nome de sessão
+                with open(caminho, 'xb') as arquivo:
+                    arquivo.truncate(tamanho)
+                break
+            except FileExistsError:
+                if numero > 0:
+                    raise
+                # Outra gravação começou com este nome depois do __init__: passa para o próximo livre
+                self.sessao = self._sessao_livre(self._sessao_pedida)
+        self._mapa = np.memmap(caminho, dtype=np.uint8, mode='r+', shape=(tamanho,))
+        self._cabecalho = self._mapa[:CABECALHO.itemsize].view(CABECALHO)[0]
+        self._registros = self._mapa[CABECALHO.itemsize:].view(REGISTRO)
+        self._cabecalho['magica'] = MAGICA
+        self._cabecalho['versao'] = VERSAO
+        self._cabecalho['num_landmarks'] = NUM_LANDMARKS
+        self._cabecalho['campos'] = 4
+        self._cabecalho['tamanho_registro'] = REGISTRO.itemsize
+        self._cabecalho['capacidade'] = self.registros_por_segmento
+        self._cabecalho['contagem'] = 0
+        self._cabecalho['segmento'] = numero
+        self._cabecalho['criado_ms'] = int(time.time() * 1000)
+        self.segmentos.append(caminho)
+
+    def _fechar_segmento(self):
+        """Grava o segmento atual no disco e descarta a área não usada"""
+        if self._mapa is None:
+            return
+        contagem = int(self._cabecalho['contagem'])
+        self._mapa.flush()
+        # O arquivo só pode ser truncado depois de desfeito o mapeamento
+        self._mapa = self._cabecalho = self._registros = None
+        os.truncate(self.segmentos[-1], CABECALHO.itemsize + contagem * REGISTRO.itemsize)
+
+    def descarregar(self):
+        """Grava no disco os registros ainda só no mapeamento"""
+        if self._mapa is not None:
+            self._mapa.flush()
+
+    def fechar(self):
+        """Encerra a gravação; o último segmento fica só com os registros gravados"""
+        self._fechar_segmento()
+
+
+def ler_segmento(caminho: str) -> np.ndarray:
+    """
+    Registros de um segmento, mapeados do arquivo em modo somente leitura.
+    :return: Array estruturado REGISTRO com 'instante_ms' (n,) e 'pontos' (n, 33, 4).
+    """
+    cabecalho = np.fromfile(caminho, dtype=CABECALHO, count=1)
+    if len(cabecalho) == 0 or cabecalho[0]['magica'] != MAGICA:
+        raise ValueError(f"Arquivo de landmarks inválido: {caminho}")
+    cabecalho = cabecalho[0]
+    if cabecalho['versao'] != VERSAO or cabecalho['tamanho_registro'] != REGISTRO.itemsize:
+        raise ValueError(f"Versão de arquivo de landmarks não suportada: {caminho}")
+    contagem = int(cabecalho['contagem'])
+    if contagem == 0:
+        return np.empty(0, dtype=REGISTRO)
+    return np.memmap(caminho, dtype=REGISTRO, mode='r', offset=CABECALHO.itemsize, shape=(contagem,))
+
+
+def segmentos_sessao(diretorio: str, sessao: str) -> list:
+    """Caminhos dos segmentos de uma sessão, em ordem"""
+    return sorted(glob.glob(os.path.join(diretorio, f'landmarks_{glob.escape(sessao)}_*.lmk')))
+
+
+def ler_sessao(diretorio: str, sessao: str) -> list:
+    """Registros de cada segmento da sessão (ver ler_segmento); np.concatenate junta em uma cópia"""
+    return [ler_segmento(caminho) for caminho in segmentos_sessao(diretorio, sessao)]
@@ -0,0 +1,182 @@
+"""
+Migrações versionadas do esquema do banco de dados.
+A versão aplicada fica gravada em PRAGMA user_version; cada migração roda
+uma única vez, dentro de uma transação, preservando os dados existentes.
+"""
+import sqlite3
+from models.intervalos import CodificadorIntervalos
+
+
+def _migracao_1_tabelas_iniciais(conexao: sqlite3.Connection):
+    """
+    Cria as tabelas originais (datas em texto), caso o banco ainda esteja vazio.
+    Bancos criados por versões anteriores já possuem essas tabelas.
+    """
+    conexao.execute('''
+        CREATE TABLE IF NOT EXISTS registros (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            data_hora DATETIME,
+            tipo_postura TEXT,
+            duracao INTEGER,
+            angulo_pescoco REAL,
+            angulo_coluna REAL
+        )
+    ''')
+    conexao.execute('''
+        CREATE TABLE IF NOT EXISTS estatisticas_diarias (
+            data DATE PRIMARY KEY,
+            total_minutos_correto INTEGER NOT NULL DEFAULT 0,
+            total_minutos_incorreto INTEGER NOT NULL DEFAULT 0,
+            percentual_correto REAL NOT NULL DEFAULT 0
+        )
+    ''')
+
+
+def _migracao_2_data_hora_epoch(conexao: sqlite3.Connection):
+    """
+    Converte data_hora para milissegundos desde a época (UTC), cria os índices de
+    consulta por período e reconstrói as estatísticas diárias a partir dos registros.
+    """
+    conexao.execute('''
+        CREATE TABLE registros_epoch (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            data_hora INTEGER NOT NULL,
+            tipo_postura TEXT NOT NULL,
+            duracao INTEGER NOT NULL DEFAULT 1,
+            angulo_pescoco REAL,
+            angulo_coluna REAL
+        )
+    ''')
+
+    # As datas antigas foram gravadas no horário local
+    conexao.execute('''
+        INSERT INTO registros_epoch (id, data_hora, tipo_postura, duracao, angulo_pescoco, angulo_coluna)
+        SELECT
+            id,
+            CAST(ROUND((julianday(data_hora, 'utc') - 2440587.5) * 86400000) AS INTEGER),
+            tipo_postura,
+            COALESCE(duracao, 1),
+            angulo_pescoco,
+            angulo_coluna
+        FROM registros
+        WHERE data_hora IS NOT NULL AND tipo_postura IS NOT NULL
+    ''')
+    conexao.execute('DROP TABLE registros')
+    conexao.execute('ALTER TABLE registros_epoch RENAME TO registros')
+
+    conexao.execute('CREATE INDEX idx_registros_data_hora ON registros (data_hora)')
+    conexao.execute('CREATE INDEX idx_registros_tipo_data_hora ON registros (tipo_postura, data_hora)')
+
+    # Versões antigas acumulavam várias linhas por dia nesta tabela
+    conexao.execute('DROP TABLE estatisticas_diarias')
+    conexao.execute('''
+        CREATE TABLE estatisticas_diarias (
+            data DATE PRIMARY KEY,
+            total_minutos_correto INTEGER NOT NULL DEFAULT 0,
+            total_minutos_incorreto INTEGER NOT NULL DEFAULT 0,
+            percentual_correto REAL NOT NULL DEFAULT 0
+        )
+    ''')
+    conexao.execute('''
+        INSERT INTO estatisticas_diarias
+        (data, total_minutos_correto, total_minutos_incorreto, percentual_correto)
+        SELECT data, correto, incorreto,
+               CASE WHEN correto + incorreto > 0 THEN 100.0 * correto / (correto + incorreto) ELSE 0 END
+        FROM (
+            SELECT
+                date(data_hora / 1000, 'unixepoch', 'localtime') as data,
+                SUM(CASE WHEN tipo_postura = 'Postura correta' THEN duracao ELSE 0 END) as correto,
+                SUM(CASE WHEN tipo_postura != 'Postura correta' THEN duracao ELSE 0 END) as incorreto
+            FROM registros
+            GROUP BY 1
+        )
+    ''')
+
+
+def _migracao_3_intervalos(conexao: sqlite3.Connection):
+    """
+    Substitui a linha por amostra por intervalos contínuos com a mesma classificação,
+    com início, fim, quantidade de amostras e mínimo/média/máximo dos ângulos.
+    """
+    conexao.execute('''
+        CREATE TABLE registros_intervalos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            inicio INTEGER NOT NULL,
+            fim INTEGER NOT NULL,
+            tipo_postura TEXT NOT NULL,
+            amostras INTEGER NOT NULL,
+            duracao INTEGER NOT NULL,
+            pescoco_min REAL,
+            pescoco_media REAL,
+            pescoco_max REAL,
+            coluna_min REAL,
+            coluna_media REAL,
+            coluna_max REAL
+        )
+    ''')
+
+    sql_inserir = '''
+        INSERT INTO registros_intervalos (
+            inicio, fim, tipo_postura, amostras, duracao,
+            pescoco_min, pescoco_media, pescoco_max,
+            coluna_min, coluna_media, coluna_max
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    codificador = CodificadorIntervalos()
+    cursor = conexao.execute('''
+        SELECT data_hora, tipo_postura, duracao, angulo_pescoco, angulo_coluna
+        FROM registros
+        ORDER BY data_hora
+    ''')
+    while True:
+        amostras = cursor.fetchmany(10000)
+        if not amostras:
+            break
+        # O último intervalo pode continuar no próximo bloco
+        anterior = codificador.aberto
+        alterados = codificador.adicionar(amostras)
+        fechados = [i for i in alterados if i is not codificador.aberto]
+        if anterior is not None and anterior is not codificador.aberto and anterior not in fechados:
+            # O bloco começou com um intervalo novo: o aberto do bloco anterior terminou lá
+            fechados.insert(0, anterior)
+        conexao.executemany(sql_inserir, [i.valores() for i in fechados])
+    if codificador.aberto is not None:
+        conexao.execute(sql_inserir, codificador.aberto.valores())
+
+    conexao.execute('DROP TABLE registros')
+    conexao.execute('ALTER TABLE registros_intervalos RENAME TO registros')
+    conexao.execute('CREATE INDEX idx_registros_inicio ON registros (inicio)')
+    conexao.execute('CREATE INDEX idx_registros_tipo_inicio ON registros (tipo_postura, inicio)')
+
+
+MIGRACOES = [
+    (1, _migracao_1_tabelas_iniciais),
+    (2, _migracao_2_data_hora_epoch),
+    (3, _migracao_3_intervalos),
+]
+
+
+def versao_atual(conexao: sqlite3.Connection) -> int:
+    """Retorna a versão do esquema gravada no banco"""
+    return conexao.execute('PRAGMA user_version').fetchone()[0]
+
+
+def aplicar_migracoes(conexao: sqlite3.Connection) -> int:
+    """
+    Aplica, em ordem, as migrações ainda não executadas neste banco.
+    :return: Versão final do esquema.
+    """
+    versao = versao_atual(conexao)
+    for numero, migracao in MIGRACOES:
+        if numero <= versao:
+            continue
+        conexao.execute('BEGIN')
+        try:
+            migracao(conexao)
+            conexao.execute(f'PRAGMA user_version = {numero}')
+            conexao.commit()
+        except Exception:
+            conexao.rollback()
+            raise
+        versao = numero
+    return versao
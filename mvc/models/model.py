@@ -1,225 +1,344 @@
 import sqlite3
 from datetime import datetime, timedelta
-import pandas as pd
 import os
 from typing import List, Dict, Any, Tuple
+from models.escrita import EscritorEmLote
+from models.migracoes import aplicar_migracoes
+from models.conexoes import carregar_perfil, abrir_conexao, PoolLeitura
+from models.intervalos import CodificadorIntervalos, DURACAO_MAXIMA_INTERVALO_MS
+
+
+def para_epoch(data_hora: datetime) -> int:
+    """Converte uma data/hora local em milissegundos desde a época (UTC)"""
+    return int(data_hora.timestamp() * 1000)
+
+
+def de_epoch(epoch_ms: int) -> datetime:
+    """Converte milissegundos desde a época (UTC) em data/hora local"""
+    return datetime.fromtimestamp(epoch_ms / 1000)
+
+
+# Instruções do caminho de escrita, mantidas constantes para reaproveitar a compilação
+SQL_INSERIR_INTERVALO = '''
+    INSERT INTO registros (
+        inicio, fim, tipo_postura, amostras, duracao,
+        pescoco_min, pescoco_media, pescoco_max,
+        coluna_min, coluna_media, coluna_max
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+SQL_ESTENDER_INTERVALO = '''
+    UPDATE registros SET
+        inicio = ?, fim = ?, tipo_postura = ?, amostras = ?, duracao = ?,
+        pescoco_min = ?, pescoco_media = ?, pescoco_max = ?,
+        coluna_min = ?, coluna_media = ?, coluna_max = ?
+    WHERE id = ?
+'''
+
+SQL_SOMAR_ESTATISTICAS = '''
+    INSERT INTO estatisticas_diarias
+    (data, total_minutos_correto, total_minutos_incorreto, percentual_correto)
+    VALUES (?1, ?2, ?3, CASE WHEN ?2 + ?3 > 0 THEN 100.0 * ?2 / (?2 + ?3) ELSE 0 END)
+    ON CONFLICT(data) DO UPDATE SET
+        total_minutos_correto = total_minutos_correto + excluded.total_minutos_correto,
+        total_minutos_incorreto = total_minutos_incorreto + excluded.total_minutos_incorreto,
+        percentual_correto = CASE
+            WHEN total_minutos_correto + total_minutos_incorreto
+                 + excluded.total_minutos_correto + excluded.total_minutos_incorreto > 0
+            THEN 100.0 * (total_minutos_correto + excluded.total_minutos_correto)
+                 / (total_minutos_correto + total_minutos_incorreto
+                    + excluded.total_minutos_correto + excluded.total_minutos_incorreto)
+            ELSE 0
+        END
+'''
+
 
 class Model:
     """
     Classe responsável pelo gerenciamento dos dados e interação com o banco SQLite.
     Armazena registros de postura, estatísticas e exportação de dados.
     """
-    def __init__(self):
+    def __init__(self, caminho_db: str = 'postura.db', tamanho_lote: int = 50, intervalo_escrita: float = 1.0,
+                 perfil=None):
         """
-        Inicializa o banco de dados e cria as tabelas necessárias.
+        Inicializa o banco de dados, cria as tabelas necessárias, o escritor em lote
+        e o pool de conexões de leitura.
+        :param caminho_db: Caminho do arquivo do banco SQLite.
+        :param tamanho_lote: Quantidade de registros que dispara a gravação imediata.
+        :param intervalo_escrita: Tempo máximo (segundos) que um registro espera em memória.
+        :param perfil: Nome ou dicionário do perfil de armazenamento (ver PERFIS_ARMAZENAMENTO).
         """
-        self.db_connection = sqlite3.connect('postura.db')
+        self.caminho_db = caminho_db
+        self.perfil = carregar_perfil(perfil)
+        self.db_connection = abrir_conexao(caminho_db, self.perfil)
         self._criar_tabelas()
 
+        # Amostras iguais e consecutivas viram um único intervalo (usado só pela thread do escritor)
+        self._codificador = CodificadorIntervalos()
+
+        # Registros são acumulados em memória e gravados em lote por outra thread
+        self.escritor = EscritorEmLote(
+            lambda: abrir_conexao(caminho_db, self.perfil),
+            self._gravar_lote, tamanho_lote, intervalo_escrita
+        )
+
+        # Consultas da interface usam conexões próprias, somente leitura
+        self.leitores = PoolLeitura(caminho_db, self.perfil)
+
     def _criar_tabelas(self):
         """
-        Cria as tabelas do banco de dados se não existirem.
-        """
-        cursor = self.db_connection.cursor()
-        
-        # Remove tabelas existentes para recriar com a nova estrutura
-        cursor.execute('DROP TABLE IF EXISTS registros')
-        cursor.execute('DROP TABLE IF EXISTS estatisticas_diarias')
-        
-        # Tabela de registros de postura
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS registros (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                data_hora DATETIME,
-                tipo_postura TEXT,
-                duracao INTEGER,
-                angulo_pescoco REAL,
-                angulo_coluna REAL
-            )
-        ''')
-
-        # Tabela de estatísticas diárias
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS estatisticas_diarias (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                data DATE,
-                total_minutos_correto INTEGER,
-                total_minutos_incorreto INTEGER,
-                percentual_correto REAL
-            )
-        ''')
-
-        self.db_connection.commit()
-
-    def registrar_postura(self, tipo_postura: str, duracao: int, angulos: Dict[str, float]) -> bool:
-        """
-        Registra um novo evento de postura no banco de dados.
+        Cria ou atualiza as tabelas do banco aplicando as migrações pendentes.
+        Os dados existentes são preservados entre execuções.
         """
-        try:
-            cursor = self.db_connection.cursor()
-            cursor.execute('''
-                INSERT INTO registros (data_hora, tipo_postura, duracao, angulo_pescoco, angulo_coluna)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                datetime.now(),
-                tipo_postura,
-                duracao,
-                angulos.get('pescoco', 0),
-                angulos.get('coluna', 0)
-            ))
-            self.db_connection.commit()
-            
-            # Atualiza estatísticas diárias
-            self._atualizar_estatisticas_diarias()
-            
-            return True
-        except sqlite3.Error as e:
-            print(f"Erro ao registrar postura: {e}")
-            return False
+        aplicar_migracoes(self.db_connection)
 
-    def _atualizar_estatisticas_diarias(self):
+    def registrar_postura(self, tipo_postura: str, duracao: int, angulos: Dict[str, float],
+                          data_hora: datetime = None) -> bool:
         """
-        Atualiza as estatísticas diárias de postura correta/incorreta.
+        Registra um novo evento de postura no buffer de escrita.
+        A gravação no banco acontece em lote, sem bloquear quem chama.
+        :param data_hora: Momento da amostra (agora, se None).
         """
-        try:
-            cursor = self.db_connection.cursor()
-            hoje = datetime.now().date()
-            
-            # Calcula totais para o dia
-            cursor.execute('''
-                SELECT 
-                    SUM(CASE WHEN tipo_postura = 'Postura correta' THEN duracao ELSE 0 END) as total_correto,
-                    SUM(CASE WHEN tipo_postura != 'Postura correta' THEN duracao ELSE 0 END) as total_incorreto
-                FROM registros
-                WHERE date(data_hora) = ?
-            ''', (hoje,))
-            
-            resultado = cursor.fetchone()
-            total_correto = resultado[0] or 0
-            total_incorreto = resultado[1] or 0
-            total_geral = total_correto + total_incorreto
-            
-            percentual_correto = (total_correto / total_geral * 100) if total_geral > 0 else 0
-            
-            # Atualiza ou insere estatísticas
-            cursor.execute('''
-                INSERT OR REPLACE INTO estatisticas_diarias 
-                (data, total_minutos_correto, total_minutos_incorreto, percentual_correto)
-                VALUES (?, ?, ?, ?)
-            ''', (hoje, total_correto, total_incorreto, percentual_correto))
-            
-            self.db_connection.commit()
-        except sqlite3.Error as e:
-            print(f"Erro ao atualizar estatísticas: {e}")
+        return self.escritor.adicionar((
+            para_epoch(data_hora or datetime.now()),
+            tipo_postura,
+            duracao,
+            angulos.get('pescoco', 0),
+            angulos.get('coluna', 0)
+        ))
+
+    def registrar_posturas(self, amostras: List[Tuple[datetime, str, int, Dict[str, float]]]) -> bool:
+        """
+        Registra várias amostras (data_hora, tipo_postura, duracao, angulos) de uma vez,
+        como as produzidas pela análise de vídeos gravados. Devem estar em ordem cronológica.
+        """
+        return self.escritor.adicionar_varios([(
+            para_epoch(data_hora),
+            tipo_postura,
+            duracao,
+            angulos.get('pescoco', 0),
+            angulos.get('coluna', 0)
+        ) for data_hora, tipo_postura, duracao, angulos in amostras])
+
+    def _gravar_lote(self, conexao: sqlite3.Connection, registros: List[Tuple]):
+        """
+        Grava um lote de amostras como intervalos e atualiza as estatísticas na mesma transação.
+        O intervalo aberto é estendido no próprio registro enquanto a classificação não muda.
+        Executado na thread do escritor, com a conexão exclusiva dela.
+        """
+        for intervalo in self._codificador.adicionar(registros):
+            if intervalo.id is not None:
+                cursor = conexao.execute(SQL_ESTENDER_INTERVALO, intervalo.valores() + (intervalo.id,))
+                if cursor.rowcount:
+                    continue
+            intervalo.id = conexao.execute(SQL_INSERIR_INTERVALO, intervalo.valores()).lastrowid
+
+        # Atualiza estatísticas diárias
+        self._atualizar_estatisticas_diarias(conexao, registros)
+
+    def descarregar(self):
+        """
+        Grava imediatamente os registros pendentes no buffer.
+        """
+        self.escritor.descarregar()
+
+    def versao_dados(self) -> int:
+        """
+        Versão dos dados gravados: muda a cada lote confirmado no banco, então quem
+        exibe estatísticas só precisa consultá-las de novo quando ela mudar.
+        """
+        return self.escritor.gravados()
+
+    def _atualizar_estatisticas_diarias(self, conexao: sqlite3.Connection, registros: List[Tuple]):
+        """
+        Soma ao contador de cada dia a duração dos registros do lote.
+        Não relê a tabela de registros: o custo depende apenas do tamanho do lote.
+        """
+        # Agrupa as durações do lote por dia
+        deltas = {}
+        for data_hora, tipo_postura, duracao, _, _ in registros:
+            delta = deltas.setdefault(de_epoch(data_hora).date(), [0, 0])
+            if tipo_postura == 'Postura correta':
+                delta[0] += duracao
+            else:
+                delta[1] += duracao
+
+        conexao.executemany(
+            SQL_SOMAR_ESTATISTICAS,
+            [(data, correto, incorreto) for data, (correto, incorreto) in deltas.items()]
+        )
+
+    def _consultar(self, sql: str, parametros: Tuple = ()) -> List[Tuple]:
+        """
+        Executa uma consulta em uma conexão do pool de leitura e retorna todas as linhas.
+        """
+        with self.leitores.conexao() as conexao:
+            return conexao.execute(sql, parametros).fetchall()
 
     def get_estatisticas(self, dias: int = 7) -> List[Dict[str, Any]]:
         """
         Retorna estatísticas dos últimos dias para geração de gráficos.
         """
         try:
-            cursor = self.db_connection.cursor()
-            data_inicio = datetime.now() - timedelta(days=dias)
+            data_inicio = (datetime.now() - timedelta(days=dias)).date()
             
-            cursor.execute('''
+            # Os totais vêm dos contadores diários; os intervalos informam os tipos de erro
+            linhas = self._consultar('''
                 SELECT 
-                    date(data_hora) as data,
-                    SUM(CASE WHEN tipo_postura = 'Postura correta' THEN duracao ELSE 0 END) as total_correto,
-                    SUM(CASE WHEN tipo_postura != 'Postura correta' THEN duracao ELSE 0 END) as total_incorreto,
-                    COUNT(DISTINCT CASE WHEN tipo_postura != 'Postura correta' THEN tipo_postura END) as tipos_incorretos
-                FROM registros
-                WHERE data_hora >= ?
-                GROUP BY date(data_hora)
-                ORDER BY data DESC
-            ''', (data_inicio,))
+                    e.data,
+                    e.total_minutos_correto as total_correto,
+                    e.total_minutos_incorreto as total_incorreto,
+                    COALESCE(t.tipos_incorretos, 0) as tipos_incorretos
+                FROM estatisticas_diarias e
+                LEFT JOIN (
+                    SELECT 
+                        date(inicio / 1000, 'unixepoch', 'localtime') as data,
+                        COUNT(DISTINCT tipo_postura) as tipos_incorretos
+                    FROM registros
+                    WHERE inicio >= ?
+                    AND tipo_postura != 'Postura correta'
+                    GROUP BY 1
+                ) t ON t.data = e.data
+                WHERE e.data >= ?
+                ORDER BY e.data DESC
+            ''', (para_epoch(datetime.combine(data_inicio, datetime.min.time())), data_inicio))
             
             return [{
                 'data': row[0],
                 'total_correto': row[1],
                 'total_incorreto': row[2],
                 'tipos_incorretos': row[3]
-            } for row in cursor.fetchall()]
+            } for row in linhas]
         except sqlite3.Error as e:
             print(f"Erro ao buscar estatísticas: {e}")
             return []
 
-    def get_historico(self, data_inicio: datetime = None, data_fim: datetime = None) -> List[Dict[str, Any]]:
-        """Retorna histórico de posturas no período especificado"""
+    def get_historico(self, data_inicio: datetime = None, data_fim: datetime = None,
+                      limite: int = None, detalhado: bool = False) -> List[Dict[str, Any]]:
+        """
+        Retorna histórico de posturas no período especificado, do mais recente ao mais antigo.
+        Cada item é um intervalo em que a classificação não mudou. Com `detalhado=True` os
+        intervalos são expandidos em uma linha por amostra, distribuídas uniformemente entre
+        o início e o fim, com os ângulos médios do intervalo.
+        :param limite: Quantidade máxima de itens retornados (todos, se None).
+        :param detalhado: Expande os intervalos em amostras individuais.
+        """
         try:
-            cursor = self.db_connection.cursor()
-            
             if data_inicio is None:
                 data_inicio = datetime.now() - timedelta(days=7)
             if data_fim is None:
                 data_fim = datetime.now()
+            inicio_ms = para_epoch(data_inicio)
+            fim_ms = para_epoch(data_fim)
             
-            cursor.execute('''
+            # Intervalos têm duração limitada, então a busca pelo início usa o índice
+            linhas = self._consultar('''
                 SELECT 
-                    data_hora,
+                    inicio,
+                    fim,
                     tipo_postura,
+                    amostras,
                     duracao,
-                    angulo_pescoco,
-                    angulo_coluna
+                    pescoco_min,
+                    pescoco_media,
+                    pescoco_max,
+                    coluna_min,
+                    coluna_media,
+                    coluna_max
                 FROM registros
-                WHERE data_hora BETWEEN ? AND ?
-                ORDER BY data_hora DESC
-            ''', (data_inicio, data_fim))
+                WHERE inicio BETWEEN ? AND ?
+                AND fim >= ?
+                ORDER BY inicio DESC
+                LIMIT ?
+            ''', (inicio_ms - DURACAO_MAXIMA_INTERVALO_MS, fim_ms, inicio_ms,
+                  -1 if limite is None or detalhado else limite))
+
+            if detalhado:
+                return self._expandir_intervalos(linhas, inicio_ms, fim_ms, limite)
             
             return [{
-                'data_hora': row[0],
-                'tipo_postura': row[1],
-                'duracao': row[2],
-                'angulo_pescoco': row[3],
-                'angulo_coluna': row[4]
-            } for row in cursor.fetchall()]
+                'data_hora': de_epoch(row[0]),
+                'fim': de_epoch(row[1]),
+                'tipo_postura': row[2],
+                'amostras': row[3],
+                'duracao': row[4],
+                'angulo_pescoco': row[6],
+                'angulo_coluna': row[9],
+                'pescoco_min': row[5],
+                'pescoco_max': row[7],
+                'coluna_min': row[8],
+                'coluna_max': row[10]
+            } for row in linhas]
         except sqlite3.Error as e:
             print(f"Erro ao buscar histórico: {e}")
             return []
 
-    def exportar_dados(self, formato: str = 'excel', data_inicio: datetime = None, data_fim: datetime = None) -> bool:
+    def _expandir_intervalos(self, linhas: List[Tuple], inicio_ms: int, fim_ms: int,
+                             limite: int = None) -> List[Dict[str, Any]]:
+        """
+        Converte intervalos (do mais recente ao mais antigo) em uma linha por amostra.
+        """
+        amostras = []
+        for inicio, fim, tipo_postura, quantidade, duracao, _, pescoco, _, _, coluna, _ in linhas:
+            passo = (fim - inicio) / (quantidade - 1) if quantidade > 1 else 0
+            for i in range(quantidade - 1, -1, -1):
+                data_hora = round(inicio + i * passo)
+                if not inicio_ms <= data_hora <= fim_ms:
+                    continue
+                amostras.append({
+                    'data_hora': de_epoch(data_hora),
+                    'tipo_postura': tipo_postura,
+                    'duracao': duracao / quantidade,
+                    'angulo_pescoco': pescoco,
+                    'angulo_coluna': coluna
+                })
+                if limite is not None and len(amostras) >= limite:
+                    return amostras
+        return amostras
+
+    def exportar_dados(self, formato: str = 'excel', data_inicio: datetime = None, data_fim: datetime = None,
+                       comprimir: bool = False, diretorio: str = 'exportacoes') -> bool:
+        """
+        Exporta os dados do banco para CSV, Excel ou um formato colunar ('parquet', 'npz'
+        ou 'colunar') no período selecionado, na thread de quem chama. Ver models.exportacao.
+        :param comprimir: Grava o CSV compactado (.csv.gz).
+        :param diretorio: Diretório do arquivo exportado.
         """
-        Exporta os dados do banco para CSV ou Excel no período selecionado.
+        from models.exportacao import CONCLUIDA
+        exportacao = self.criar_exportacao(formato, data_inicio, data_fim, comprimir, diretorio)
+        return exportacao is not None and exportacao.executar() == CONCLUIDA
+
+    def exportar_em_segundo_plano(self, formato: str = 'excel', data_inicio: datetime = None,
+                                  data_fim: datetime = None, comprimir: bool = False,
+                                  diretorio: str = 'exportacoes'):
         """
+        Inicia a exportação em uma thread de fundo.
+        :return: ExportacaoDados em andamento (progresso, estado, cancelar) ou None se o formato é inválido.
+        """
+        exportacao = self.criar_exportacao(formato, data_inicio, data_fim, comprimir, diretorio)
+        return exportacao.iniciar() if exportacao is not None else None
+
+    def criar_exportacao(self, formato: str = 'excel', data_inicio: datetime = None, data_fim: datetime = None,
+                         comprimir: bool = False, diretorio: str = 'exportacoes'):
+        """Cria a exportação do período (None se o formato é inválido)"""
+        from models.exportacao import ExportacaoDados
+        formato = formato.lower()
+        if formato == 'csv' and comprimir:
+            formato = 'csv.gz'
         try:
-            # Busca dados
-            dados = self.get_historico(data_inicio, data_fim)
-            if not dados:
-                return False
-            
-            # Converte para DataFrame
-            df = pd.DataFrame(dados)
-            
-            # Cria diretório de exportação se não existir
-            os.makedirs('exportacoes', exist_ok=True)
-            
-            # Nome do arquivo com timestamp
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            
-            if formato.lower() == 'excel':
-                arquivo = f'exportacoes/posturas_{timestamp}.xlsx'
-                df.to_excel(arquivo, index=False, sheet_name='Posturas')
-                
-                # Adiciona estatísticas em outra aba
-                estatisticas = pd.DataFrame(self.get_estatisticas())
-                with pd.ExcelWriter(arquivo, engine='openpyxl', mode='a') as writer:
-                    estatisticas.to_excel(writer, index=False, sheet_name='Estatísticas')
-            else:
-                arquivo = f'exportacoes/posturas_{timestamp}.csv'
-                df.to_csv(arquivo, index=False)
-            
-            return True
-        except Exception as e:
+            return ExportacaoDados(self, formato, data_inicio, data_fim, diretorio)
+        except ValueError as e:
             print(f"Erro ao exportar dados: {e}")
-            return False
+            return None
 
     def get_resumo_diario(self) -> Dict[str, Any]:
         """
         Retorna um resumo das posturas do dia (minutos correto/incorreto, percentual).
         """
         try:
-            cursor = self.db_connection.cursor()
             hoje = datetime.now().date()
             
-            cursor.execute('''
+            linhas = self._consultar('''
                 SELECT 
                     total_minutos_correto,
                     total_minutos_incorreto,
@@ -228,8 +347,8 @@ class Model:
                 WHERE data = ?
             ''', (hoje,))
             
-            resultado = cursor.fetchone()
-            if resultado:
+            if linhas:
+                resultado = linhas[0]
                 return {
                     'minutos_correto': resultado[0],
                     'minutos_incorreto': resultado[1],
@@ -249,29 +368,61 @@ class Model:
             }
 
     def get_posturas_incorretas_por_tempo(self, minutos=30):
-        """Retorna dados de posturas incorretas por intervalo de tempo"""
+        """
+        Retorna a quantidade de amostras com postura incorreta por segundo nos últimos minutos.
+        Cada intervalo guarda só o total de amostras entre inicio e fim: o total é distribuído
+        igualmente pelos segundos do intervalo (as amostras de cada segundo são aproximadas).
+        :return: Lista de tuplas (hora 'HH:MM:SS', quantidade), em ordem cronológica.
+        """
         try:
             # Obtém registros dos últimos X minutos
-            tempo_inicial = datetime.now() - timedelta(minutes=minutos)
+            inicio_ms = para_epoch(datetime.now() - timedelta(minutes=minutos))
             
-            cursor = self.db_connection.cursor()
-            cursor.execute("""
-                SELECT 
-                    strftime('%H:%M:%S', data_hora) as tempo,
-                    COUNT(*) as quantidade
+            intervalos = self._consultar("""
+                SELECT inicio, fim, amostras
                 FROM registros 
-                WHERE tipo_postura != 'Postura correta'
-                AND data_hora >= ?
-                GROUP BY strftime('%H:%M:%S', data_hora)
-                ORDER BY data_hora
-            """, (tempo_inicial,))
-            
-            return cursor.fetchall()
+                WHERE inicio >= ?
+                AND fim >= ?
+                AND tipo_postura != 'Postura correta'
+            """, (inicio_ms - DURACAO_MAXIMA_INTERVALO_MS, inicio_ms))
+
+            por_segundo = {}
+            for inicio, fim, amostras in intervalos:
+                primeiro, ultimo = inicio // 1000, fim // 1000
+                cota, resto = divmod(amostras, ultimo - primeiro + 1)
+                for indice, segundo in enumerate(range(primeiro, ultimo + 1)):
+                    quantidade = cota + (1 if indice < resto else 0)
+                    if quantidade and segundo >= inicio_ms // 1000:
+                        por_segundo[segundo] = por_segundo.get(segundo, 0) + quantidade
+            return [(de_epoch(segundo * 1000).strftime('%H:%M:%S'), quantidade)
+                    for segundo, quantidade in sorted(por_segundo.items())]
         except Exception as e:
             print(f"Erro ao buscar dados de posturas incorretas: {e}")
             return []
 
-    def __del__(self):
-        """Fecha a conexão com o banco de dados"""
+    def fechar(self, timeout: float = None) -> bool:
+        """
+        Grava os registros pendentes e fecha as conexões com o banco de dados.
+        Chamadas repetidas não fazem nada.
+        :param timeout: Tempo máximo de espera pela gravação (segundos); None espera terminar.
+        :return: False se a gravação dos pendentes não terminou no tempo (podem ser perdidos).
+        """
+        if getattr(self, '_fechado', False):
+            return True
+        self._fechado = True
+        gravou = True
+        if hasattr(self, 'escritor'):
+            gravou = self.escritor.fechar(timeout)
+        if hasattr(self, 'leitores'):
+            self.leitores.fechar()
         if hasattr(self, 'db_connection'):
-            self.db_connection.close() 
\ No newline at end of file
+            self.db_connection.close()
+        return gravou
+
+    def __del__(self):
+        """Fecha a conexão com o banco de dados, se fechar() não foi chamado"""
+        try:
+            self.fechar()
+        except sqlite3.ProgrammingError:
+            # Coletado em outra thread: a conexão só pode ser fechada na thread que a criou
+            pass
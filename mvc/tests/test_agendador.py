@@ -0,0 +1,63 @@
+import unittest
+from controllers.agendador import JANELAS_APOS_REDUCAO, AgendadorAnalise
+
+
+class TestAgendador(unittest.TestCase):
+    def _janela(self, agendador, latencia_ms, fps_captura=30.0):
+        """Registra uma janela completa de inferências com a mesma latência"""
+        mudou = False
+        for _ in range(agendador.janela):
+            mudou = agendador.registrar_inferencia(latencia_ms, fps_captura) or mudou
+        return mudou
+
+    def test_passo_fixo(self):
+        """Testa que o passo N analisa exatamente 1 a cada N frames"""
+        agendador = AgendadorAnalise(passo=3, adaptativo=False)
+        decisoes = [agendador.deve_analisar() for _ in range(9)]
+        self.assertEqual(decisoes, [False, False, True] * 3)
+
+    def test_latencia_alta_reduz_complexidade_e_aumenta_passo(self):
+        """Testa a reação a um pose.process mais lento que o orçamento"""
+        agendador = AgendadorAnalise(taxa_alvo=15, orcamento_latencia_ms=80, complexidade=1)
+        self.assertTrue(self._janela(agendador, 120.0))
+        self.assertEqual(agendador.complexidade, 0)
+        # 30 FPS com 120 ms por análise: no máximo ~8 análises/s -> passo 4
+        self.assertEqual(agendador.passo, 4)
+        self.assertEqual(agendador.latencia_ms, 120.0)
+
+        # Logo após a redução, uma latência baixa não sobe a complexidade
+        self.assertFalse(self._janela(agendador, 10.0))
+        self.assertEqual(agendador.complexidade, 0)
+        self.assertEqual(agendador.passo, 2)
+
+    def test_latencia_baixa_sobe_complexidade_ate_o_maximo(self):
+        """Testa a subida de complexidade quando sobra tempo"""
+        agendador = AgendadorAnalise(taxa_alvo=30, orcamento_latencia_ms=80,
+                                     complexidade=0, complexidade_maxima=2)
+        self.assertTrue(self._janela(agendador, 10.0))
+        self.assertTrue(self._janela(agendador, 20.0))
+        self.assertFalse(self._janela(agendador, 20.0))
+        self.assertEqual(agendador.complexidade, 2)
+        self.assertEqual(agendador.passo, 1)
+        self.assertEqual(agendador.estado(30.0)['taxa_analise'], 30.0)
+
+    def test_bloqueio_apos_reducao_expira(self):
+        """Testa que a complexidade volta a subir depois do bloqueio"""
+        agendador = AgendadorAnalise(complexidade=1)
+        self._janela(agendador, 200.0)
+        for _ in range(JANELAS_APOS_REDUCAO):
+            self._janela(agendador, 10.0)
+        self.assertEqual(agendador.complexidade, 0)
+        self.assertTrue(self._janela(agendador, 10.0))
+        self.assertEqual(agendador.complexidade, 1)
+
+    def test_nao_adaptativo(self):
+        """Testa que o modo fixo apenas mede a latência"""
+        agendador = AgendadorAnalise(passo=2, adaptativo=False)
+        self.assertFalse(self._janela(agendador, 500.0))
+        self.assertEqual((agendador.passo, agendador.complexidade), (2, 1))
+        self.assertEqual(agendador.latencia_ms, 500.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
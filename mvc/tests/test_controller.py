@@ -0,0 +1,236 @@
+import math
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import numpy as np
+from benchmarks.relatorio_imports import MODULOS_ADIADOS, medir_imports
+from controllers.cameras import DescobertaCameras
+from controllers.controller import Controller
+from controllers.eventos import SinkEventos, SinkNulo
+from controllers.motores_pose import MotorOpenCVDNN
+from models.landmarks import GravadorLandmarks, ler_sessao
+from models.model import Model
+from tests.test_motores_pose import REDE_TESTE
+
+
+class SinkGravador(SinkEventos):
+    """Guarda os eventos recebidos do Controller"""
+    def __init__(self):
+        self.eventos = []
+
+    def atualizar_status(self, mensagem, tipo="info"):
+        self.eventos.append(('status', tipo))
+
+    def atualizar_angulos(self, angulos):
+        self.eventos.append(('angulos', dict(angulos)))
+
+    def ativar_alertas(self, tipo_erro, sugestoes):
+        self.eventos.append(('alerta', tipo_erro))
+
+    def desativar_alertas(self):
+        self.eventos.append(('sem_alerta', None))
+
+    def exibir_quadro(self, frame_rgb):
+        self.eventos.append(('quadro', frame_rgb.shape))
+
+    def tipos(self):
+        return [tipo for tipo, _ in self.eventos]
+
+
+class TestControllerSemInterface(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.model = Model(os.path.join(self.diretorio, 'teste.db'), tamanho_lote=1000, intervalo_escrita=60)
+
+    def tearDown(self):
+        self.model.fechar()
+        shutil.rmtree(self.diretorio)
+
+    def _landmark(self, x, y):
+        return type('Landmark', (), {'x': x, 'y': y})()
+
+    def test_sink_padrao_sem_janela(self):
+        """Testa que sem janela Tkinter o Controller usa o destino nulo"""
+        controller = Controller(self.model)
+        self.assertIsInstance(controller.view, SinkNulo)
+
+    def test_pose_carregado_apenas_ao_iniciar(self):
+        """Testa que o MediaPipe Pose só é criado no início do monitoramento"""
+        controller = Controller(self.model)
+        self.assertIsNone(controller.pose)
+        controller.fonte = {'tipo': 'sintetica', 'total': 1}
+        controller.executar_sem_interface(duracao=1)
+        self.assertIsNotNone(controller.pose)
+
+    def test_analise_envia_eventos_ao_sink(self):
+        """Testa ângulos e alertas enviados ao destino de eventos"""
+        sink = SinkGravador()
+        controller = Controller(self.model, sink=sink)
+        controller.tempo_para_alerta = 2
+        # Pescoço a 45 graus: postura incorreta
+        landmarks = {
+            0: self._landmark(0.5, 0.5),
+            11: self._landmark(0.4, 0.4),
+            12: self._landmark(0.6, 0.4),
+            23: self._landmark(0.4, 0.6),
+            24: self._landmark(0.6, 0.6)
+        }
+        for _ in range(4):
+            controller._analisar_postura(landmarks)
+
+        self.assertEqual(sink.tipos().count('angulos'), 1)  # Demais frames vêm do cache
+        self.assertIn('alerta', sink.tipos())
+        self.model.descarregar()
+        amostras = self.model.db_connection.execute(
+            "SELECT SUM(amostras) FROM registros WHERE tipo_postura LIKE '%incorreta%'").fetchone()[0]
+        self.assertEqual(amostras, 4)
+
+    def test_quadris_ausentes_nao_registram_postura(self):
+        """Testa que um frame sem os quadris (coluna NaN) não é registrado como postura correta"""
+        sink = SinkGravador()
+        controller = Controller(self.model, sink=sink)
+        postura = controller._analisar_postura({
+            0: self._landmark(0.5, 0.5),
+            11: self._landmark(0.4, 0.4),
+            12: self._landmark(0.6, 0.4)
+        })
+        self.assertEqual(postura, (None, None))
+        self.assertTrue(math.isnan(controller.angulos['coluna']))
+        self.assertNotIn('sem_alerta', sink.tipos())
+        self.model.descarregar()
+        self.assertEqual(self.model.db_connection.execute("SELECT COUNT(*) FROM registros").fetchone()[0], 0)
+
+    def test_oscilacao_nao_repete_eventos(self):
+        """Testa que a postura oscilando no limite não gera eventos de alerta a cada frame"""
+        sink = SinkGravador()
+        controller = Controller(self.model, sink=sink)
+        for i in range(40):
+            # Coluna alternando entre 68 e 72 graus (limite em 70), pescoço a 90
+            deslocamento = 0.2 / math.tan(math.radians(68 if i % 2 else 72))
+            controller._analisar_postura({
+                0: self._landmark(0.45 + deslocamento, 0.2),
+                11: self._landmark(0.45 + deslocamento, 0.4),
+                12: self._landmark(0.65 + deslocamento, 0.4),
+                23: self._landmark(0.45, 0.6),
+                24: self._landmark(0.55, 0.6)
+            })
+        self.assertAlmostEqual(controller.angulos['coluna'], 68, places=3)
+        self.assertEqual(sink.tipos().count('sem_alerta'), 1)
+        self.assertNotIn('alerta', sink.tipos())
+        self.assertEqual(controller.estado_postura.transicoes, 1)
+
+    def test_gravacao_de_landmarks(self):
+        """Testa a gravação dos landmarks de cada frame analisado, inclusive os vindos do cache"""
+        controller = Controller(self.model)
+        controller.gravador_landmarks = GravadorLandmarks(self.diretorio, sessao='controller')
+        landmarks = {indice: self._landmark(0.5, 0.4 + indice / 100) for indice in (0, 11, 12, 23, 24)}
+        for _ in range(3):
+            controller._analisar_postura(landmarks)
+        controller.parar_monitoramento()
+
+        self.assertIsNone(controller.gravador_landmarks)
+        registros = np.concatenate(ler_sessao(self.diretorio, 'controller'))
+        self.assertEqual(len(registros), 3)
+        self.assertAlmostEqual(float(registros['pontos'][0, 23, 1]), 0.63, places=5)
+
+    def test_executar_sem_interface(self):
+        """Testa o monitoramento sem interface até a fonte parar de entregar frames"""
+        sink = SinkGravador()
+        controller = Controller(self.model, sink=sink)
+        controller.fonte = {'tipo': 'sintetica', 'total': 30, 'fps': 100, 'tempo_real': True}
+        controller.executar_sem_interface(duracao=5)
+
+        self.assertFalse(controller.is_running)
+        self.assertEqual(sink.eventos[0], ('status', 'success'))
+        self.assertIn(('quadro', (480, 640, 3)), sink.eventos)
+
+        metricas = controller.get_metricas()
+        for etapa in ('captura', 'preparo', 'pose', 'conversao', 'exibicao'):
+            self.assertIn(etapa, metricas['etapas'])
+        self.assertEqual(metricas['totais']['capturados'], 30)
+        self.assertIn('cache', metricas)
+        self.assertEqual(metricas['agendador']['passo'], controller.agendador.passo)
+
+    def test_troca_de_motor_de_pose(self):
+        """Testa a troca do motor de pose e a recusa de uma configuração inválida"""
+        controller = Controller(self.model)
+        with self.assertRaises(ValueError):
+            controller.configurar_pose(motor='inexistente')
+        self.assertEqual(controller.config_pose['motor'], 'mediapipe')
+
+        with open(os.path.join(self.diretorio, 'rede.prototxt'), 'w') as arquivo:
+            arquivo.write(REDE_TESTE)
+        controller.configurar_pose(complexidade=2, motor='opencv_dnn', modelo=self.diretorio)
+        # A rede tem uma só complexidade: o agendador fica limitado a ela
+        self.assertEqual((controller.agendador.complexidade_minima, controller.agendador.complexidade_maxima), (1, 1))
+
+        controller.fonte = {'tipo': 'sintetica', 'total': 10}
+        controller.executar_sem_interface(duracao=5)
+        self.assertIsInstance(controller.pose, MotorOpenCVDNN)
+        self.assertEqual(controller.get_metricas()['motor'], 'opencv_dnn')
+
+    def test_troca_de_motor_em_segundo_plano(self):
+        """Testa a troca de motor fora da thread de quem chama, com o erro entregue pela Future"""
+        controller = Controller(self.model)
+        futuro = controller.configurar_pose_em_segundo_plano(motor='opencv_dnn',
+                                                             modelo=os.path.join(self.diretorio, 'ausente'))
+        with self.assertRaises(IOError):
+            futuro.result(timeout=10)
+        self.assertEqual(controller.config_pose['motor'], 'mediapipe')
+
+        with open(os.path.join(self.diretorio, 'rede.prototxt'), 'w') as arquivo:
+            arquivo.write(REDE_TESTE)
+        futuro = controller.configurar_pose_em_segundo_plano(motor='opencv_dnn', modelo=self.diretorio)
+        self.assertIsNone(futuro.result(timeout=10))
+        self.assertEqual(controller.config_pose['motor'], 'opencv_dnn')
+        self.assertIsInstance(controller._pose_pendente[0], MotorOpenCVDNN)
+
+
+class TestDescobertaCameras(unittest.TestCase):
+    def test_descoberta_em_segundo_plano_com_cache(self):
+        """Testa que a lista fica em cache até vencer ou ser atualizada"""
+        chamadas = []
+
+        def descobrir():
+            chamadas.append(1)
+            return [0, 2]
+
+        cameras = DescobertaCameras(validade=60, descobrir=descobrir)
+        self.assertEqual(cameras.obter(esperar=True), [0, 2])
+        self.assertEqual(cameras.obter(), [0, 2])
+        self.assertEqual(len(chamadas), 1)
+
+        cameras.atualizar(esperar=True)
+        self.assertEqual(len(chamadas), 2)
+
+        cameras.validade = 0
+        time.sleep(0.01)
+        cameras.obter()
+        cameras.atualizar(esperar=True)
+        self.assertGreaterEqual(len(chamadas), 3)
+
+    def test_nao_bloqueia_inicializacao(self):
+        """Testa que uma descoberta lenta não atrasa quem pede a lista"""
+        liberar = threading.Event()
+        cameras = DescobertaCameras(descobrir=lambda: liberar.wait(1) and [1])
+        inicio = time.perf_counter()
+        self.assertEqual(cameras.obter(), [])
+        self.assertLess(time.perf_counter() - inicio, 0.5)
+        liberar.set()
+        cameras.atualizar(esperar=True)
+        self.assertEqual(cameras.obter(), [1])
+
+
+class TestInicializacao(unittest.TestCase):
+    def test_modulos_pesados_adiados(self):
+        """Testa que MediaPipe, openpyxl e matplotlib não são importados na inicialização"""
+        carregados = {nome.split('.')[0] for nome, _, _, _ in medir_imports()}
+        for modulo in MODULOS_ADIADOS:
+            self.assertNotIn(modulo, carregados)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+import unittest
+import csv
+import glob
+import gzip
+import importlib.util
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timedelta
+import numpy as np
+from openpyxl import load_workbook
+from models.model import Model
+from models.exportacao import (ExportacaoDados, CANCELADA, CONCLUIDA, VAZIA, COLUNAS_POSTURAS,
+                               COLUNAS_ESTATISTICAS, carregar_exportacao, formato_colunar)
+from models.model import para_epoch
+
+PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+
+class TestExportacao(unittest.TestCase):
+    def setUp(self):
+        """Cria um banco temporário com intervalos alternando entre correto e incorreto"""
+        self.diretorio = tempfile.mkdtemp()
+        self.model = Model(os.path.join(self.diretorio, 'postura.db'))
+        self.base = datetime(2025, 5, 29, 9, 0, 0)
+        amostras = []
+        for i in range(60):
+            postura, angulos = (("Postura correta", {'pescoco': 90, 'coluna': 85}) if i % 2 == 0
+                                else ("Postura incorreta", {'pescoco': 50, 'coluna': 85}))
+            amostras.append((self.base + timedelta(minutes=i), postura, 1, angulos))
+        self.model.registrar_posturas(amostras)
+        self.saida = os.path.join(self.diretorio, 'exportacoes')
+
+    def tearDown(self):
+        self.model.fechar()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def _exportacao(self, formato, **opcoes):
+        return ExportacaoDados(self.model, formato, self.base, self.base + timedelta(hours=2),
+                               diretorio=self.saida, **opcoes)
+
+    def test_csv_em_blocos(self):
+        """Testa o CSV escrito em blocos menores que o total de linhas"""
+        exportacao = self._exportacao('csv', tamanho_bloco=7)
+        self.assertEqual(exportacao.executar(), CONCLUIDA)
+        with open(exportacao.arquivo, newline='', encoding='utf-8') as arquivo:
+            linhas = list(csv.reader(arquivo))
+        self.assertEqual(tuple(linhas[0]), COLUNAS_POSTURAS)
+        self.assertEqual(len(linhas) - 1, 60)
+        self.assertEqual(exportacao.escritas, 60)
+        self.assertEqual(exportacao.progresso, 1.0)
+        # Mais recente primeiro, como em get_historico
+        self.assertEqual(linhas[1][0], str(self.base + timedelta(minutes=59)))
+        self.assertEqual(os.listdir(self.saida), [os.path.basename(exportacao.arquivo)])
+
+    def test_csv_compactado(self):
+        """Testa a exportação para .csv.gz"""
+        self.assertEqual(self.model.criar_exportacao('csv', comprimir=True).formato, 'csv.gz')
+        exportacao = self._exportacao('csv.gz')
+        self.assertTrue(exportacao.arquivo.endswith('.csv.gz'))
+        self.assertEqual(exportacao.executar(), CONCLUIDA)
+        with gzip.open(exportacao.arquivo, 'rt', newline='', encoding='utf-8') as arquivo:
+            self.assertEqual(len(list(csv.reader(arquivo))), 61)
+
+    def test_excel_com_as_duas_abas(self):
+        """Testa o Excel com as abas de posturas e estatísticas"""
+        exportacao = self._exportacao('excel', tamanho_bloco=10)
+        self.assertEqual(exportacao.executar(), CONCLUIDA)
+        pasta = load_workbook(exportacao.arquivo, read_only=True)
+        self.assertEqual(pasta.sheetnames, ['Posturas', 'Estatísticas'])
+        posturas = list(pasta['Posturas'].values)
+        self.assertEqual(posturas[0], COLUNAS_POSTURAS)
+        self.assertEqual(len(posturas) - 1, 60)
+        self.assertEqual(posturas[1][2], "Postura incorreta")
+        estatisticas = list(pasta['Estatísticas'].values)
+        # Mesma aba de antes: as estatísticas dos últimos 7 dias (get_estatisticas)
+        self.assertEqual(estatisticas[0], COLUNAS_ESTATISTICAS)
+        pasta.close()
+
+    def _verificar_colunar(self, exportacao):
+        self.assertEqual(exportacao.executar(), CONCLUIDA)
+        dados = carregar_exportacao(exportacao.arquivo)
+        self.assertEqual(len(dados['inicio_ms']), 60)
+        self.assertEqual(dados['inicio_ms'].dtype, np.int64)
+        self.assertEqual(dados['angulo_pescoco'].dtype, np.float32)
+        self.assertEqual(dados['inicio_ms'][0], para_epoch(self.base + timedelta(minutes=59)))
+        tipos = dados['tipo_postura_categorias'][dados['tipo_postura']]
+        self.assertEqual(sorted(set(tipos)), ["Postura correta", "Postura incorreta"])
+        self.assertEqual((tipos == "Postura correta").sum(), 30)
+        self.assertEqual(dados['angulo_pescoco'][tipos == "Postura incorreta"][0], 50)
+
+    def test_npz(self):
+        """Testa a exportação colunar em .npz e a leitura de volta"""
+        exportacao = self._exportacao('npz', tamanho_bloco=7)
+        self.assertTrue(exportacao.arquivo.endswith('.npz'))
+        self._verificar_colunar(exportacao)
+        self.assertEqual(os.listdir(self.saida), [os.path.basename(exportacao.arquivo)])
+
+    @unittest.skipUnless(PYARROW, "pyarrow não instalado")
+    def test_parquet(self):
+        """Testa a exportação colunar em Parquet e a leitura de volta"""
+        self._verificar_colunar(self._exportacao('parquet', tamanho_bloco=7))
+
+    def test_formato_colunar_disponivel(self):
+        """Testa a escolha do formato colunar conforme o pyarrow"""
+        self.assertEqual(formato_colunar(), 'parquet' if PYARROW else 'npz')
+        self.assertEqual(self._exportacao('colunar').formato, formato_colunar())
+
+    def test_periodo_sem_dados(self):
+        """Testa que um período vazio não cria arquivo"""
+        exportacao = ExportacaoDados(self.model, 'csv', datetime(2020, 1, 1), datetime(2020, 1, 2),
+                                     diretorio=self.saida)
+        self.assertEqual(exportacao.executar(), VAZIA)
+        self.assertFalse(os.path.exists(self.saida))
+
+    def test_cancelamento_remove_parcial(self):
+        """Testa que a exportação cancelada não deixa arquivos, nem os temporários do openpyxl"""
+        temporarios = set(glob.glob(os.path.join(tempfile.gettempdir(), 'openpyxl.*')))
+        exportacao = self._exportacao('excel', tamanho_bloco=5)
+        blocos = exportacao._blocos
+
+        def cancelar_no_segundo_bloco(cursor):
+            for numero, bloco in enumerate(blocos(cursor)):
+                if numero == 1:
+                    exportacao.cancelar()
+                yield bloco
+        exportacao._blocos = cancelar_no_segundo_bloco
+
+        self.assertEqual(exportacao.executar(), CANCELADA)
+        self.assertLess(exportacao.escritas, 60)
+        self.assertEqual(os.listdir(self.saida), [])
+        self.assertEqual(set(glob.glob(os.path.join(tempfile.gettempdir(), 'openpyxl.*'))), temporarios)
+
+    def test_segundo_plano(self):
+        """Testa a exportação em segundo plano com os registros ainda em memória"""
+        self.model.registrar_postura("Postura correta", 1, {'pescoco': 90, 'coluna': 85})
+        exportacao = ExportacaoDados(self.model, 'csv', diretorio=self.saida).iniciar()
+        self.assertTrue(exportacao.aguardar(10))
+        self.assertEqual(exportacao.estado, CONCLUIDA)
+        self.assertEqual(exportacao.total, 1)
+
+    def test_consultas_da_interface_durante_a_exportacao(self):
+        """Testa que a exportação não ocupa o único leitor do pool (perfil com leitores=1)"""
+        self.model.fechar()
+        self.model = Model(os.path.join(self.diretorio, 'postura.db'), perfil={'leitores': 1})
+        exportacao = self._exportacao('csv', tamanho_bloco=5)
+        blocos = exportacao._blocos
+        em_andamento = threading.Event()
+        liberar = threading.Event()
+
+        def pausar_no_primeiro_bloco(cursor):
+            for bloco in blocos(cursor):
+                em_andamento.set()
+                liberar.wait(10)
+                yield bloco
+        exportacao._blocos = pausar_no_primeiro_bloco
+        exportacao.iniciar()
+        try:
+            self.assertTrue(em_andamento.wait(10))
+            resumo = []
+            consulta = threading.Thread(target=lambda: resumo.append(self.model.get_resumo_diario()), daemon=True)
+            consulta.start()
+            consulta.join(5)
+            self.assertEqual(len(resumo), 1)
+            self.assertFalse(exportacao.aguardar(0))
+        finally:
+            liberar.set()
+        self.assertTrue(exportacao.aguardar(10))
+        self.assertEqual(exportacao.estado, CONCLUIDA)
+
+    def test_formato_desconhecido(self):
+        """Testa a recusa de formatos não suportados"""
+        with self.assertRaises(ValueError):
+            ExportacaoDados(self.model, 'pdf')
+        self.assertIsNone(self.model.criar_exportacao('pdf'))
+
+
+if __name__ == '__main__':
+    unittest.main()
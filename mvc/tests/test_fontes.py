@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import cv2
+import numpy as np
+from controllers.fontes import FonteSintetica, config_de_argumento, criar_fonte, gravar_memmap
+
+
+class TestFontes(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio)
+
+    def test_sintetica_deterministica(self):
+        """Testa que a mesma semente gera os mesmos frames"""
+        a = FonteSintetica(64, 48, total=3, semente=7)
+        b = FonteSintetica(64, 48, total=3, semente=7)
+        for _ in range(3):
+            ret_a, quadro_a = a.read()
+            ret_b, quadro_b = b.read()
+            self.assertTrue(ret_a and ret_b)
+            self.assertEqual(quadro_a.shape, (48, 64, 3))
+            np.testing.assert_array_equal(quadro_a, quadro_b)
+        self.assertFalse(a.read()[0])
+
+    def test_repetir_e_seek(self):
+        """Testa o laço ao fim da fonte e o posicionamento em um frame"""
+        fonte = criar_fonte({'tipo': 'sintetica', 'largura': 64, 'altura': 48, 'total': 3, 'repetir': True})
+        primeiro = fonte.read()[1]
+        fonte.read()
+        fonte.read()
+        np.testing.assert_array_equal(fonte.read()[1], primeiro)
+
+        fonte.set(cv2.CAP_PROP_POS_FRAMES, 2)
+        self.assertEqual(fonte.get(cv2.CAP_PROP_POS_FRAMES), 2)
+        fonte.read()
+        np.testing.assert_array_equal(fonte.read()[1], primeiro)
+
+    def test_tempo_real(self):
+        """Testa a entrega no ritmo do FPS"""
+        fonte = FonteSintetica(32, 24, total=11, fps=100, tempo_real=True)
+        inicio = time.perf_counter()
+        while fonte.read()[0]:
+            pass
+        self.assertGreaterEqual(time.perf_counter() - inicio, 0.09)
+
+    def test_memmap_sem_copia(self):
+        """Testa a leitura de um dump de frames brutos mapeado em memória"""
+        quadros = [np.full((48, 64, 3), i, dtype=np.uint8) for i in range(4)]
+        caminho = os.path.join(self.diretorio, 'quadros.raw')
+        self.assertEqual(gravar_memmap(caminho, quadros), 4)
+
+        fonte = criar_fonte({'tipo': 'memmap', 'caminho': caminho, 'largura': 64, 'altura': 48})
+        self.assertEqual(fonte.get(cv2.CAP_PROP_FRAME_COUNT), 4)
+        fonte.seek(2)
+        ret, quadro = fonte.read()
+        self.assertTrue(ret)
+        self.assertIsInstance(quadro.base, np.memmap)
+        np.testing.assert_array_equal(quadro, quadros[2])
+        fonte.release()
+
+    def test_imagens_e_video(self):
+        """Testa as fontes de diretório de imagens e de arquivo de vídeo"""
+        imagens = os.path.join(self.diretorio, 'imagens')
+        os.mkdir(imagens)
+        caminho_video = os.path.join(self.diretorio, 'video.avi')
+        gravador = cv2.VideoWriter(caminho_video, cv2.VideoWriter_fourcc(*'MJPG'), 30, (64, 48))
+        for i in range(5):
+            quadro = np.full((48, 64, 3), i * 40, dtype=np.uint8)
+            cv2.imwrite(os.path.join(imagens, f'{i:03d}.png'), quadro)
+            gravador.write(quadro)
+        gravador.release()
+
+        for argumento in (imagens, caminho_video):
+            fonte = criar_fonte(config_de_argumento(argumento))
+            self.assertEqual(fonte.get(cv2.CAP_PROP_FRAME_WIDTH), 64)
+            lidos = 0
+            while fonte.read()[0]:
+                lidos += 1
+            self.assertEqual(lidos, 5)
+            fonte.release()
+
+    def test_configuracao_invalida(self):
+        """Testa a configuração de fonte desconhecida e a interpretação dos argumentos"""
+        with self.assertRaises(ValueError):
+            criar_fonte({'tipo': 'satelite'})
+        self.assertEqual(config_de_argumento('2'), {'tipo': 'webcam', 'indice': 2})
+        self.assertEqual(config_de_argumento('sintetica', repetir=True)['repetir'], True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+from models.landmarks import (GravadorLandmarks, CABECALHO, REGISTRO, ler_segmento, ler_sessao,
+                              segmentos_sessao)
+
+
+class TestGravadorLandmarks(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def _pontos(self, valor):
+        return np.full((33, 4), valor, dtype=np.float32)
+
+    def test_rotacao_de_segmentos(self):
+        """Testa a troca de segmento ao atingir a capacidade e o corte do último"""
+        gravador = GravadorLandmarks(self.diretorio, sessao='teste', registros_por_segmento=10)
+        for i in range(25):
+            gravador.adicionar(self._pontos(i), instante_ms=1000 + i)
+        gravador.fechar()
+
+        self.assertEqual(gravador.segmentos, segmentos_sessao(self.diretorio, 'teste'))
+        self.assertEqual([len(ler_segmento(caminho)) for caminho in gravador.segmentos], [10, 10, 5])
+        self.assertEqual(os.path.getsize(gravador.segmentos[-1]), CABECALHO.itemsize + 5 * REGISTRO.itemsize)
+
+        registros = np.concatenate(ler_sessao(self.diretorio, 'teste'))
+        np.testing.assert_array_equal(registros['instante_ms'], np.arange(1000, 1025))
+        np.testing.assert_array_equal(registros['pontos'][:, 32, 3], np.arange(25, dtype=np.float32))
+
+    def test_leitura_sem_copia_durante_a_gravacao(self):
+        """Testa a leitura mapeada de um segmento ainda aberto"""
+        gravador = GravadorLandmarks(self.diretorio, sessao='aberta', registros_por_segmento=100)
+        for i in range(3):
+            gravador.adicionar(self._pontos(i))
+        gravador.descarregar()
+
+        registros = ler_segmento(gravador.segmentos[0])
+        self.assertIsInstance(registros, np.memmap)
+        self.assertEqual(registros.shape, (3,))
+        self.assertEqual(registros['pontos'].shape, (3, 33, 4))
+        self.assertFalse(registros.flags.writeable)
+        self.assertGreater(registros['instante_ms'][0], 0)
+        del registros
+        gravador.fechar()
+
+    def test_sessoes_com_o_mesmo_nome(self):
+        """Testa que uma nova gravação com o nome de uma sessão existente não a sobrescreve"""
+        primeira = GravadorLandmarks(self.diretorio, sessao='repetida')
+        primeira.adicionar(self._pontos(1))
+        primeira.fechar()
+        segunda = GravadorLandmarks(self.diretorio, sessao='repetida')
+        terceira = GravadorLandmarks(self.diretorio, sessao='repetida')
+        segunda.adicionar(self._pontos(2))
+        terceira.adicionar(self._pontos(3))
+        segunda.fechar()
+        terceira.fechar()
+
+        self.assertEqual((segunda.sessao, terceira.sessao), ('repetida-1', 'repetida-2'))
+        for sessao, valor in (('repetida', 1), ('repetida-1', 2), ('repetida-2', 3)):
+            registros = np.concatenate(ler_sessao(self.diretorio, sessao))
+            self.assertEqual(len(registros), 1)
+            self.assertEqual(registros['pontos'][0, 0, 0], valor)
+        # Sessões padrão têm resolução de milissegundos
+        self.assertRegex(GravadorLandmarks(self.diretorio).sessao, r'^\d{8}_\d{6}_\d{3}$')
+
+    def test_arquivo_invalido(self):
+        """Testa a recusa de arquivos que não são gravações de landmarks"""
+        caminho = os.path.join(self.diretorio, 'outro.lmk')
+        with open(caminho, 'wb') as arquivo:
+            arquivo.write(b'\0' * 128)
+        with self.assertRaises(ValueError):
+            ler_segmento(caminho)
+
+
+if __name__ == '__main__':
+    unittest.main()
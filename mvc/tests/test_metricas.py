@@ -0,0 +1,47 @@
+import time
+import unittest
+from controllers.metricas import ContadorTaxa, JanelaTempos, MetricasDesempenho, formatar_resumo
+
+
+class TestMetricas(unittest.TestCase):
+    def test_janela_circular(self):
+        """Testa que os percentis usam apenas as últimas durações"""
+        janela = JanelaTempos(capacidade=100)
+        self.assertIsNone(janela.percentis())
+        for duracao in range(1000):
+            janela.adicionar(duracao)
+        percentis = janela.percentis()
+        self.assertEqual(percentis['amostras'], 100)
+        self.assertEqual(janela.total, 1000)
+        self.assertAlmostEqual(percentis['p50_ms'], 949.5)
+        self.assertGreater(percentis['p99_ms'], percentis['p95_ms'])
+
+    def test_taxa(self):
+        """Testa a taxa de eventos na janela de tempo"""
+        contador = ContadorTaxa(janela=2.0)
+        for i in range(60):
+            contador.registrar(agora=10.0 + i / 30)
+        self.assertAlmostEqual(contador.taxa(agora=12.0), 30.0, delta=1.0)
+        self.assertEqual(contador.taxa(agora=20.0), 0.0)
+        self.assertEqual(contador.total, 60)
+
+    def test_medir_e_resumo(self):
+        """Testa a medição de etapas e o texto de resumo"""
+        metricas = MetricasDesempenho()
+        with metricas.medir('pose'):
+            time.sleep(0.01)
+        metricas.registrar('captura', 1.0)
+        metricas.contar('capturados')
+
+        estatisticas = metricas.estatisticas()
+        self.assertEqual(list(estatisticas['etapas']), ['captura', 'pose'])
+        self.assertGreaterEqual(estatisticas['etapas']['pose']['p50_ms'], 10.0)
+        self.assertEqual(estatisticas['totais']['capturados'], 1)
+
+        resumo = formatar_resumo(estatisticas)
+        self.assertIn('capturados', resumo)
+        self.assertIn('pose p50', resumo)
+
+
+if __name__ == '__main__':
+    unittest.main()
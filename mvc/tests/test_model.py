@@ -0,0 +1,244 @@
+import unittest
+import gc
+import os
+import sqlite3
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from models.model import Model
+from models.migracoes import MIGRACOES, versao_atual
+
+
+class TestModel(unittest.TestCase):
+    def setUp(self):
+        """Cria um banco temporário para cada teste"""
+        self.diretorio = tempfile.mkdtemp()
+        self.caminho_db = os.path.join(self.diretorio, 'postura.db')
+        self.model = Model(self.caminho_db, tamanho_lote=1000, intervalo_escrita=60)
+
+    def tearDown(self):
+        """Fecha o banco e remove os arquivos temporários"""
+        self.model.fechar()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def _contar_amostras(self):
+        return self.model.db_connection.execute("SELECT COALESCE(SUM(amostras), 0) FROM registros").fetchone()[0]
+
+    def test_registro_fica_em_memoria_ate_descarregar(self):
+        """Testa que o registro não acessa o disco até o buffer ser descarregado"""
+        angulos = {'pescoco': 90, 'coluna': 85}
+        for _ in range(10):
+            self.assertTrue(self.model.registrar_postura("Postura correta", 1, angulos))
+        self.assertEqual(self._contar_amostras(), 0)
+        self.assertEqual(self.model.escritor.pendentes(), 10)
+
+        self.model.descarregar()
+        self.assertEqual(self._contar_amostras(), 10)
+        self.assertEqual(self.model.get_resumo_diario()['minutos_correto'], 10)
+
+    def test_lote_cheio_dispara_gravacao(self):
+        """Testa a gravação automática quando o lote atinge o tamanho configurado"""
+        self.model.escritor.tamanho_lote = 5
+        angulos = {'pescoco': 90, 'coluna': 85}
+        for _ in range(5):
+            self.model.registrar_postura("Postura correta", 1, angulos)
+        inicio = time.time()
+        while self._contar_amostras() < 5 and time.time() - inicio < 2:
+            time.sleep(0.01)
+        self.assertEqual(self._contar_amostras(), 5)
+
+    def test_estatisticas_diarias_incrementais(self):
+        """Testa que cada lote soma ao contador do dia, mantendo uma linha por data"""
+        angulos = {'pescoco': 90, 'coluna': 85}
+        for _ in range(3):
+            self.model.registrar_postura("Postura correta", 2, angulos)
+            self.model.registrar_postura("Postura incorreta - Coluna muito curvada", 1, angulos)
+            self.model.descarregar()
+
+        linhas = self.model.db_connection.execute("SELECT COUNT(*) FROM estatisticas_diarias").fetchone()[0]
+        self.assertEqual(linhas, 1)
+
+        resumo = self.model.get_resumo_diario()
+        self.assertEqual(resumo['minutos_correto'], 6)
+        self.assertEqual(resumo['minutos_incorreto'], 3)
+        self.assertAlmostEqual(resumo['percentual_correto'], 200 / 3)
+
+    def test_historico_preservado_entre_execucoes(self):
+        """Testa que reabrir o banco não apaga os registros"""
+        self.model.registrar_postura("Postura correta", 1, {'pescoco': 90, 'coluna': 85})
+        self.model.fechar()
+
+        self.model = Model(self.caminho_db)
+        historico = self.model.get_historico(datetime.now() - timedelta(minutes=1), datetime.now())
+        self.assertEqual(len(historico), 1)
+        self.assertIsInstance(historico[0]['data_hora'], datetime)
+        self.assertEqual(versao_atual(self.model.db_connection), MIGRACOES[-1][0])
+
+    def test_migracao_banco_legado(self):
+        """Testa a conversão de um banco com datas em texto e estatísticas duplicadas"""
+        self.model.fechar()
+        caminho_legado = os.path.join(self.diretorio, 'legado.db')
+        conexao = sqlite3.connect(caminho_legado)
+        conexao.executescript('''
+            CREATE TABLE registros (id INTEGER PRIMARY KEY AUTOINCREMENT, data_hora DATETIME,
+                tipo_postura TEXT, duracao INTEGER, angulo_pescoco REAL, angulo_coluna REAL);
+            CREATE TABLE estatisticas_diarias (id INTEGER PRIMARY KEY AUTOINCREMENT, data DATE,
+                total_minutos_correto INTEGER, total_minutos_incorreto INTEGER, percentual_correto REAL);
+            INSERT INTO registros VALUES (1, '2025-05-31 13:54:54.639310', 'Postura correta', 1, 90, 85);
+            INSERT INTO registros VALUES (2, '2025-05-31 13:54:55.000000', 'Postura incorreta', 3, 50, 85);
+            INSERT INTO estatisticas_diarias VALUES (1, '2025-05-31', 1, 0, 100);
+            INSERT INTO estatisticas_diarias VALUES (2, '2025-05-31', 1, 3, 25);
+        ''')
+        conexao.close()
+
+        self.model = Model(caminho_legado)
+        historico = self.model.get_historico(datetime(2025, 5, 31), datetime(2025, 6, 1))
+        self.assertEqual([r['data_hora'] for r in historico],
+                         [datetime(2025, 5, 31, 13, 54, 55), datetime(2025, 5, 31, 13, 54, 54, 639000)])
+        estatisticas = self.model.db_connection.execute("SELECT * FROM estatisticas_diarias").fetchall()
+        self.assertEqual(estatisticas, [('2025-05-31', 1, 3, 25.0)])
+
+    def test_migracao_preserva_intervalo_aberto_entre_blocos(self):
+        """Testa que o intervalo aberto no fim de um bloco lido na migração não se perde"""
+        self.model.fechar()
+        caminho_legado = os.path.join(self.diretorio, 'legado.db')
+        conexao = sqlite3.connect(caminho_legado)
+        conexao.execute('''
+            CREATE TABLE registros (id INTEGER PRIMARY KEY AUTOINCREMENT, data_hora DATETIME,
+                tipo_postura TEXT, duracao INTEGER, angulo_pescoco REAL, angulo_coluna REAL)
+        ''')
+        base = datetime(2025, 5, 31, 9, 0, 0)
+        # O tipo muda exatamente na primeira amostra do segundo bloco (10.000 linhas por bloco)
+        conexao.executemany(
+            "INSERT INTO registros (data_hora, tipo_postura, duracao, angulo_pescoco, angulo_coluna) "
+            "VALUES (?, ?, 2, 90, 85)",
+            [(str(base + timedelta(milliseconds=100 * i)), "Postura correta" if i < 10000 else "Postura incorreta")
+             for i in range(10005)])
+        conexao.commit()
+        conexao.close()
+
+        self.model = Model(caminho_legado)
+        amostras, duracao = self.model.db_connection.execute(
+            "SELECT SUM(amostras), SUM(duracao) FROM registros").fetchone()
+        self.assertEqual((amostras, duracao), (10005, 20010))
+
+    def test_consulta_historico_usa_indice(self):
+        """Testa que a consulta por período usa o índice do início dos intervalos"""
+        plano = self.model.db_connection.execute('''
+            EXPLAIN QUERY PLAN SELECT * FROM registros
+            WHERE inicio BETWEEN 0 AND 1 AND fim >= 0 ORDER BY inicio DESC
+        ''').fetchall()
+        self.assertIn('idx_registros_inicio', str(plano))
+
+    def test_amostras_iguais_estendem_o_mesmo_intervalo(self):
+        """Testa que amostras consecutivas iguais viram um intervalo atualizado no lugar"""
+        for pescoco in (80, 90, 100):
+            self.model.registrar_postura("Postura correta", 1, {'pescoco': pescoco, 'coluna': 85})
+            self.model.descarregar()
+        self.model.registrar_postura("Postura incorreta - Pescoço muito inclinado", 1, {'pescoco': 50, 'coluna': 85})
+        self.model.descarregar()
+
+        linhas = self.model.db_connection.execute('''
+            SELECT id, tipo_postura, amostras, pescoco_min, pescoco_media, pescoco_max
+            FROM registros ORDER BY inicio
+        ''').fetchall()
+        self.assertEqual(len(linhas), 2)
+        self.assertEqual(linhas[0][1:], ("Postura correta", 3, 80, 90, 100))
+        self.assertEqual(linhas[1][2], 1)
+
+        historico = self.model.get_historico()
+        self.assertEqual([h['amostras'] for h in historico], [1, 3])
+        detalhado = self.model.get_historico(detalhado=True)
+        self.assertEqual(len(detalhado), 4)
+        self.assertEqual(detalhado[-1]['angulo_pescoco'], 90)
+        self.assertEqual(len(self.model.get_historico(detalhado=True, limite=2)), 2)
+
+    def test_perfil_armazenamento(self):
+        """Testa os ajustes do perfil padrão e o pool de leitura somente leitura"""
+        modo = self.model.db_connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(modo, 'wal')
+        with self.model.leitores.conexao() as conexao:
+            with self.assertRaises(sqlite3.OperationalError):
+                conexao.execute("DELETE FROM registros")
+
+        self.model.fechar()
+        self.model = Model(self.caminho_db, perfil={'synchronous': 'FULL', 'leitores': 1})
+        self.assertEqual(self.model.db_connection.execute("PRAGMA synchronous").fetchone()[0], 2)
+        with self.assertRaises(ValueError):
+            Model(self.caminho_db, perfil='inexistente')
+
+    def test_registro_em_lote_com_horario(self):
+        """Testa o registro em lote de amostras com horário explícito (análise de vídeos)"""
+        base = datetime(2025, 5, 29, 17, 0, 0)
+        amostras = [(base + timedelta(seconds=i / 10), "Postura correta", 1, {'pescoco': 90, 'coluna': 85})
+                    for i in range(20)]
+        self.assertTrue(self.model.registrar_posturas(amostras))
+        self.model.descarregar()
+
+        historico = self.model.get_historico(base, base + timedelta(minutes=1))
+        self.assertEqual(len(historico), 1)
+        self.assertEqual(historico[0]['amostras'], 20)
+        self.assertEqual(historico[0]['data_hora'], base)
+        estatisticas = self.model.db_connection.execute(
+            "SELECT total_minutos_correto FROM estatisticas_diarias WHERE data = '2025-05-29'").fetchone()
+        self.assertEqual(estatisticas[0], 20)
+
+    def test_posturas_incorretas_distribuidas_por_segundo(self):
+        """Testa que as amostras de um intervalo são distribuídas pelos segundos que ele cobre"""
+        base = (datetime.now() - timedelta(minutes=5)).replace(microsecond=0)
+        amostras = [(base + timedelta(seconds=i / 2), "Postura incorreta - Coluna muito curvada", 1,
+                     {'pescoco': 90, 'coluna': 50}) for i in range(10)]
+        amostras.append((base + timedelta(seconds=5), "Postura correta", 1, {'pescoco': 90, 'coluna': 85}))
+        self.model.registrar_posturas(amostras)
+        self.model.descarregar()
+
+        por_tempo = self.model.get_posturas_incorretas_por_tempo()
+        esperado = [((base + timedelta(seconds=i)).strftime('%H:%M:%S'), 2) for i in range(5)]
+        self.assertEqual(por_tempo, esperado)
+        self.assertEqual(self.model.get_posturas_incorretas_por_tempo(minutos=1), [])
+
+    def test_versao_dados_muda_a_cada_gravacao(self):
+        """Testa que a versão dos dados só muda quando um lote é gravado"""
+        versao = self.model.versao_dados()
+        self.model.registrar_postura("Postura correta", 1, {'pescoco': 90, 'coluna': 85})
+        self.assertEqual(self.model.versao_dados(), versao)
+        self.model.descarregar()
+        nova = self.model.versao_dados()
+        self.assertNotEqual(nova, versao)
+        self.model.descarregar()
+        self.assertEqual(self.model.versao_dados(), nova)
+
+    def test_fechar_repetido_e_coleta_em_outra_thread(self):
+        """Testa que fechar() pode ser repetido e que a coleta em outra thread não gera erro"""
+        self.assertTrue(self.model.fechar())
+        self.assertTrue(self.model.fechar())
+
+        erros = []
+        gancho = sys.unraisablehook
+        sys.unraisablehook = erros.append
+        try:
+            modelos = [Model(os.path.join(self.diretorio, 'outro.db'))]
+            thread = threading.Thread(target=modelos.clear)
+            thread.start()
+            thread.join()
+            gc.collect()
+        finally:
+            sys.unraisablehook = gancho
+        self.assertEqual(erros, [])
+
+    def test_fechar_grava_pendentes(self):
+        """Testa que o encerramento grava os registros pendentes"""
+        self.model.registrar_postura("Postura incorreta", 3, {'pescoco': 50, 'coluna': 85})
+        self.model.fechar()
+        self.assertFalse(self.model.registrar_postura("Postura correta", 1, {}))
+
+        conexao = sqlite3.connect(self.caminho_db)
+        self.assertEqual(conexao.execute("SELECT COUNT(*) FROM registros").fetchone()[0], 1)
+        conexao.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from controllers.motores_pose import (COCO_PARA_MEDIAPIPE, MotorMediaPipe, MotorOpenCVDNN,
+                                      criar_motor, landmarks_de_mapas)
+
+# Rede sem pesos: repete a imagem de entrada (3 canais) em 18 mapas de calor
+REDE_TESTE = """name: "teste"
+input: "data"
+input_shape { dim: 1 dim: 3 dim: 46 dim: 46 }
+layer {
+  name: "mapas" type: "Concat"
+  bottom: "data" bottom: "data" bottom: "data" bottom: "data" bottom: "data" bottom: "data"
+  top: "mapas" concat_param { axis: 1 }
+}
+"""
+
+
+class TestMotoresPose(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio)
+
+    def test_motor_desconhecido_ou_sem_modelo(self):
+        """Testa os erros de configuração: motor inexistente e modelos ausentes"""
+        with self.assertRaises(ValueError):
+            criar_motor({'motor': 'inexistente'})
+        with self.assertRaises(IOError):
+            criar_motor({'motor': 'mediapipe_tasks', 'modelo': self.diretorio})
+        with self.assertRaises(IOError):
+            criar_motor({'motor': 'opencv_dnn', 'modelo': self.diretorio})
+
+    def test_mediapipe_sem_pessoa(self):
+        """Testa o motor MediaPipe em um frame sem pessoa"""
+        # Só o modelo full vem com o pacote (lite e heavy são baixados no primeiro uso)
+        motor = criar_motor({'motor': 'mediapipe', 'suavizar': False}, complexidade=1)
+        self.assertIsInstance(motor, MotorMediaPipe)
+        self.assertEqual(motor.complexidade, 1)
+        self.assertIsNone(motor.processar(np.zeros((240, 320, 3), dtype=np.uint8)))
+        motor.fechar()
+
+    def test_mapas_de_calor_para_landmarks(self):
+        """Testa a conversão dos mapas COCO nos landmarks do MediaPipe"""
+        mapas = np.zeros((19, 10, 20), dtype=np.float32)
+        for coco in COCO_PARA_MEDIAPIPE:
+            mapas[coco, 5, 15] = 0.9
+        lista = landmarks_de_mapas(mapas)
+        self.assertEqual(len(lista.landmark), 33)
+        nariz = lista.landmark[0]
+        self.assertAlmostEqual(nariz.x, 15.5 / 20)
+        self.assertAlmostEqual(nariz.y, 5.5 / 10)
+        self.assertAlmostEqual(nariz.visibility, 0.9, places=5)
+        self.assertEqual(lista.landmark[15].visibility, 0.0)  # Punho: sem equivalente COCO
+
+        mapas[0] = 0.0  # Sem nariz a postura não pode ser classificada
+        self.assertIsNone(landmarks_de_mapas(mapas))
+
+    def test_opencv_dnn(self):
+        """Testa o motor OpenCV DNN com uma rede sem pesos lida do diretório do modelo"""
+        with open(os.path.join(self.diretorio, 'rede.prototxt'), 'w') as arquivo:
+            arquivo.write(REDE_TESTE)
+        motor = criar_motor({'motor': 'opencv_dnn', 'modelo': self.diretorio}, complexidade=2)
+        self.assertIsInstance(motor, MotorOpenCVDNN)
+        motor.tamanho_entrada = (46, 46)
+
+        frame = np.zeros((92, 92, 3), dtype=np.uint8)
+        self.assertIsNone(motor.processar(frame))
+        frame[20:24, 60:64] = 255
+        lista = motor.processar(frame)
+        ombro = lista.landmark[11]
+        # Posição do quadrado com a resolução dos mapas (1/46)
+        self.assertAlmostEqual(ombro.x, 62 / 92, delta=1 / 46)
+        self.assertAlmostEqual(ombro.y, 22 / 92, delta=1 / 46)
+        self.assertEqual(ombro.visibility, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import threading
+import time
+from controllers.pipeline import AnelBuffers, FilaDescarte, PipelineVideo
+
+
+class CameraFalsa:
+    """Simula uma câmera que entrega uma quantidade fixa de frames"""
+    def __init__(self, total):
+        self.total = total
+        self.lidos = 0
+
+    def read(self):
+        if self.lidos >= self.total:
+            return False, None
+        self.lidos += 1
+        return True, self.lidos
+
+
+class TestPipeline(unittest.TestCase):
+    def test_fila_descarta_mais_antigo(self):
+        """Testa o descarte do item mais antigo quando a fila está cheia"""
+        fila = FilaDescarte(2)
+        for i in range(5):
+            fila.colocar(i)
+        self.assertEqual(fila.obter_todos(), [3, 4])
+        self.assertEqual(fila.descartados, 3)
+        self.assertEqual(fila.obter_todos(), [])
+
+    def test_captura_nao_bloqueia_processamento_lento(self):
+        """Testa que a captura continua mesmo com o processamento lento"""
+        liberar = threading.Event()
+
+        def processar(frame):
+            liberar.wait(1)
+            return frame
+
+        camera = CameraFalsa(50)
+        pipeline = PipelineVideo(camera, processar)
+        pipeline.iniciar()
+        inicio = time.time()
+        while camera.lidos < 50 and time.time() - inicio < 2:
+            time.sleep(0.01)
+        liberar.set()
+        pipeline.parar()
+
+        self.assertEqual(camera.lidos, 50)
+        self.assertGreater(pipeline.fila_captura.descartados, 0)
+        self.assertEqual(pipeline.erro, "Erro ao capturar frame")
+
+    def test_anel_reaproveita_buffers(self):
+        """Testa que o anel devolve sempre os mesmos buffers, em ordem circular"""
+        anel = AnelBuffers(3)
+        primeiros = [anel.proximo((4, 4, 3)) for _ in range(3)]
+        self.assertEqual(len({id(b) for b in primeiros}), 3)
+        self.assertIs(anel.proximo((4, 4, 3)), primeiros[0])
+        # Mudança de resolução realoca o anel
+        novo = anel.proximo((8, 8, 3))
+        self.assertEqual(novo.shape, (8, 8, 3))
+        self.assertNotIn(id(novo), {id(b) for b in primeiros})
+
+
+if __name__ == '__main__':
+    unittest.main()
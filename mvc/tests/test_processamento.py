@@ -0,0 +1,140 @@
+import unittest
+import cv2
+import numpy as np
+from controllers.cache import CacheLRU
+from controllers import cinematica
+from controllers.classificacao import MaquinaEstadosPostura, classificar_postura
+from controllers.preprocessamento import PreProcessador
+
+
+class TestCacheLRU(unittest.TestCase):
+    def test_descarta_item_menos_usado(self):
+        """Testa o descarte do item usado há mais tempo"""
+        cache = CacheLRU(2)
+        cache.guardar('a', 1)
+        cache.guardar('b', 2)
+        self.assertEqual(cache.obter('a'), 1)
+        cache.guardar('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_contadores(self):
+        """Testa os contadores de acerto e falha"""
+        cache = CacheLRU(4)
+        cache.guardar((1, 2), 'postura')
+        cache.obter((1, 2))
+        cache.obter((3, 4))
+        cache.obter(None)
+        estatisticas = cache.estatisticas()
+        self.assertEqual(estatisticas['acertos'], 1)
+        self.assertEqual(estatisticas['falhas'], 2)
+        self.assertAlmostEqual(estatisticas['taxa_acerto'], 1 / 3)
+
+
+class TestCinematica(unittest.TestCase):
+    def _landmark(self, x, y):
+        return type('Landmark', (), {'x': x, 'y': y})()
+
+    def test_angulos_de_landmarks_parciais(self):
+        """Testa o cálculo a partir de um dicionário com apenas alguns landmarks"""
+        landmarks = {
+            0: self._landmark(0.5, 0.5),
+            11: self._landmark(0.4, 0.4),
+            12: self._landmark(0.6, 0.4),
+            23: self._landmark(0.4, 0.6),
+            24: self._landmark(0.6, 0.6)
+        }
+        pontos = cinematica.landmarks_para_array(landmarks)
+        self.assertEqual(pontos.shape, (33, 4))
+        self.assertEqual(pontos.dtype, np.float32)
+
+        angulos = cinematica.angulos_para_dict(cinematica.calcular_angulos(pontos))
+        self.assertAlmostEqual(angulos['pescoco'], 45.0, places=3)
+        self.assertAlmostEqual(angulos['coluna'], 90.0, places=3)
+        self.assertTrue(np.isnan(angulos['ombro_esquerdo']))
+
+    def test_lote_igual_a_frames_individuais(self):
+        """Testa que o cálculo em lote (N, 33, 4) equivale ao cálculo frame a frame"""
+        lote = np.random.default_rng(0).random((8, 33, 4), dtype=np.float32)
+        resultado = cinematica.calcular_angulos(lote)
+        self.assertEqual(resultado.shape, (8, len(cinematica.ARTICULACOES)))
+        for i in range(8):
+            np.testing.assert_allclose(resultado[i], cinematica.calcular_angulos(lote[i]))
+
+
+class TestClassificacao(unittest.TestCase):
+    def test_limiares(self):
+        """Testa a classificação nos limites padrão e com limites personalizados"""
+        self.assertEqual(classificar_postura({'pescoco': 90, 'coluna': 90}), ("Postura correta", None))
+        self.assertEqual(classificar_postura({'pescoco': 90, 'coluna': 60})[1], 'coluna_curvada')
+        self.assertEqual(classificar_postura({'pescoco': 90, 'coluna': 120})[1], 'coluna_reta')
+        self.assertEqual(classificar_postura({'pescoco': 50, 'coluna': 90})[1], 'pescoco_inclinado')
+        limiares = {'coluna_min': 50, 'coluna_max': 110, 'pescoco_min': 60}
+        self.assertEqual(classificar_postura({'pescoco': 90, 'coluna': 60}, limiares)[1], None)
+
+    def test_oscilacao_no_limite_nao_muda_estado(self):
+        """Testa que ângulos oscilando em torno do limite mantêm a postura"""
+        maquina = MaquinaEstadosPostura(histerese=5, permanencia_minima=1.0)
+        mudancas = [maquina.atualizar({'pescoco': 90, 'coluna': 70 + (-2 if i % 2 else 2)}, i / 30)[2]
+                    for i in range(300)]
+        self.assertEqual(mudancas.count(True), 1)  # Apenas a primeira classificação
+        self.assertEqual(maquina.tipo_erro, None)
+
+    def test_permanencia_minima_e_histerese(self):
+        """Testa a troca de estado só após a permanência mínima e a saída além da histerese"""
+        maquina = MaquinaEstadosPostura(histerese=5, permanencia_minima=1.0)
+        maquina.atualizar({'pescoco': 90, 'coluna': 90}, 0.0)
+        # Abaixo do limite com folga, mas por menos que a permanência mínima
+        self.assertEqual(maquina.atualizar({'pescoco': 90, 'coluna': 60}, 1.0)[1:], (None, False))
+        self.assertEqual(maquina.atualizar({'pescoco': 90, 'coluna': 60}, 1.5)[1:], (None, False))
+        self.assertEqual(maquina.atualizar({'pescoco': 90, 'coluna': 60}, 2.0)[1:], ('coluna_curvada', True))
+        # De volta acima de 70, mas dentro da histerese: continua curvada
+        for instante in (3.0, 5.0):
+            self.assertEqual(maquina.atualizar({'pescoco': 90, 'coluna': 73}, instante)[1], 'coluna_curvada')
+        maquina.atualizar({'pescoco': 90, 'coluna': 80}, 6.0)
+        self.assertEqual(maquina.atualizar({'pescoco': 90, 'coluna': 80}, 7.0), ("Postura correta", None, True))
+        self.assertEqual(maquina.transicoes, 3)
+
+    def test_angulos_nan_nao_sao_classificados(self):
+        """Testa que ângulos NaN (pontos ausentes) não viram postura correta nem mudam o estado"""
+        nan = float('nan')
+        self.assertEqual(classificar_postura({'pescoco': nan, 'coluna': 90}), (None, None))
+        self.assertEqual(classificar_postura({'pescoco': 90, 'coluna': nan}), (None, None))
+        maquina = MaquinaEstadosPostura(permanencia_minima=0)
+        self.assertEqual(maquina.atualizar({'pescoco': nan, 'coluna': nan}, 0.0), (None, None, False))
+        self.assertEqual(maquina.transicoes, 0)
+        maquina.atualizar({'pescoco': 50, 'coluna': 90}, 1.0)
+        self.assertEqual(maquina.atualizar({'pescoco': 90, 'coluna': nan}, 2.0), (None, None, False))
+        self.assertEqual(maquina.tipo_erro, 'pescoco_inclinado')
+
+
+
+class TestPreProcessador(unittest.TestCase):
+    def test_preparar_reaproveita_buffer(self):
+        """Testa o resultado de preparar() e a reutilização do buffer entre frames"""
+        preprocessador = PreProcessador(64, 48)
+        preprocessador.configurar(10, 1.2)
+        frame = np.random.default_rng(0).integers(0, 256, (96, 128, 3), dtype=np.uint8)
+        esperado = cv2.convertScaleAbs(cv2.resize(frame, (64, 48)), alpha=1.2, beta=10)
+
+        primeiro = preprocessador.preparar(frame)
+        np.testing.assert_array_equal(primeiro, esperado)
+        self.assertIs(preprocessador.preparar(frame), primeiro)
+        # Outra resolução de entrada usa o mesmo buffer de saída
+        self.assertIs(preprocessador.preparar(frame[:60, :80]), primeiro)
+
+    def test_frame_da_fonte_nao_e_alterado(self):
+        """Testa que um frame já no tamanho final (ex: memmap somente leitura) não é escrito"""
+        preprocessador = PreProcessador(32, 24)
+        frame = np.full((24, 32, 3), 100, dtype=np.uint8)
+        frame.flags.writeable = False
+        preprocessador.configurar(0, 1)
+        self.assertIs(preprocessador.preparar(frame), frame)
+        preprocessador.configurar(20, 1.0)
+        self.assertTrue((preprocessador.preparar(frame) == 120).all())
+        self.assertTrue((frame == 100).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from types import SimpleNamespace
+import numpy as np
+from controllers.roi import RastreadorROI
+from controllers.preprocessamento import PreProcessador
+
+
+def _landmarks(pontos, visibilidade=1.0):
+    return [SimpleNamespace(x=x, y=y, z=0.1, visibility=visibilidade) for x, y in pontos]
+
+
+class TestRastreadorROI(unittest.TestCase):
+    FORMATO = (720, 1280, 3)
+
+    def test_primeira_deteccao_define_regiao(self):
+        """Testa a região com margem em volta dos landmarks do frame inteiro"""
+        rastreador = RastreadorROI(margem=0.25, tamanho_minimo=0.1)
+        self.assertIsNone(rastreador.regiao_pixels(self.FORMATO))
+        rastreador.atualizar(_landmarks([(0.4, 0.3), (0.6, 0.7)]), None, self.FORMATO)
+        x0, y0, x1, y1 = rastreador.regiao
+        self.assertAlmostEqual(x0, 0.35, places=5)
+        self.assertAlmostEqual(x1, 0.65, places=5)
+        self.assertAlmostEqual(y0, 0.2, places=5)
+        self.assertAlmostEqual(y1, 0.8, places=5)
+        self.assertEqual(rastreador.regiao_pixels(self.FORMATO), (448, 144, 832, 576))
+
+    def test_landmarks_do_recorte_voltam_ao_frame_inteiro(self):
+        """Testa a conversão das coordenadas do recorte para o frame inteiro"""
+        rastreador = RastreadorROI()
+        landmarks = _landmarks([(0.0, 0.0), (0.5, 0.5), (1.0, 1.0)])
+        rastreador.atualizar(landmarks, (320, 180, 960, 540), self.FORMATO)
+        self.assertAlmostEqual(landmarks[0].x, 0.25)
+        self.assertAlmostEqual(landmarks[0].y, 0.25)
+        self.assertAlmostEqual(landmarks[1].x, 0.5)
+        self.assertAlmostEqual(landmarks[2].y, 0.75)
+        self.assertAlmostEqual(landmarks[2].z, 0.05)
+
+    def test_regiao_estavel_com_movimento_pequeno(self):
+        """Testa que movimentos pequenos não trocam a região (histerese)"""
+        rastreador = RastreadorROI()
+        rastreador.atualizar(_landmarks([(0.4, 0.3), (0.6, 0.7)]), None, self.FORMATO)
+        regiao = rastreador.regiao
+        rastreador.atualizar(_landmarks([(0.42, 0.31), (0.61, 0.69)]), None, self.FORMATO)
+        self.assertEqual(rastreador.regiao, regiao)
+        self.assertEqual(rastreador.trocas, 1)
+
+        # Perto da borda da região, ela é recalculada
+        rastreador.atualizar(_landmarks([(0.55, 0.3), (0.75, 0.7)]), None, self.FORMATO)
+        self.assertNotEqual(rastreador.regiao, regiao)
+        self.assertEqual(rastreador.trocas, 2)
+
+    def test_perda_volta_ao_frame_inteiro(self):
+        """Testa o retorno ao frame inteiro sem detecção ou com pontos pouco visíveis"""
+        rastreador = RastreadorROI()
+        rastreador.atualizar(_landmarks([(0.4, 0.3), (0.6, 0.7)]), None, self.FORMATO)
+        rastreador.atualizar(None, rastreador.regiao_pixels(self.FORMATO), self.FORMATO)
+        self.assertIsNone(rastreador.regiao_pixels(self.FORMATO))
+        self.assertEqual(rastreador.perdas, 1)
+
+        rastreador.atualizar(_landmarks([(0.4, 0.3), (0.6, 0.7)], visibilidade=0.1), None, self.FORMATO)
+        self.assertIsNone(rastreador.regiao)
+
+    def test_regiao_limitada_ao_frame(self):
+        """Testa o tamanho mínimo e o limite da região nas bordas do frame"""
+        rastreador = RastreadorROI(tamanho_minimo=0.3)
+        rastreador.atualizar(_landmarks([(0.95, 0.95), (0.99, 0.99)]), None, self.FORMATO)
+        x0, y0, x1, y1 = rastreador.regiao
+        self.assertAlmostEqual(x1, 1.0)
+        self.assertAlmostEqual(x1 - x0, 0.3)
+        self.assertAlmostEqual(y1 - y0, 0.3)
+
+    def test_recorte_limitado_ao_frame_de_trabalho(self):
+        """Testa que o recorte de um frame grande é reduzido ao tamanho de trabalho"""
+        preprocessador = PreProcessador(640, 480)
+        frame = np.zeros(self.FORMATO, dtype=np.uint8)
+        frame[..., 0] = 200  # Azul em BGR
+        recorte = preprocessador.recortar_rgb(frame, (0, 0, 1280, 720))
+        self.assertEqual(recorte.shape, (360, 640, 3))
+        self.assertTrue((recorte[..., 2] == 200).all())
+        pequeno = preprocessador.recortar_rgb(frame, (100, 100, 300, 400))
+        self.assertEqual(pequeno.shape, (300, 200, 3))
+        self.assertTrue(pequeno.flags['C_CONTIGUOUS'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -23,7 +23,8 @@ class TestSistemaPostura(unittest.TestCase):
         self.model.db_connection.commit()
 
     def test_captura_camera(self):
-        """Testa a funcionalidade de captura da câmera"""
+        """Testa a funcionalidade de captura (fonte sintética, não exige webcam)"""
+        self.controller.fonte = {'tipo': 'sintetica', 'tempo_real': True}
         self.controller.iniciar_monitoramento()
         self.assertTrue(self.controller.is_running)
         self.assertIsNotNone(self.controller.cap)
@@ -51,6 +52,7 @@ class TestSistemaPostura(unittest.TestCase):
         angulos = {'pescoco': 90, 'coluna': 85}
         sucesso = self.model.registrar_postura("Postura correta", 1, angulos)
         self.assertTrue(sucesso)
+        self.model.descarregar()
 
         # Verifica se o registro foi feito
         cursor = self.model.db_connection.cursor()
@@ -64,6 +66,7 @@ class TestSistemaPostura(unittest.TestCase):
         angulos = {'pescoco': 90, 'coluna': 85}
         self.model.registrar_postura("Postura correta", 5, angulos)
         self.model.registrar_postura("Postura incorreta", 3, angulos)
+        self.model.descarregar()
 
         # Verifica estatísticas
         estatisticas = self.model.get_estatisticas(dias=1)
@@ -99,6 +102,7 @@ class TestSistemaPostura(unittest.TestCase):
     def tearDownClass(cls):
         """Limpeza após todos os testes"""
         cls.root.destroy()
+        cls.model.fechar()
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
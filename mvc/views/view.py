@@ -1,14 +1,24 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
-import winsound
+from PIL import Image, ImageTk
+from controllers.metricas import formatar_resumo
+from controllers.motores_pose import COMPLEXIDADES
 import threading
 import time
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib
-matplotlib.use('TkAgg')
+
+# Rótulos dos motores de pose nas preferências (ver controllers.motores_pose)
+NOMES_MOTORES = {
+    'mediapipe': "MediaPipe",
+    'mediapipe_tasks': "MediaPipe Tasks",
+    'opencv_dnn': "OpenCV DNN"
+}
+
+try:
+    import winsound
+except ImportError:  # Fora do Windows o alerta sonoro usa o sinal do Tk
+    winsound = None
 
 class View:
     """
@@ -76,6 +86,7 @@ class View:
         # Variáveis para alertas
         self.alerta_thread = None
         self.alerta_ativo = False
+        self._bell_agendado = None  # id do window.after do próximo bell (sem winsound)
 
         # Criar menu principal
         self._criar_menu()
@@ -92,8 +103,8 @@ class View:
         self._criar_frame_camera()
         self._criar_frame_configuracoes()
 
-        # Iniciar atualização de estatísticas
-        self._atualizar_estatisticas()
+        # Iniciar atualização de estatísticas depois que a janela aparecer
+        self.window.after(100, self._atualizar_estatisticas)
 
     def _criar_menu(self):
         """Cria o menu principal da aplicação"""
@@ -118,6 +129,11 @@ class View:
         for tema in self.temas.keys():
             temas_menu.add_command(label=tema, command=lambda t=tema: self._aplicar_tema(t))
 
+        # Overlay com as métricas de desempenho sobre o vídeo
+        self.overlay_desempenho_var = tk.BooleanVar(value=False)
+        config_menu.add_checkbutton(label="Exibir desempenho", variable=self.overlay_desempenho_var,
+                                    command=self._alternar_overlay_desempenho)
+
         # Menu Ajuda
         ajuda_menu = tk.Menu(self.menu_bar, tearoff=0)
         self.menu_bar.add_cascade(label="Ajuda", menu=ajuda_menu)
@@ -154,7 +170,7 @@ class View:
         """Mostra a janela de preferências"""
         pref_window = tk.Toplevel(self.window)
         pref_window.title("Preferências")
-        pref_window.geometry("400x300")
+        pref_window.geometry("400x520")
         pref_window.configure(bg=self.temas[self.tema_atual]['bg'])
 
         # Frame para configurações
@@ -175,10 +191,38 @@ class View:
         ttk.Combobox(frame, textvariable=sensibilidade_var,
                     values=["Baixa", "Média", "Alta"]).pack(pady=5)
 
+        # Modelo de pose: motor, complexidade (velocidade x precisão) e suavização
+        ttk.Label(frame, text="Modelo de Pose").pack(pady=10)
+        config_pose = self.controller.config_pose
+        ttk.Label(frame, text="Motor:").pack()
+        motor_var = tk.StringVar(value=NOMES_MOTORES[config_pose['motor']])
+        ttk.Combobox(frame, textvariable=motor_var, state="readonly",
+                     values=list(NOMES_MOTORES.values())).pack(pady=5)
+
+        ttk.Label(frame, text="Complexidade máxima:").pack()
+        complexidade_var = tk.StringVar(value=COMPLEXIDADES[self.controller.agendador.complexidade_maxima].capitalize())
+        ttk.Combobox(frame, textvariable=complexidade_var, state="readonly",
+                     values=[nome.capitalize() for nome in COMPLEXIDADES.values()]).pack(pady=5)
+
+        suavizar_var = tk.BooleanVar(value=config_pose['suavizar'])
+        ttk.Checkbutton(frame, text="Suavizar landmarks", variable=suavizar_var).pack(pady=5)
+
+        ttk.Label(frame, text="Arquivo ou diretório do modelo (Tasks e DNN):").pack()
+        modelo_var = tk.StringVar(value=config_pose['modelo'] or "")
+        ttk.Entry(frame, textvariable=modelo_var).pack(pady=5, fill="x")
+
+        def opcoes_pose():
+            motor = next(nome for nome, rotulo in NOMES_MOTORES.items() if rotulo == motor_var.get())
+            complexidade = next(nivel for nivel, nome in COMPLEXIDADES.items()
+                                if nome.capitalize() == complexidade_var.get())
+            return {'motor': motor, 'complexidade': complexidade, 'suavizar': suavizar_var.get(),
+                    'modelo': modelo_var.get().strip() or None}
+
         # Botões
         ttk.Button(frame, text="Salvar",
                   command=lambda: self._salvar_preferencias(tempo_var.get(),
-                                                          sensibilidade_var.get())).pack(pady=10)
+                                                          sensibilidade_var.get(),
+                                                          opcoes_pose())).pack(pady=10)
         ttk.Button(frame, text="Cancelar",
                   command=pref_window.destroy).pack()
 
@@ -218,9 +262,32 @@ class View:
             "Desenvolvido para monitorar e melhorar a postura corporal."
         )
 
-    def _salvar_preferencias(self, tempo_alerta, sensibilidade):
+    def _salvar_preferencias(self, tempo_alerta, sensibilidade, opcoes_pose=None):
         """Salva as preferências do usuário"""
         # Aqui você pode implementar a lógica para salvar as preferências
+        if opcoes_pose is not None:
+            opcoes = dict(opcoes_pose)
+            complexidade = opcoes.pop('complexidade')
+            atual = {chave: self.controller.config_pose[chave] for chave in opcoes}
+            if opcoes != atual or complexidade != self.controller.agendador.complexidade_maxima:
+                # O novo motor é carregado em segundo plano; um modelo ausente mantém o motor atual
+                futuro = self.controller.configurar_pose_em_segundo_plano(complexidade, **opcoes)
+                self.atualizar_status("Carregando o modelo de pose...", "info")
+                self.window.after(100, self._acompanhar_configuracao_pose, futuro)
+                return
+        messagebox.showinfo("Sucesso", "Preferências salvas com sucesso!")
+
+    def _acompanhar_configuracao_pose(self, futuro):
+        """Aguarda, sem bloquear a interface, o carregamento do motor de pose e avisa o resultado"""
+        if not futuro.done():
+            self.window.after(100, self._acompanhar_configuracao_pose, futuro)
+            return
+        erro = futuro.exception()
+        if erro is not None:
+            self.atualizar_status("Motor de pose mantido", "warning")
+            messagebox.showerror("Erro", f"Não foi possível carregar o modelo de pose: {erro}")
+            return
+        self.atualizar_status("Modelo de pose carregado", "success")
         messagebox.showinfo("Sucesso", "Preferências salvas com sucesso!")
 
     def _criar_frame_camera(self):
@@ -239,6 +306,13 @@ class View:
         
         self.video_label = ttk.Label(self.video_frame)
         self.video_label.pack(padx=2, pady=2)
+        # Imagem e foto reaproveitadas por exibir_quadro
+        self._imagem_video = None
+        self._foto_video = None
+
+        # Overlay de desempenho (oculto até ser ativado no menu Configurações)
+        self.overlay_desempenho = tk.Label(self.video_frame, justify="left", anchor="nw",
+                                           font=('Courier', 9), bg='black', fg='#00ff66')
 
         # Frame de status com ícone
         self.status_frame = ttk.Frame(self.camera_frame)
@@ -335,6 +409,16 @@ class View:
                                            style='TLabel')
         self.angulo_coluna_label.grid(row=0, column=1, padx=5, pady=5)
 
+        self.angulo_ombro_esquerdo_label = ttk.Label(self.angulos_frame,
+                                                   text="Ombro Esquerdo: 0°",
+                                                   style='TLabel')
+        self.angulo_ombro_esquerdo_label.grid(row=1, column=0, padx=5, pady=5)
+
+        self.angulo_ombro_direito_label = ttk.Label(self.angulos_frame,
+                                                  text="Ombro Direito: 0°",
+                                                  style='TLabel')
+        self.angulo_ombro_direito_label.grid(row=1, column=1, padx=5, pady=5)
+
     def _criar_frame_alertas(self):
         """Cria o frame para exibição de alertas e sugestões"""
         self.alertas_frame = ttk.LabelFrame(self.config_frame, text="Alertas e Sugestões")
@@ -386,8 +470,23 @@ class View:
                                         font=self.fonte_normal)
         self.percentual_label.grid(row=0, column=2, padx=5, pady=2)
 
+        # O gráfico (matplotlib) é criado na primeira renderização das estatísticas
+        self.fig = None
+        self.ax = None
+        self.canvas = None
+        # Barras mantidas entre atualizações: só as alturas mudam enquanto os dias e o tema são os mesmos
+        self._barras_grafico = None
+        self._layout_grafico = None
+        # (versão dos dados, dia, tema) da última atualização das estatísticas
+        self._chave_estatisticas = None
+
+    def _criar_grafico(self):
+        """Cria a figura do matplotlib e o canvas no frame de estatísticas"""
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
         # Cria figura do matplotlib com estilo moderno
-        self.fig = plt.Figure(figsize=(6, 4), dpi=100)
+        self.fig = Figure(figsize=(6, 4), dpi=100)
         self.fig.patch.set_facecolor(self.temas[self.tema_atual]['bg'])
         
         # Adiciona subplot com estilo moderno
@@ -431,6 +530,19 @@ class View:
                                   command=self._exportar_csv)
         self.botao_csv.grid(row=0, column=0, padx=5, pady=5)
 
+        self.botao_excel = ttk.Button(self.botoes_frame,
+                                    text="Exportar para Excel",
+                                    command=lambda: self._exportar('excel'))
+        self.botao_excel.grid(row=0, column=1, padx=5, pady=5)
+
+        # Progresso da exportação em andamento (feita em segundo plano)
+        self.exportacao = None
+        self.progresso_exportacao = ttk.Progressbar(self.botoes_frame, length=160, maximum=1.0)
+        self.progresso_exportacao.grid(row=0, column=2, padx=5, pady=5)
+        self.botao_cancelar_exportacao = ttk.Button(self.botoes_frame, text="Cancelar",
+                                                    command=self._cancelar_exportacao, state='disabled')
+        self.botao_cancelar_exportacao.grid(row=0, column=3, padx=5, pady=5)
+
     def _criar_frame_rodape(self):
         """Cria o frame do rodapé com botões de controle"""
         self.bottom_frame = ttk.Frame(self.config_frame)
@@ -446,6 +558,20 @@ class View:
                                     command=self.controller.parar_monitoramento)
         self.botao_parar.grid(row=0, column=1, padx=5, pady=5)
 
+    def exibir_quadro(self, frame_rgb):
+        """
+        Exibe o frame RGB do pipeline atualizando uma única PhotoImage no lugar:
+        os pixels são copiados para uma imagem PIL persistente e colados na foto,
+        sem criar imagens Tcl nem arrays novos a cada frame.
+        """
+        altura, largura = frame_rgb.shape[:2]
+        if self._imagem_video is None or self._imagem_video.size != (largura, altura):
+            self._imagem_video = Image.new('RGB', (largura, altura))
+            self._foto_video = ImageTk.PhotoImage('RGB', (largura, altura))
+            self.atualizar_video(self._foto_video)
+        self._imagem_video.frombytes(frame_rgb)
+        self._foto_video.paste(self._imagem_video)
+
     def atualizar_video(self, photo):
         """
         Atualiza o frame do vídeo na interface.
@@ -453,6 +579,27 @@ class View:
         self.video_label.configure(image=photo)
         self.video_label.image = photo
 
+    def _alternar_overlay_desempenho(self):
+        """Exibe ou oculta o overlay com as métricas de desempenho"""
+        if self.overlay_desempenho_var.get():
+            self.overlay_desempenho.place(x=8, y=8)
+            self._atualizar_overlay_desempenho()
+        else:
+            self.overlay_desempenho.place_forget()
+
+    def _atualizar_overlay_desempenho(self):
+        """
+        Atualiza o overlay com FPS, filas, descartes e percentis por etapa a cada 500 ms.
+        """
+        if not self.overlay_desempenho_var.get():
+            return
+        try:
+            texto = formatar_resumo(self.controller.get_metricas(), separador="\n")
+            self.overlay_desempenho.configure(text=texto or "Sem medições")
+        except Exception as e:
+            print(f"Erro ao atualizar overlay de desempenho: {e}")
+        self.window.after(500, self._atualizar_overlay_desempenho)
+
     def atualizar_status(self, mensagem, tipo="info"):
         """
         Atualiza o status do sistema na interface, exibindo mensagens e ícones.
@@ -487,6 +634,11 @@ class View:
         self.angulo_coluna_label.configure(
             text=f"Ângulo da Coluna: {angulos['coluna']:.1f}°"
         )
+        # Ângulos dos ombros ficam indefinidos (NaN) quando os cotovelos não são detectados
+        for label, nome, chave in ((self.angulo_ombro_esquerdo_label, "Ombro Esquerdo", 'ombro_esquerdo'),
+                                   (self.angulo_ombro_direito_label, "Ombro Direito", 'ombro_direito')):
+            valor = angulos.get(chave, 0)
+            label.configure(text=f"{nome}: {valor:.1f}°" if valor == valor else f"{nome}: --")
 
     def ativar_alertas(self, tipo_erro, sugestoes):
         """
@@ -514,28 +666,45 @@ class View:
                         foreground="blue"
                     )
             
-            # Inicia o alerta sonoro em uma thread separada
-            self.alerta_thread = threading.Thread(target=self._tocar_alerta_sonoro)
-            self.alerta_thread.daemon = True
-            self.alerta_thread.start()
+            # Inicia o alerta sonoro: winsound.Beep bloqueia, então roda em uma thread separada;
+            # o bell do Tk só pode ser chamado da thread do Tkinter e é agendado nela
+            if winsound is not None:
+                self.alerta_thread = threading.Thread(target=self._tocar_alerta_sonoro)
+                self.alerta_thread.daemon = True
+                self.alerta_thread.start()
+            else:
+                self._tocar_bell()
 
     def desativar_alertas(self):
         """
         Desativa os alertas visuais e sonoros.
         """
         self.alerta_ativo = False
+        if self._bell_agendado is not None:
+            self.window.after_cancel(self._bell_agendado)
+            self._bell_agendado = None
         self.alerta_label.configure(text="")
         for label in self.sugestao_labels:
             label.configure(text="")
 
     def _tocar_alerta_sonoro(self):
         """
-        Toca o alerta sonoro enquanto o alerta estiver ativo.
+        Toca o alerta sonoro (winsound) enquanto o alerta estiver ativo.
         """
         while self.alerta_ativo:
             winsound.Beep(1000, 500)  # Frequência 1000Hz, duração 500ms
             time.sleep(2)  # Espera 2 segundos entre os beeps
 
+    def _tocar_bell(self):
+        """
+        Toca o bell do Tk a cada 2 segundos enquanto o alerta estiver ativo (sem winsound).
+        Executado na thread do Tkinter.
+        """
+        self._bell_agendado = None
+        if self.alerta_ativo:
+            self.window.bell()
+            self._bell_agendado = self.window.after(2000, self._tocar_bell)
+
     def _on_resolucao_change(self, event):
         """
         Callback para mudança de resolução da câmera.
@@ -564,22 +733,26 @@ class View:
     def _atualizar_estatisticas(self):
         """
         Atualiza as estatísticas do dia e o gráfico na interface.
+        O banco só é consultado de novo quando houve gravação, o dia mudou ou o tema mudou.
         """
         try:
-            # Atualiza estatísticas do dia
-            resumo = self.controller.model.get_resumo_diario()
-            self.tempo_correto_label.configure(
-                text=f"Tempo em postura correta: {resumo['minutos_correto']} min"
-            )
-            self.tempo_incorreto_label.configure(
-                text=f"Tempo em postura incorreta: {resumo['minutos_incorreto']} min"
-            )
-            self.percentual_label.configure(
-                text=f"Percentual correto: {resumo['percentual_correto']:.1f}%"
-            )
+            chave = (self.controller.model.versao_dados(), datetime.now().date(), self.tema_atual)
+            if chave != self._chave_estatisticas:
+                # Atualiza estatísticas do dia
+                resumo = self.controller.model.get_resumo_diario()
+                self.tempo_correto_label.configure(
+                    text=f"Tempo em postura correta: {resumo['minutos_correto']} min"
+                )
+                self.tempo_incorreto_label.configure(
+                    text=f"Tempo em postura incorreta: {resumo['minutos_incorreto']} min"
+                )
+                self.percentual_label.configure(
+                    text=f"Percentual correto: {resumo['percentual_correto']:.1f}%"
+                )
 
-            # Atualiza gráfico
-            self._atualizar_grafico()
+                # Atualiza gráfico
+                self._atualizar_grafico()
+                self._chave_estatisticas = chave
 
             # Agenda próxima atualização
             self.window.after(5000, self._atualizar_estatisticas)  # Atualiza a cada 5 segundos
@@ -588,74 +761,135 @@ class View:
 
     def _atualizar_grafico(self):
         """
-        Atualiza o gráfico de histórico de posturas.
+        Atualiza o gráfico de histórico de posturas. Com os mesmos dias e tema, só as
+        alturas das barras existentes mudam; o desenho fica para o próximo ciclo ocioso
+        do Tkinter (draw_idle).
         """
         try:
-            # Limpa o gráfico
-            self.ax.clear()
-            
             # Obtém dados
             estatisticas = self.controller.model.get_estatisticas(dias=7)
             if not estatisticas:
                 return
-            
+
+            if self.ax is None:
+                self._criar_grafico()
+
             # Prepara dados
             datas = [datetime.strptime(e['data'], '%Y-%m-%d').strftime('%d/%m') 
                     for e in estatisticas]
             corretos = [e['total_correto'] for e in estatisticas]
             incorretos = [e['total_incorreto'] for e in estatisticas]
-            
-            # Plota dados
-            x = range(len(datas))
-            width = 0.35
-            
-            self.ax.bar([i - width/2 for i in x], corretos, width,
-                       label='Postura Correta',
-                       color=self.temas[self.tema_atual]['success'])
-            self.ax.bar([i + width/2 for i in x], incorretos, width,
-                       label='Postura Incorreta',
-                       color=self.temas[self.tema_atual]['warning'])
-            
-            # Configura eixos
-            self.ax.set_xticks(x)
-            self.ax.set_xticklabels(datas, rotation=45)
-            self.ax.set_ylabel('Minutos')
-            self.ax.set_title('Histórico de Posturas', pad=20)
-            
-            # Adiciona legenda
-            self.ax.legend(loc='upper right')
-            
-            # Ajusta layout
-            self.fig.tight_layout()
-            
+
+            layout = (datas, self.tema_atual)
+            if layout != self._layout_grafico:
+                self._montar_grafico(datas, corretos, incorretos)
+                self._layout_grafico = layout
+            else:
+                for barras, valores in zip(self._barras_grafico, (corretos, incorretos)):
+                    for barra, valor in zip(barras, valores):
+                        barra.set_height(valor)
+            self.ax.set_ylim(0, max(corretos + incorretos + [1]) * 1.1)
+
             # Atualiza canvas
-            self.canvas.draw()
+            self.canvas.draw_idle()
             
         except Exception as e:
             print(f"Erro ao atualizar gráfico: {e}")
 
+    def _montar_grafico(self, datas, corretos, incorretos):
+        """
+        Recria as barras, os eixos e a legenda (quando os dias exibidos ou o tema mudam).
+        """
+        self.ax.clear()
+
+        # Plota dados
+        x = range(len(datas))
+        width = 0.35
+        
+        self._barras_grafico = (
+            self.ax.bar([i - width/2 for i in x], corretos, width,
+                        label='Postura Correta',
+                        color=self.temas[self.tema_atual]['success']),
+            self.ax.bar([i + width/2 for i in x], incorretos, width,
+                        label='Postura Incorreta',
+                        color=self.temas[self.tema_atual]['warning'])
+        )
+        
+        # Configura eixos
+        self.ax.set_xticks(x)
+        self.ax.set_xticklabels(datas, rotation=45)
+        self.ax.set_ylabel('Minutos')
+        self.ax.set_title('Histórico de Posturas', pad=20)
+        
+        # Adiciona legenda
+        self.ax.legend(loc='upper right')
+        
+        # Ajusta layout
+        self.fig.tight_layout()
+
     def _exportar_csv(self):
         """
         Exporta os dados para CSV conforme o período selecionado.
         """
+        self._exportar('csv')
+
+    def _exportar(self, formato):
+        """
+        Inicia a exportação do período selecionado em segundo plano; a interface
+        continua respondendo e o progresso é acompanhado por _acompanhar_exportacao.
+        """
+        if self.exportacao is not None:
+            return
         try:
             # Obtém datas selecionadas
             data_inicio = datetime.combine(self.data_inicial.get_date(), datetime.min.time())
             data_fim = datetime.combine(self.data_final.get_date(), datetime.max.time())
 
-            # Exporta dados
-            if self.controller.model.exportar_dados('csv', data_inicio, data_fim):
-                messagebox.showinfo(
-                    "Sucesso",
-                    "Dados exportados com sucesso para o diretório 'exportacoes'!"
-                )
-            else:
-                messagebox.showerror(
-                    "Erro",
-                    "Não foi possível exportar os dados. Verifique se existem dados no período selecionado."
-                )
+            self.exportacao = self.controller.model.exportar_em_segundo_plano(formato, data_inicio, data_fim)
+            if self.exportacao is None:
+                messagebox.showerror("Erro", "Não foi possível iniciar a exportação.")
+                return
+            self.botao_csv.config(state='disabled')
+            self.botao_excel.config(state='disabled')
+            self.botao_cancelar_exportacao.config(state='normal')
+            self.window.after(100, self._acompanhar_exportacao)
         except Exception as e:
             messagebox.showerror(
                 "Erro",
                 f"Erro ao exportar dados: {str(e)}"
-            ) 
\ No newline at end of file
+            )
+
+    def _cancelar_exportacao(self):
+        """Cancela a exportação em andamento"""
+        if self.exportacao is not None:
+            self.exportacao.cancelar()
+
+    def _acompanhar_exportacao(self):
+        """Atualiza a barra de progresso e avisa o resultado ao fim da exportação"""
+        from models.exportacao import CANCELADA, CONCLUIDA, VAZIA
+        exportacao = self.exportacao
+        self.progresso_exportacao['value'] = exportacao.progresso
+        if not exportacao.aguardar(0):
+            self.window.after(100, self._acompanhar_exportacao)
+            return
+
+        self.exportacao = None
+        self.progresso_exportacao['value'] = 0
+        self.botao_csv.config(state='normal')
+        self.botao_excel.config(state='normal')
+        self.botao_cancelar_exportacao.config(state='disabled')
+        if exportacao.estado == CONCLUIDA:
+            messagebox.showinfo(
+                "Sucesso",
+                f"{exportacao.escritas} registros exportados para {exportacao.arquivo}"
+            )
+        elif exportacao.estado == VAZIA:
+            messagebox.showerror(
+                "Erro",
+                "Não foi possível exportar os dados. Verifique se existem dados no período selecionado."
+            )
+        elif exportacao.estado != CANCELADA:
+            messagebox.showerror(
+                "Erro",
+                f"Erro ao exportar dados: {exportacao.erro}"
+            )